@@ -1,15 +1,28 @@
 """
 缓存抽象层 - 统一的缓存访问接口
-支持: Redis, Memcached, In-Memory
+支持: Redis, Memcached, In-Memory, 两级近端缓存, Prometheus指标
 """
 
-from .base import CacheBase, CacheConfig
-from .redis_cache import RedisCache
+from .base import CacheBase, CacheConfig, CacheType
+from .redis_cache import RedisCache, hash_tag, key_slot
 from .memory_cache import MemoryCache
+from .tiered_cache import TieredCache
+from .metrics import CacheMetrics, InstrumentedCache, get_cache_metrics
+from .decorators import cached, invalidate_tags, set_default_cache
 
 __all__ = [
     "CacheBase",
     "CacheConfig",
+    "CacheType",
     "RedisCache",
+    "hash_tag",
+    "key_slot",
     "MemoryCache",
+    "TieredCache",
+    "CacheMetrics",
+    "InstrumentedCache",
+    "get_cache_metrics",
+    "cached",
+    "invalidate_tags",
+    "set_default_cache",
 ]
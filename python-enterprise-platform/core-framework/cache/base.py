@@ -3,9 +3,14 @@
 """
 
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List, Tuple, Union
 from enum import Enum
+import asyncio
+import math
+import random
+import time
 
 
 class CacheType(str, Enum):
@@ -28,24 +33,49 @@ class CacheConfig:
     socket_connect_timeout: int = 5
     decode_responses: bool = True
 
+    # 共享连接池(单机模式): 同名的使用方复用同一个池, 默认按地址/库/解码方式命名
+    pool_name: Optional[str] = None
+    # 连接耗尽时等待可用连接的超时(秒)
+    pool_timeout: float = 5.0
+    # 空闲连接使用前的PING间隔及后台健康检查间隔(秒), 0表示关闭
+    health_check_interval: int = 30
+
     # Redis集群配置
     cluster_mode: bool = False
     cluster_nodes: Optional[List[dict]] = None
+    # 集群模式下只读命令(GET/EXISTS/HGETALL/MGET等)轮询分发到主节点及其副本
+    read_from_replicas: bool = False
 
     # 默认过期时间(秒)
     default_ttl: int = 3600
 
+    # get_or_load跨进程加载锁的有效期, 也是其它进程等待加载结果的最长时间(秒)
+    load_timeout: float = 5.0
+
+    # 内存缓存分段数(>1时按键哈希分段, 每段独立加锁)
+    memory_shards: int = 1
+
     def __post_init__(self) -> None:
         if self.cluster_nodes is None:
             self.cluster_nodes = []
 
 
+Loader = Callable[[], Awaitable[Any]]
+
+# get_or_load写入的包装标记, 用于区分普通缓存值
+_LOADED_MARKER = "__loaded__"
+
+
 class CacheBase(ABC):
     """缓存基类 - 定义统一接口"""
 
     def __init__(self, config: CacheConfig):
         self.config = config
         self._connected = False
+        # 进行中的前台加载任务(单飞合并)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 进行中的后台刷新任务; 其它进程持锁时返回None, 不能供前台未命中合并等待
+        self._refreshing: Dict[str, asyncio.Task] = {}
 
     @abstractmethod
     async def connect(self) -> None:
@@ -97,6 +127,30 @@ class CacheBase(ABC):
         """清空所有缓存"""
         pass
 
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量获取缓存值, 只返回命中的键"""
+        pass
+
+    @abstractmethod
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Union[int, Dict[str, int], None] = None,
+    ) -> bool:
+        """批量设置缓存值, ttl可为统一值或按键指定的字典"""
+        pass
+
+    @abstractmethod
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存, 返回删除数量"""
+        pass
+
+    @abstractmethod
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """批量检查键是否存在"""
+        pass
+
     @abstractmethod
     async def incr(self, key: str, amount: int = 1) -> int:
         """递增"""
@@ -107,6 +161,157 @@ class CacheBase(ABC):
         """递减"""
         pass
 
+    async def ttl_many(self, keys: List[str]) -> Dict[str, float]:
+        """批量获取剩余生存时间(秒), -1表示永不过期, -2表示不存在"""
+        return {key: await self.ttl(key) for key in keys}
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        beta: float = 1.0,
+    ) -> Optional[Any]:
+        """
+        读穿缓存: 命中直接返回, 未命中调用loader加载并写入
+
+        - 单飞合并: 同一进程内同一键同时只有一个loader在执行
+        - XFetch: 临近过期时按概率提前在后台刷新(beta越大越提前)
+        - stale_ttl: 逻辑过期后的stale_ttl秒内先返回旧值并在后台刷新
+        - 子类可通过_load_guard提供分布式锁, 跨进程合并加载
+
+        loader返回None时不写入缓存。
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            value, expire_at, delta = self._unwrap_loaded(cached)
+            if expire_at is None:
+                return value
+
+            now = time.time()
+            if now >= expire_at:
+                # 已逻辑过期但仍在stale窗口内
+                self._refresh_in_background(key, loader, ttl, stale_ttl)
+            elif delta and now - delta * beta * math.log(1.0 - random.random()) >= expire_at:
+                self._refresh_in_background(key, loader, ttl, stale_ttl)
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader, ttl, stale_ttl, wait=True))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: Optional[int],
+        stale_ttl: int,
+    ) -> None:
+        """在后台刷新缓存, 已有加载或刷新任务时跳过"""
+        if key in self._inflight or key in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._load(key, loader, ttl, stale_ttl, wait=False))
+        self._refreshing[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            self._refreshing.pop(key, None)
+            if not t.cancelled() and t.exception() is not None:
+                print(f"Error refreshing cache key {key}: {t.exception()}")
+
+        task.add_done_callback(_done)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: Optional[int],
+        stale_ttl: int,
+        wait: bool,
+    ) -> Optional[Any]:
+        """执行loader并写入缓存"""
+        expire_time = ttl if ttl is not None else self.config.default_ttl
+
+        load_timeout = self.config.load_timeout
+        async with self._load_guard(key, load_timeout) as acquired:
+            if not acquired:
+                # 其它进程正在加载: 后台刷新直接放弃, 前台等待其结果, 等不到时自行加载
+                if not wait:
+                    return None
+                value = await self._wait_for_loaded(key, load_timeout)
+                if value is not None:
+                    return value
+
+            start = time.monotonic()
+            value = await loader()
+            delta = time.monotonic() - start
+
+            if value is None:
+                return None
+
+            envelope = {
+                _LOADED_MARKER: True,
+                "value": value,
+                "delta": delta,
+                "expire_at": time.time() + expire_time if expire_time else None,
+            }
+            await self.set(key, envelope, ttl=expire_time + stale_ttl if expire_time else expire_time)
+            return value
+
+    async def _wait_for_loaded(self, key: str, timeout: float) -> Optional[Any]:
+        """
+        轮询等待其它进程写入新值
+
+        持锁方释放了锁(或锁已过期)却没有写入新值时(进程崩溃、loader返回None)立即返回None,
+        由调用方自行加载, 最长等待timeout秒。
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            value = await self._get_fresh(key)
+            if value is not None:
+                return value
+            if not await self._load_in_progress(key):
+                # 锁释放与写入之间可能有先后, 再读一次
+                return await self._get_fresh(key)
+        return None
+
+    async def _get_fresh(self, key: str) -> Optional[Any]:
+        """读取未逻辑过期的值"""
+        cached = await self.get(key)
+        if cached is None:
+            return None
+        value, expire_at, _ = self._unwrap_loaded(cached)
+        if expire_at is None or time.time() < expire_at:
+            return value
+        return None
+
+    @asynccontextmanager
+    async def _load_guard(self, key: str, timeout: float) -> AsyncIterator[bool]:
+        """加载互斥钩子, 默认仅依赖进程内单飞"""
+        yield True
+
+    async def _load_in_progress(self, key: str) -> bool:
+        """其它进程是否仍持有该键的加载锁, 与_load_guard配套"""
+        return False
+
+    @staticmethod
+    def _unwrap_loaded(cached: Any) -> Tuple[Any, Optional[float], float]:
+        """拆开get_or_load写入的包装, 返回(值, 逻辑过期时间, 加载耗时)"""
+        if isinstance(cached, dict) and cached.get(_LOADED_MARKER):
+            return cached["value"], cached.get("expire_at"), cached.get("delta", 0.0)
+        return cached, None, 0.0
+
+    def _resolve_ttl(self, key: str, ttl: Union[int, Dict[str, int], None]) -> Optional[int]:
+        """解析单个键的过期时间, 未指定时使用默认值"""
+        if isinstance(ttl, dict):
+            ttl = ttl.get(key)
+        return ttl if ttl is not None else self.config.default_ttl
+
     @property
     def is_connected(self) -> bool:
         """是否已连接"""
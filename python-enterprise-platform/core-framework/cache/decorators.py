@@ -0,0 +1,147 @@
+"""
+缓存装饰器 - 为异步函数提供旁路缓存(cache-aside)
+支持: 负缓存(缓存None结果)、标签分组失效、单飞合并加载
+"""
+
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+import inspect
+
+from .base import CacheBase
+
+# 装饰器写入的缓存条目标记
+_ENTRY_MARKER = "__cached__"
+
+# 标签版本号键前缀
+TAG_KEY_PREFIX = "tag:"
+
+CacheProvider = Union[CacheBase, Callable[[], CacheBase]]
+KeyBuilder = Union[str, Callable[..., str]]
+TagsBuilder = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+_default_cache: Optional[CacheProvider] = None
+
+
+def set_default_cache(cache: Optional[CacheProvider]) -> None:
+    """设置装饰器默认使用的缓存(实例或无参工厂函数)"""
+    global _default_cache
+    _default_cache = cache
+
+
+def _resolve_cache(cache: Optional[CacheProvider]) -> CacheBase:
+    """获取缓存实例"""
+    cache = cache if cache is not None else _default_cache
+    if cache is None:
+        raise RuntimeError("No cache configured for @cached")
+    return cache if isinstance(cache, CacheBase) else cache()
+
+
+def _tag_key(tag: str) -> str:
+    """标签版本号的缓存键"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+async def _tag_versions(cache: CacheBase, tags: List[str]) -> Dict[str, int]:
+    """
+    读取标签当前版本号
+
+    不存在的标签版本键通过incr(key, 0)写入初始版本0(即INCRBY 0, 等同SET NX 0且不设过期时间),
+    此后版本号是一个实际存在的键, 两级缓存可以从L1读到, 不必每次都访问L2。
+    """
+    if not tags:
+        return {}
+    found = await cache.get_many([_tag_key(tag) for tag in tags])
+    versions = {}
+    for tag in tags:
+        version = found.get(_tag_key(tag))
+        versions[tag] = int(version) if version is not None else await cache.incr(_tag_key(tag), 0)
+    return versions
+
+
+async def invalidate_tags(cache: CacheBase, *tags: str) -> None:
+    """
+    按标签失效缓存
+
+    递增标签版本号, 带有该标签的条目在下次读取时视为过期并重新加载。
+    """
+    for tag in tags:
+        await cache.incr(_tag_key(tag))
+
+
+def cached(
+    key: KeyBuilder,
+    ttl: Optional[int] = None,
+    negative_ttl: int = 0,
+    tags: TagsBuilder = None,
+    cache: Optional[CacheProvider] = None,
+    stale_ttl: int = 0,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    异步函数的旁路缓存装饰器
+
+    - key: 键模板(按函数参数名格式化, 如"user:{user_id}")或接收函数参数的可调用对象
+    - ttl: 结果的过期时间(秒), 默认使用缓存配置的default_ttl
+    - negative_ttl: 函数返回None时的缓存时间(秒), 0表示不缓存None
+    - tags: 标签模板列表或可调用对象, 配合invalidate_tags分组失效
+    - cache: 缓存实例或工厂函数(如依赖注入中的get_cache), 默认取set_default_cache的设置
+    - stale_ttl: 同get_or_load, 逻辑过期后先返回旧值并在后台刷新
+
+    加载经由get_or_load, 并发未命中只会执行一次被装饰函数。
+
+    示例:
+        @cached(key="user:{user_id}", ttl=300, negative_ttl=30, tags=["user:{user_id}"])
+        async def fetch_user(db, user_id: int) -> Optional[dict]:
+            ...
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+
+        def build(template: Union[str, Callable[..., Any]], args: tuple, kwargs: dict) -> Any:
+            if callable(template):
+                return template(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return template.format(**bound.arguments)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            backend = _resolve_cache(cache)
+            cache_key = build(key, args, kwargs)
+
+            if callable(tags):
+                tag_list = list(tags(*args, **kwargs))
+            else:
+                tag_list = [build(tag, args, kwargs) for tag in tags or ()]
+            versions = await _tag_versions(backend, tag_list)
+
+            async def load():
+                value = await func(*args, **kwargs)
+                entry = {_ENTRY_MARKER: True, "value": value, "tags": versions}
+                if value is None:
+                    # 负缓存由装饰器直接写入, get_or_load不会缓存None
+                    if negative_ttl:
+                        await backend.set(cache_key, entry, ttl=negative_ttl)
+                    return None
+                return entry
+
+            entry = await backend.get_or_load(cache_key, load, ttl=ttl, stale_ttl=stale_ttl)
+            if _is_stale(entry, versions):
+                # 标签已失效: 丢弃旧条目后重新加载一次
+                await backend.delete(cache_key)
+                entry = await backend.get_or_load(cache_key, load, ttl=ttl, stale_ttl=stale_ttl)
+
+            if isinstance(entry, dict) and entry.get(_ENTRY_MARKER):
+                return entry["value"]
+            return entry
+
+        return wrapper
+
+    return decorator
+
+
+def _is_stale(entry: Any, versions: Dict[str, int]) -> bool:
+    """条目记录的标签版本是否落后于当前版本"""
+    if not versions or not isinstance(entry, dict) or not entry.get(_ENTRY_MARKER):
+        return False
+    return entry.get("tags") != versions
@@ -0,0 +1,69 @@
+"""
+频率估计 - Count-Min Sketch
+为TinyLFU准入策略提供紧凑的近似访问频率
+"""
+
+from typing import Hashable
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch 频率估计器
+
+    使用4行计数器(每个计数器上限15), 估计值取各行最小值。
+    每行宽度取不小于4倍容量的2的幂, 以控制哈希冲突带来的高估。
+    累计递增次数达到采样窗口后所有计数器减半, 使历史热度逐渐衰减。
+    """
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+    _SEEDS = (
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+    )
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity: int, sample_factor: int = 10):
+        width = 16
+        while width < 4 * capacity:
+            width <<= 1
+        self._width = width
+        self._mask = width - 1
+        self._table = bytearray(self._DEPTH * width)
+        self._sample_size = max(1, sample_factor * capacity)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        """计算键在每一行中的位置"""
+        h = hash(key) & self._MASK64
+        for row, seed in enumerate(self._SEEDS):
+            mixed = ((h ^ seed) * 0xFF51AFD7ED558CCD) & self._MASK64
+            yield row * self._width + ((mixed >> 32) & self._mask)
+
+    def increment(self, key: Hashable) -> None:
+        """记录一次访问"""
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < self._MAX_COUNT:
+                table[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def frequency(self, key: Hashable) -> int:
+        """估计访问频率"""
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def _reset(self) -> None:
+        """老化: 所有计数器减半"""
+        self._table = bytearray(count >> 1 for count in self._table)
+        self._additions //= 2
+
+    def clear(self) -> None:
+        """清空所有计数"""
+        self._table = bytearray(len(self._table))
+        self._additions = 0
@@ -2,13 +2,19 @@
 内存缓存实现 - 适用于单机测试和开发环境
 """
 
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Union
+import gc
+import sys
 import time
 import asyncio
+import heapq
 from collections import OrderedDict
 from dataclasses import dataclass
 
 from .base import CacheBase, CacheConfig
+from .frequency_sketch import CountMinSketch
+from .serializers import PayloadCodec
+from .snapshot import SnapshotEntry, read_snapshot, write_snapshot
 
 
 @dataclass
@@ -16,66 +22,419 @@ class CacheItem:
     """缓存项"""
     value: Any
     expire_at: Optional[float] = None
+    size: int = 0
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """估算对象占用的字节数(容器递归统计, 最多3层)"""
+    size = sys.getsizeof(value)
+    if _depth >= 3 or isinstance(value, (str, bytes, bytearray, int, float, bool)):
+        return size
+
+    if isinstance(value, dict):
+        size += sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+class CacheSegment:
+    """
+    缓存分段 - 独立的淘汰顺序、锁和过期索引
+
+    policy="lru": 纯LRU, 顺序由cache自身维护。
+    policy="tinylfu": W-TinyLFU, 新键先进入约占1%容量的窗口LRU,
+    被挤出窗口的候选键与主区最旧的键比较Count-Min Sketch频率,
+    频率更低的一方被淘汰, 使一次性扫描无法冲掉热点数据。
+    """
+
+    def __init__(self, max_size: int, max_bytes: Optional[int] = None, policy: str = "lru"):
+        if policy not in ("lru", "tinylfu"):
+            raise ValueError(f"Unsupported eviction policy: {policy}")
+
+        self.cache: OrderedDict[str, CacheItem] = OrderedDict()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.lock = asyncio.Lock()
+
+        # 过期索引: (expire_at, key), 条目可能已失效, 弹出时再校验
+        self.expiry_heap: List[Tuple[float, str]] = []
+
+        # W-TinyLFU区域顺序 (仅policy="tinylfu"时使用)
+        self.window: OrderedDict[str, None] = OrderedDict()
+        self.main: OrderedDict[str, None] = OrderedDict()
+        self.window_max = max(1, max_size // 100)
+        self.sketch = CountMinSketch(max_size) if policy == "tinylfu" else None
+
+        # 统计
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def record_access(self, key: str) -> None:
+        """记录访问频率"""
+        if self.sketch is not None:
+            self.sketch.increment(key)
+
+    def touch(self, key: str) -> None:
+        """标记为最近使用"""
+        self.cache.move_to_end(key)
+        if self.policy == "tinylfu":
+            if key in self.window:
+                self.window.move_to_end(key)
+            else:
+                self.main.move_to_end(key)
+
+    def insert(self, key: str, item: CacheItem) -> None:
+        """写入缓存项并按容量淘汰"""
+        if self.max_bytes is not None:
+            item.size = sys.getsizeof(key) + estimate_size(item.value)
+
+        old = self.cache.get(key)
+        if old is not None:
+            self.bytes_used -= old.size
+            self.cache[key] = item
+            self.touch(key)
+        else:
+            self.cache[key] = item
+            if self.policy == "tinylfu":
+                self.window[key] = None
+
+        self.bytes_used += item.size
+        self.evict_overflow()
+
+    def discard(self, key: str) -> None:
+        """移除缓存项"""
+        item = self.cache.pop(key, None)
+        if item is None:
+            return
+        self.bytes_used -= item.size
+        if self.policy == "tinylfu":
+            self.window.pop(key, None)
+            self.main.pop(key, None)
+
+    def _over_capacity(self) -> bool:
+        """是否超出条目数或字节预算"""
+        if len(self.cache) > self.max_size:
+            return True
+        return self.max_bytes is not None and self.bytes_used > self.max_bytes
+
+    def evict_overflow(self) -> None:
+        """按淘汰策略回收超出容量的项"""
+        if self.policy == "lru":
+            while self.cache and self._over_capacity():
+                self.discard(next(iter(self.cache)))
+                self.evictions += 1
+            return
+
+        # 窗口溢出: 候选键晋升到主区, 主区已满时与主区最旧的键比较频率
+        while len(self.window) > self.window_max:
+            candidate, _ = self.window.popitem(last=False)
+            self.main[candidate] = None
+            if self._over_capacity() and len(self.main) > 1:
+                self._evict_loser(candidate, next(iter(self.main)))
+
+        # 仍超出预算(如写入大对象): 窗口最旧项与主区最旧项比较频率
+        while self.cache and self._over_capacity():
+            if self.window and self.main:
+                self._evict_loser(next(iter(self.window)), next(iter(self.main)))
+            else:
+                self.discard(next(iter(self.window or self.main)))
+                self.evictions += 1
+
+    def _evict_loser(self, candidate: str, victim: str) -> None:
+        """TinyLFU准入: 候选频率严格高于受害者时才淘汰受害者"""
+        if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+            self.discard(victim)
+        else:
+            self.discard(candidate)
+        self.evictions += 1
+
+    def schedule_expiry(self, key: str, expire_at: Optional[float]) -> None:
+        """登记过期时间到过期索引"""
+        if expire_at is None:
+            return
+
+        heapq.heappush(self.expiry_heap, (expire_at, key))
+
+        # 覆盖写入会留下失效条目, 堆明显大于缓存时重建以限制内存
+        if len(self.expiry_heap) > 2 * len(self.cache) + 1024:
+            self.expiry_heap = [
+                (item.expire_at, k) for k, item in self.cache.items()
+                if item.expire_at is not None
+            ]
+            heapq.heapify(self.expiry_heap)
+
+    def evict_expired(self, limit: Optional[int] = None) -> int:
+        """从过期索引堆顶回收已过期项, 返回回收数量"""
+        current_time = time.time()
+        heap = self.expiry_heap
+        evicted = 0
+
+        while heap and heap[0][0] < current_time:
+            if limit is not None and evicted >= limit:
+                break
+
+            expire_at, key = heapq.heappop(heap)
+            item = self.cache.get(key)
+            # 惰性删除: 键已删除或过期时间已变更时, 该条目失效
+            if item is not None and item.expire_at == expire_at:
+                self.discard(key)
+                evicted += 1
+
+        self.expirations += evicted
+        return evicted
+
+    def load(self, items: List[Tuple[str, CacheItem]]) -> None:
+        """批量写入(按LRU顺序, 最旧的在前), 最后统一淘汰并重建过期索引"""
+        for key, item in items:
+            if self.max_bytes is not None:
+                item.size = sys.getsizeof(key) + estimate_size(item.value)
+            old = self.cache.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old.size
+                self.window.pop(key, None)
+                self.main.pop(key, None)
+
+            self.cache[key] = item
+            self.bytes_used += item.size
+            if self.policy == "tinylfu":
+                self.main[key] = None
+
+        self.evict_overflow()
+        self.expiry_heap = [
+            (item.expire_at, k) for k, item in self.cache.items()
+            if item.expire_at is not None
+        ]
+        heapq.heapify(self.expiry_heap)
 
+    def clear(self) -> None:
+        """清空分段"""
+        self.cache.clear()
+        self.expiry_heap.clear()
+        self.window.clear()
+        self.main.clear()
+        self.bytes_used = 0
+        if self.sketch is not None:
+            self.sketch.clear()
 
-class MemoryCache(CacheBase):
-    """内存缓存实现 - 使用LRU策略"""
 
-    def __init__(self, config: CacheConfig, max_size: int = 10000):
+class MemoryCache(CacheBase):
+    """
+    内存缓存实现 - 使用LRU策略
+
+    过期索引使用最小堆 + 惰性删除: 读操作只检查目标键本身,
+    过期项由后台清理任务按批次从堆顶回收, 开销与实际过期数量成正比。
+
+    config.memory_shards > 1 时启用分段模式: 按键哈希选择分段,
+    每个分段拥有独立的锁与LRU顺序, max_size在分段间平均分配。
+
+    max_bytes 设置后按估算字节数限制内存占用; policy="tinylfu"
+    启用W-TinyLFU准入策略, 在扫描型访问下保持命中率。
+
+    snapshot_path 设置后在connect时从快照预热, 在disconnect时
+    (以及snapshot_interval>0时周期性地)把缓存按LRU顺序写入快照,
+    重启后不必从空缓存开始。
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        max_size: int = 10000,
+        sweep_interval: float = 1.0,
+        sweep_batch: int = 1000,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = 0,
+        snapshot_serializer: str = "pickle",
+    ):
         super().__init__(config)
-        self._cache: OrderedDict[str, CacheItem] = OrderedDict()
         self._max_size = max_size
-        self._lock = asyncio.Lock()
+        self._max_bytes = max_bytes
+        shard_count = max(1, config.memory_shards)
+        shard_size = max(1, -(-max_size // shard_count))
+        shard_bytes = -(-max_bytes // shard_count) if max_bytes is not None else None
+        self._segments: List[CacheSegment] = [
+            CacheSegment(shard_size, max_bytes=shard_bytes, policy=policy)
+            for _ in range(shard_count)
+        ]
+
+        self._sweep_interval = sweep_interval
+        self._sweep_batch = sweep_batch
+        self._sweeper_task: Optional[asyncio.Task] = None
+
+        # 快照(值为进程自身写入的本地文件, 默认使用pickle以支持任意对象)
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_codec = PayloadCodec(snapshot_serializer) if snapshot_path else None
+        self._snapshot_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
-        """连接缓存(内存缓存无需实际连接)"""
+        """连接缓存(内存缓存无需实际连接), 配置了快照时先从快照预热"""
+        if self._snapshot_path and not self._connected:
+            try:
+                await self.restore()
+            except Exception as e:
+                print(f"Error restoring cache snapshot: {e}")
+
         self._connected = True
+        if self._sweep_interval > 0 and self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(self._sweep_loop())
+        if self._snapshot_path and self._snapshot_interval > 0 and self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
 
     async def disconnect(self) -> None:
-        """断开连接"""
+        """断开连接, 配置了快照时先写入快照"""
+        for task in (self._sweeper_task, self._snapshot_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sweeper_task = None
+        self._snapshot_task = None
+
+        if self._snapshot_path and self._connected:
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"Error writing cache snapshot: {e}")
+
         await self.flush()
         self._connected = False
 
+    async def snapshot(self) -> int:
+        """
+        把未过期的缓存项写入快照文件, 返回写入的条目数
+
+        持锁期间只复制各分段的条目引用, 编码和写文件在线程中进行, 不阻塞事件循环。
+        """
+        if not self._snapshot_path:
+            raise RuntimeError("Snapshot path not configured")
+
+        entries: List[SnapshotEntry] = []
+        now = time.time()
+        for segment in self._segments:
+            async with segment.lock:
+                entries.extend(
+                    (key, item.value, item.expire_at)
+                    for key, item in segment.cache.items()
+                    if item.expire_at is None or item.expire_at > now
+                )
+
+        return await asyncio.to_thread(
+            write_snapshot, self._snapshot_path, entries, self._snapshot_codec
+        )
+
+    async def restore(self) -> int:
+        """
+        从快照文件恢复缓存项(保留剩余TTL), 返回恢复的条目数
+
+        解析在线程中进行; 写入分段回到事件循环线程并持有分段锁,
+        批量插入期间暂停GC(避免分代GC被反复触发), 之后恢复原先的GC状态。
+        """
+        if not self._snapshot_path:
+            raise RuntimeError("Snapshot path not configured")
+
+        groups = await asyncio.to_thread(self._read_snapshot_groups)
+        for segment, items in zip(self._segments, groups):
+            async with segment.lock:
+                gc_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    segment.load(items)
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+        return sum(len(items) for items in groups)
+
+    def _read_snapshot_groups(self) -> List[List[Tuple[str, CacheItem]]]:
+        """解析快照并按分段归组条目, 不修改缓存状态"""
+        groups: List[List[Tuple[str, CacheItem]]] = [[] for _ in self._segments]
+        for entries in read_snapshot(self._snapshot_path, self._snapshot_codec):
+            if len(self._segments) == 1:
+                groups[0].extend(
+                    (key, CacheItem(value=value, expire_at=expire_at))
+                    for key, value, expire_at in entries
+                )
+                continue
+            for key, value, expire_at in entries:
+                groups[hash(key) % len(self._segments)].append(
+                    (key, CacheItem(value=value, expire_at=expire_at))
+                )
+        return groups
+
+    async def _snapshot_loop(self) -> None:
+        """后台快照任务"""
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"Error writing cache snapshot: {e}")
+
+    def _segment(self, key: str) -> CacheSegment:
+        """按键哈希选择分段"""
+        if len(self._segments) == 1:
+            return self._segments[0]
+        return self._segments[hash(key) % len(self._segments)]
+
+    def _group_by_segment(self, keys: List[str]) -> Dict[int, List[str]]:
+        """按分段归组键, 使每个分段只加一次锁"""
+        if len(self._segments) == 1:
+            return {0: list(keys)}
+
+        groups: Dict[int, List[str]] = {}
+        for key in keys:
+            groups.setdefault(hash(key) % len(self._segments), []).append(key)
+        return groups
+
     def _is_expired(self, item: CacheItem) -> bool:
         """检查是否过期"""
         if item.expire_at is None:
             return False
         return time.time() > item.expire_at
 
-    async def _evict_expired(self) -> None:
-        """清除过期项"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, item in self._cache.items()
-            if item.expire_at and current_time > item.expire_at
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-
-    async def _evict_lru(self) -> None:
-        """LRU淘汰"""
-        if len(self._cache) >= self._max_size:
-            # 删除最旧的项
-            self._cache.popitem(last=False)
+    async def _sweep_loop(self) -> None:
+        """后台清理任务: 每个分段每轮最多回收sweep_batch个过期项"""
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            for segment in self._segments:
+                async with segment.lock:
+                    segment.evict_expired(limit=self._sweep_batch)
 
     async def get(self, key: str) -> Optional[Any]:
         """获取缓存值"""
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            await self._evict_expired()
-
-            if key not in self._cache:
+        segment = self._segment(key)
+        async with segment.lock:
+            segment.record_access(key)
+            item = segment.cache.get(key)
+            if item is None:
+                segment.misses += 1
                 return None
 
-            item = self._cache[key]
             if self._is_expired(item):
-                del self._cache[key]
+                segment.discard(key)
+                segment.expirations += 1
+                segment.misses += 1
                 return None
 
             # 移到末尾(最近使用)
-            self._cache.move_to_end(key)
+            segment.touch(key)
+            segment.hits += 1
             return item.value
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
@@ -83,14 +442,13 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            await self._evict_lru()
-
+        segment = self._segment(key)
+        async with segment.lock:
             expire_time = ttl if ttl is not None else self.config.default_ttl
             expire_at = time.time() + expire_time if expire_time else None
 
-            self._cache[key] = CacheItem(value=value, expire_at=expire_at)
-            self._cache.move_to_end(key)
+            segment.insert(key, CacheItem(value=value, expire_at=expire_at))
+            segment.schedule_expiry(key, expire_at)
             return True
 
     async def delete(self, key: str) -> bool:
@@ -98,9 +456,10 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        segment = self._segment(key)
+        async with segment.lock:
+            if key in segment.cache:
+                segment.discard(key)
                 return True
             return False
 
@@ -109,14 +468,15 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            await self._evict_expired()
-            if key not in self._cache:
+        segment = self._segment(key)
+        async with segment.lock:
+            item = segment.cache.get(key)
+            if item is None:
                 return False
 
-            item = self._cache[key]
             if self._is_expired(item):
-                del self._cache[key]
+                segment.discard(key)
+                segment.expirations += 1
                 return False
 
             return True
@@ -126,12 +486,14 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            if key not in self._cache:
+        segment = self._segment(key)
+        async with segment.lock:
+            if key not in segment.cache:
                 return False
 
-            item = self._cache[key]
+            item = segment.cache[key]
             item.expire_at = time.time() + ttl
+            segment.schedule_expiry(key, item.expire_at)
             return True
 
     async def ttl(self, key: str) -> int:
@@ -139,11 +501,12 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            if key not in self._cache:
+        segment = self._segment(key)
+        async with segment.lock:
+            if key not in segment.cache:
                 return -2  # 键不存在
 
-            item = self._cache[key]
+            item = segment.cache[key]
             if item.expire_at is None:
                 return -1  # 永不过期
 
@@ -155,57 +518,166 @@ class MemoryCache(CacheBase):
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            await self._evict_expired()
+        import fnmatch
 
-            if pattern == "*":
-                return list(self._cache.keys())
+        result: List[str] = []
+        for segment in self._segments:
+            async with segment.lock:
+                segment.evict_expired()
 
-            # 简单的模式匹配
-            import fnmatch
-            return [key for key in self._cache.keys() if fnmatch.fnmatch(key, pattern)]
+                if pattern == "*":
+                    result.extend(segment.cache.keys())
+                else:
+                    # 简单的模式匹配
+                    result.extend(
+                        key for key in segment.cache.keys() if fnmatch.fnmatch(key, pattern)
+                    )
+        return result
 
     async def flush(self) -> bool:
         """清空所有缓存"""
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            self._cache.clear()
-            return True
+        for segment in self._segments:
+            async with segment.lock:
+                segment.clear()
+        return True
 
-    async def incr(self, key: str, amount: int = 1) -> int:
-        """递增"""
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量获取缓存值"""
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            if key not in self._cache:
-                self._cache[key] = CacheItem(value=0)
+        result: Dict[str, Any] = {}
+        for index, segment_keys in self._group_by_segment(keys).items():
+            segment = self._segments[index]
+            async with segment.lock:
+                for key in segment_keys:
+                    segment.record_access(key)
+                    item = segment.cache.get(key)
+                    if item is None:
+                        segment.misses += 1
+                        continue
+
+                    if self._is_expired(item):
+                        segment.discard(key)
+                        segment.expirations += 1
+                        segment.misses += 1
+                        continue
+
+                    segment.touch(key)
+                    segment.hits += 1
+                    result[key] = item.value
+        return result
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Union[int, Dict[str, int], None] = None,
+    ) -> bool:
+        """批量设置缓存值"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
 
-            item = self._cache[key]
-            if not isinstance(item.value, int):
-                raise ValueError(f"Key {key} does not contain an integer")
+        now = time.time()
+        for index, segment_keys in self._group_by_segment(list(mapping)).items():
+            segment = self._segments[index]
+            async with segment.lock:
+                for key in segment_keys:
+                    expire_time = self._resolve_ttl(key, ttl)
+                    expire_at = now + expire_time if expire_time else None
+                    segment.insert(key, CacheItem(value=mapping[key], expire_at=expire_at))
+                    segment.schedule_expiry(key, expire_at)
+        return True
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
 
-            item.value += amount
-            return item.value
+        deleted = 0
+        for index, segment_keys in self._group_by_segment(keys).items():
+            segment = self._segments[index]
+            async with segment.lock:
+                for key in segment_keys:
+                    if key in segment.cache:
+                        segment.discard(key)
+                        deleted += 1
+        return deleted
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """批量检查键是否存在"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result: Dict[str, bool] = {}
+        for index, segment_keys in self._group_by_segment(keys).items():
+            segment = self._segments[index]
+            async with segment.lock:
+                for key in segment_keys:
+                    item = segment.cache.get(key)
+                    if item is not None and self._is_expired(item):
+                        segment.discard(key)
+                        segment.expirations += 1
+                        item = None
+                    result[key] = item is not None
+        return result
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """递增"""
+        return await self._add(key, amount)
 
     async def decr(self, key: str, amount: int = 1) -> int:
         """递减"""
+        return await self._add(key, -amount)
+
+    async def _add(self, key: str, amount: int) -> int:
+        """原子地加上amount, 键不存在或已过期时从0开始"""
         if not self._connected:
             raise RuntimeError("Cache not connected")
 
-        async with self._lock:
-            if key not in self._cache:
-                self._cache[key] = CacheItem(value=0)
+        segment = self._segment(key)
+        async with segment.lock:
+            item = segment.cache.get(key)
+            if item is not None and self._is_expired(item):
+                segment.discard(key)
+                segment.expirations += 1
+                item = None
+
+            if item is None:
+                # 直接写入结果; 容量不足时新条目可能立即被淘汰, 不能再从cache中取回
+                segment.insert(key, CacheItem(value=amount))
+                return amount
 
-            item = self._cache[key]
             if not isinstance(item.value, int):
                 raise ValueError(f"Key {key} does not contain an integer")
 
-            item.value -= amount
+            item.value += amount
             return item.value
 
     def size(self) -> int:
         """获取缓存大小"""
-        return len(self._cache)
+        return sum(len(segment.cache) for segment in self._segments)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        hits = sum(segment.hits for segment in self._segments)
+        misses = sum(segment.misses for segment in self._segments)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "evictions": sum(segment.evictions for segment in self._segments),
+            "expirations": sum(segment.expirations for segment in self._segments),
+            "entries": self.size(),
+            "max_size": self._max_size,
+            "bytes": sum(segment.bytes_used for segment in self._segments),
+            "max_bytes": self._max_bytes,
+        }
+
+    @property
+    def shard_count(self) -> int:
+        """分段数量"""
+        return len(self._segments)
@@ -0,0 +1,297 @@
+"""
+缓存指标 - 命中/未命中、错误、淘汰与各操作延迟直方图
+以Prometheus文本格式导出
+"""
+
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily, Metric
+
+from .base import CacheBase
+
+# 延迟直方图分桶(秒), 覆盖进程内缓存(微秒级)到远程缓存(毫秒级)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+# 多键批量操作使用的前缀标签
+BULK_PREFIX = "*"
+
+
+class _Histogram:
+    """单个标签组合的直方图, 只在采集时计算累计值"""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class CacheMetrics:
+    """
+    缓存指标收集器
+
+    热路径只做字典查找和整数累加, 采集时才生成Prometheus指标族。
+    键前缀取第一个':'之前的部分, 超过max_prefixes个不同前缀后归入"other", 以限制标签基数。
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        max_prefixes: int = 100,
+    ):
+        self._buckets = tuple(sorted(buckets))
+        self._max_prefixes = max_prefixes
+        self._prefixes: Set[str] = set()
+        self._latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._lookups: Dict[Tuple[str, str], List[int]] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._caches: Dict[str, CacheBase] = {}
+
+    def track(self, name: str, cache: CacheBase) -> None:
+        """登记缓存实例, 采集时读取其淘汰计数"""
+        self._caches[name] = cache
+
+    def prefix(self, key: str) -> str:
+        """提取键前缀"""
+        prefix = key.partition(":")[0]
+        if prefix not in self._prefixes:
+            if len(self._prefixes) >= self._max_prefixes:
+                return "other"
+            self._prefixes.add(prefix)
+        return prefix
+
+    def observe(self, cache: str, operation: str, prefix: str, seconds: float) -> None:
+        """记录一次操作耗时"""
+        series = (cache, operation, prefix)
+        histogram = self._latency.get(series)
+        if histogram is None:
+            histogram = self._latency[series] = _Histogram(len(self._buckets) + 1)
+        histogram.counts[bisect_left(self._buckets, seconds)] += 1
+        histogram.total += seconds
+
+    def record_lookup(self, cache: str, prefix: str, hits: int, misses: int) -> None:
+        """记录命中/未命中次数"""
+        counters = self._lookups.get((cache, prefix))
+        if counters is None:
+            counters = self._lookups[(cache, prefix)] = [0, 0]
+        counters[0] += hits
+        counters[1] += misses
+
+    def record_error(self, cache: str, operation: str) -> None:
+        """记录一次操作异常"""
+        series = (cache, operation)
+        self._errors[series] = self._errors.get(series, 0) + 1
+
+    def collect(self) -> Iterator[Metric]:
+        """生成Prometheus指标族(Collector接口)"""
+        hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache", "prefix"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache", "prefix"])
+        for (cache, prefix), (hit_count, miss_count) in list(self._lookups.items()):
+            hits.add_metric([cache, prefix], hit_count)
+            misses.add_metric([cache, prefix], miss_count)
+
+        errors = CounterMetricFamily(
+            "cache_errors", "Cache operation errors", labels=["cache", "operation"]
+        )
+        for (cache, operation), count in list(self._errors.items()):
+            errors.add_metric([cache, operation], count)
+
+        evictions = CounterMetricFamily(
+            "cache_evictions", "Entries evicted by the local cache policy", labels=["cache"]
+        )
+        for name, cache in list(self._caches.items()):
+            count = _eviction_count(cache)
+            if count is not None:
+                evictions.add_metric([name], count)
+
+        latency = HistogramMetricFamily(
+            "cache_operation_duration_seconds",
+            "Cache operation latency",
+            labels=["cache", "operation", "prefix"],
+        )
+        bounds = [repr(bound) for bound in self._buckets] + ["+Inf"]
+        for labels, histogram in list(self._latency.items()):
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            latency.add_metric(list(labels), buckets, histogram.total)
+
+        yield from (hits, misses, errors, evictions, latency)
+
+    def render(self) -> bytes:
+        """导出为Prometheus文本格式"""
+        registry = CollectorRegistry()
+        registry.register(self)
+        return generate_latest(registry)
+
+
+def _eviction_count(cache: CacheBase) -> Optional[int]:
+    """读取本地缓存的淘汰计数(两级缓存取L1), 不支持时返回None"""
+    cache = getattr(cache, "l1", cache)
+    stats = getattr(cache, "stats", None)
+    if stats is None:
+        return None
+    return stats().get("evictions")
+
+
+_default_metrics: Optional[CacheMetrics] = None
+
+
+def get_cache_metrics() -> CacheMetrics:
+    """获取注册到默认Prometheus注册表的全局缓存指标"""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = CacheMetrics()
+        REGISTRY.register(_default_metrics)
+    return _default_metrics
+
+
+class InstrumentedCache(CacheBase):
+    """
+    带指标的缓存包装器
+
+    包装任意CacheBase实现, 记录每个操作的延迟、异常以及get类操作的命中率。
+    单键操作按键前缀打标签, 批量操作的前缀标签为"*"。
+    """
+
+    def __init__(
+        self,
+        cache: CacheBase,
+        name: str = "default",
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        super().__init__(cache.config)
+        self._cache = cache
+        self._name = name
+        self._metrics = metrics or get_cache_metrics()
+        self._metrics.track(name, cache)
+
+    async def connect(self) -> None:
+        """连接缓存"""
+        await self._cache.connect()
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        """断开缓存"""
+        await self._cache.disconnect()
+        self._connected = False
+
+    async def _call(self, operation: str, prefix: str, method, *args) -> Any:
+        """调用被包装缓存的方法并记录耗时和异常"""
+        start = time.perf_counter()
+        try:
+            result = await method(*args)
+        except Exception:
+            self._metrics.record_error(self._name, operation)
+            raise
+        self._metrics.observe(self._name, operation, prefix, time.perf_counter() - start)
+        return result
+
+    @asynccontextmanager
+    async def _load_guard(self, key: str, timeout: float) -> AsyncIterator[bool]:
+        """沿用被包装缓存的加载互斥"""
+        async with self._cache._load_guard(key, timeout) as acquired:
+            yield acquired
+
+    async def _load_in_progress(self, key: str) -> bool:
+        """沿用被包装缓存的加载锁状态"""
+        return await self._cache._load_in_progress(key)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """获取缓存值"""
+        # 最热的路径, 内联计时以省去一层协程调用
+        metrics = self._metrics
+        prefix = metrics.prefix(key)
+        start = time.perf_counter()
+        try:
+            value = await self._cache.get(key)
+        except Exception:
+            metrics.record_error(self._name, "get")
+            raise
+        metrics.observe(self._name, "get", prefix, time.perf_counter() - start)
+        if value is None:
+            metrics.record_lookup(self._name, prefix, 0, 1)
+        else:
+            metrics.record_lookup(self._name, prefix, 1, 0)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """设置缓存值"""
+        return await self._call("set", self._metrics.prefix(key), self._cache.set, key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        """删除缓存"""
+        return await self._call("delete", self._metrics.prefix(key), self._cache.delete, key)
+
+    async def exists(self, key: str) -> bool:
+        """检查键是否存在"""
+        return await self._call("exists", self._metrics.prefix(key), self._cache.exists, key)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """设置过期时间"""
+        return await self._call("expire", self._metrics.prefix(key), self._cache.expire, key, ttl)
+
+    async def ttl(self, key: str) -> int:
+        """获取键的剩余生存时间"""
+        return await self._call("ttl", self._metrics.prefix(key), self._cache.ttl, key)
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        """获取匹配的键列表"""
+        return await self._call("keys", BULK_PREFIX, self._cache.keys, pattern)
+
+    async def flush(self) -> bool:
+        """清空所有缓存"""
+        return await self._call("flush", BULK_PREFIX, self._cache.flush)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量获取缓存值, 命中率按各键前缀分别统计"""
+        result = await self._call("get_many", BULK_PREFIX, self._cache.get_many, keys)
+        for key in keys:
+            if key in result:
+                self._metrics.record_lookup(self._name, self._metrics.prefix(key), 1, 0)
+            else:
+                self._metrics.record_lookup(self._name, self._metrics.prefix(key), 0, 1)
+        return result
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Union[int, Dict[str, int], None] = None,
+    ) -> bool:
+        """批量设置缓存值"""
+        return await self._call("set_many", BULK_PREFIX, self._cache.set_many, mapping, ttl)
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存"""
+        return await self._call("delete_many", BULK_PREFIX, self._cache.delete_many, keys)
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """批量检查键是否存在"""
+        return await self._call("exists_many", BULK_PREFIX, self._cache.exists_many, keys)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """递增"""
+        return await self._call("incr", self._metrics.prefix(key), self._cache.incr, key, amount)
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        """递减"""
+        return await self._call("decr", self._metrics.prefix(key), self._cache.decr, key, amount)
+
+    @property
+    def cache(self) -> CacheBase:
+        """被包装的缓存"""
+        return self._cache
+
+    @property
+    def metrics(self) -> CacheMetrics:
+        """指标收集器"""
+        return self._metrics
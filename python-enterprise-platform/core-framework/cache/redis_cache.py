@@ -2,24 +2,77 @@
 Redis缓存实现
 """
 
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple, Union
+from contextlib import asynccontextmanager
 import json
-import pickle
+import uuid
 
 from redis.asyncio import Redis, ConnectionPool
-from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.crc import key_slot as _crc_key_slot
+
+from connections.redis_pool import RedisPoolConfig, get_redis_pool_registry
 
 from .base import CacheBase, CacheConfig
+from .serializers import PayloadCodec
 
 
-class RedisCache(CacheBase):
-    """Redis缓存实现"""
+# 仅当锁仍属于自己时才删除
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+# 开启read_from_replicas时可以路由到副本的命令
+_REPLICA_READ_COMMANDS = frozenset({"MGET", "EXISTS"})
+
+
+def key_slot(key: str) -> int:
+    """计算键所在的集群槽位(遵循哈希标签规则)"""
+    return _crc_key_slot(key.encode())
+
 
-    def __init__(self, config: CacheConfig, serializer: str = "json"):
+def hash_tag(tag: str, key: str) -> str:
+    """
+    为键加上哈希标签, 标签相同的键落在同一槽位
+
+    集群模式下同一槽位的键在批量操作中合并为一条MGET/DEL。
+    例: hash_tag("user:1", "profile") -> "{user:1}:profile"
+    """
+    return f"{{{tag}}}:{key}"
+
+
+class RedisCache(CacheBase):
+    """
+    Redis缓存实现
+
+    集群模式下批量操作按槽位拆分为多键命令, 由集群pipeline按节点分组并发执行;
+    config.read_from_replicas开启后读操作分摊到副本(副本复制存在延迟, 可能读到旧值)。
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        serializer: str = "json",
+        distributed_lock: bool = False,
+        compression: Optional[str] = None,
+        compress_threshold: int = 1024,
+    ):
         super().__init__(config)
         self._client: Optional[Redis] = None
         self._pool: Optional[ConnectionPool] = None
-        self.serializer = serializer  # json or pickle
+        self._pool_name: Optional[str] = None
+        self.serializer = serializer  # json, pickle, orjson, msgpack
+
+        # 纯json且不压缩时保持原有的文本格式; 其它组合使用带格式头的二进制编码
+        self._codec: Optional[PayloadCodec] = None
+        if serializer != "json" or compression:
+            self._codec = PayloadCodec(serializer, compression, compress_threshold)
+        # get_or_load时使用Redis锁跨进程合并加载
+        self.distributed_lock = distributed_lock
 
     async def connect(self) -> None:
         """连接Redis"""
@@ -29,22 +82,22 @@ class RedisCache(CacheBase):
         if self.config.cluster_mode:
             # 集群模式
             self._client = RedisCluster(
-                startup_nodes=self.config.cluster_nodes,
-                decode_responses=self.config.decode_responses,
-                password=self.config.password,
-            )
-        else:
-            # 单机模式
-            self._pool = ConnectionPool(
-                host=self.config.host,
-                port=self.config.port,
+                startup_nodes=[
+                    ClusterNode(node["host"], node["port"])
+                    for node in self.config.cluster_nodes
+                ],
+                decode_responses=self._decode_responses,
                 password=self.config.password,
-                db=self.config.db,
+                read_from_replicas=self.config.read_from_replicas,
                 max_connections=self.config.max_connections,
                 socket_timeout=self.config.socket_timeout,
                 socket_connect_timeout=self.config.socket_connect_timeout,
-                decode_responses=self.config.decode_responses,
             )
+        else:
+            # 单机模式: 从注册表获取共享连接池
+            pool_config = self._pool_config()
+            self._pool_name = self.config.pool_name or pool_config.default_name
+            self._pool = await get_redis_pool_registry().acquire(pool_config, self._pool_name)
             self._client = Redis(connection_pool=self._pool)
 
         # 测试连接
@@ -61,25 +114,45 @@ class RedisCache(CacheBase):
             self._client = None
 
         if self._pool:
-            await self._pool.disconnect()
+            # 共享连接池由注册表在最后一个使用方释放时关闭
+            await get_redis_pool_registry().release(self._pool_name)
             self._pool = None
 
         self._connected = False
 
-    def _serialize(self, value: Any) -> str:
+    def _pool_config(self) -> RedisPoolConfig:
+        """单机模式的连接池配置"""
+        return RedisPoolConfig(
+            host=self.config.host,
+            port=self.config.port,
+            password=self.config.password,
+            db=self.config.db,
+            decode_responses=self._decode_responses,
+            max_connections=self.config.max_connections,
+            pool_timeout=self.config.pool_timeout,
+            socket_timeout=self.config.socket_timeout,
+            socket_connect_timeout=self.config.socket_connect_timeout,
+            health_check_interval=self.config.health_check_interval,
+        )
+
+    @property
+    def _decode_responses(self) -> bool:
+        """二进制编码需要原始bytes响应"""
+        return self.config.decode_responses and self._codec is None
+
+    def _serialize(self, value: Any) -> Union[str, bytes]:
         """序列化值"""
-        if self.serializer == "pickle":
-            return pickle.dumps(value)
-        else:
-            return json.dumps(value)
+        if self._codec:
+            return self._codec.encode(value)
+        return json.dumps(value)
 
-    def _deserialize(self, value: str) -> Any:
+    def _deserialize(self, value: Union[str, bytes]) -> Any:
         """反序列化值"""
         if not value:
             return None
 
-        if self.serializer == "pickle":
-            return pickle.loads(value)
+        if self._codec:
+            return self._codec.decode(value)
         else:
             try:
                 return json.loads(value)
@@ -142,8 +215,8 @@ class RedisCache(CacheBase):
         if not self._connected or not self._client:
             raise RuntimeError("Cache not connected")
 
-        keys = await self._client.keys(pattern)
-        return [key.decode() if isinstance(key, bytes) else key for key in keys]
+        # 使用SCAN增量遍历, 避免KEYS阻塞整个Redis
+        return [key async for key in self.scan_iter(pattern)]
 
     async def flush(self) -> bool:
         """清空所有缓存"""
@@ -152,6 +225,130 @@ class RedisCache(CacheBase):
 
         return await self._client.flushdb()
 
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量获取缓存值 (单机MGET; 集群模式按槽位拆分并发执行)"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not keys:
+            return {}
+
+        if not self.config.cluster_mode:
+            values = await self._client.mget(keys)
+            return {
+                key: self._deserialize(value)
+                for key, value in zip(keys, values)
+                if value
+            }
+
+        # 集群模式: 每个槽位一条MGET
+        slots = self._partition_by_slot(keys)
+        results = await self._execute_on_slots("MGET", list(slots.items()))
+        found = {}
+        for slot_keys, values in zip(slots.values(), results):
+            for key, value in zip(slot_keys, values):
+                if value:
+                    found[key] = self._deserialize(value)
+        return found
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Union[int, Dict[str, int], None] = None,
+    ) -> bool:
+        """批量设置缓存值 (pipeline一次往返, 支持按键TTL; 集群模式下按节点分组并发发送)"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not mapping:
+            return True
+
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                expire_time = self._resolve_ttl(key, ttl)
+                pipe.set(key, self._serialize(value), ex=expire_time or None)
+            results = await pipe.execute()
+
+        return all(results)
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not keys:
+            return 0
+
+        if not self.config.cluster_mode:
+            return await self._client.delete(*keys)
+
+        # 集群模式: 每个槽位一条DEL
+        slots = self._partition_by_slot(keys)
+        return sum(await self._execute_on_slots("DEL", list(slots.items())))
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """批量检查键是否存在"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not keys:
+            return {}
+
+        if self.config.cluster_mode:
+            # 多键EXISTS只返回总数, 集群模式下逐键按槽位路由
+            results = await self._execute_on_slots(
+                "EXISTS", [(key_slot(key), [key]) for key in keys]
+            )
+        else:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.exists(key)
+                results = await pipe.execute()
+
+        return {key: result > 0 for key, result in zip(keys, results)}
+
+    async def ttl_many(self, keys: List[str]) -> Dict[str, float]:
+        """批量获取剩余生存时间(PTTL, 精确到毫秒), -1表示永不过期, -2表示不存在"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not keys:
+            return {}
+
+        if self.config.cluster_mode:
+            results = await self._execute_on_slots(
+                "PTTL", [(key_slot(key), [key]) for key in keys]
+            )
+        else:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.pttl(key)
+                results = await pipe.execute()
+
+        return {key: result / 1000 if result >= 0 else float(result) for key, result in zip(keys, results)}
+
+    @asynccontextmanager
+    async def _load_guard(self, key: str, timeout: float) -> AsyncIterator[bool]:
+        """get_or_load的分布式锁: SET NX PX获取, Lua脚本校验后释放"""
+        if not self.distributed_lock:
+            yield True
+            return
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(lock_key, token, nx=True, px=int(timeout * 1000))
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                await self._client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    async def _load_in_progress(self, key: str) -> bool:
+        """加载锁是否仍存在"""
+        if not self.distributed_lock:
+            return False
+        return bool(await self._client.exists(f"lock:{key}"))
+
     async def incr(self, key: str, amount: int = 1) -> int:
         """递增"""
         if not self._connected or not self._client:
@@ -168,6 +365,89 @@ class RedisCache(CacheBase):
 
     # Redis特有方法
 
+    async def scan_iter(self, pattern: str = "*", count: int = 1000) -> AsyncIterator[str]:
+        """
+        增量遍历匹配的键 (SCAN, 集群模式下逐个主节点遍历)
+
+        count为每次SCAN的提示批量大小, 内存占用与键总数无关。
+        """
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        if not self.config.cluster_mode:
+            cursor = 0
+            while True:
+                cursor, batch = await self._client.scan(cursor=cursor, match=pattern, count=count)
+                for key in batch:
+                    yield key.decode() if isinstance(key, bytes) else key
+                if cursor == 0:
+                    return
+
+        for node in self._client.get_primaries():
+            cursor = 0
+            while True:
+                cursors, batch = await self._client.scan(
+                    cursor=cursor, match=pattern, count=count, target_nodes=node
+                )
+                for key in batch:
+                    yield key.decode() if isinstance(key, bytes) else key
+                cursor = cursors[node.name]
+                if cursor == 0:
+                    break
+
+    async def delete_pattern(self, pattern: str, batch_size: int = 1000) -> int:
+        """按模式删除键: SCAN分批, 每批通过UNLINK异步释放内存, 返回删除数量"""
+        if not self._connected or not self._client:
+            raise RuntimeError("Cache not connected")
+
+        deleted = 0
+        batch: List[str] = []
+        async for key in self.scan_iter(pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self._unlink_batch(batch)
+                batch = []
+
+        if batch:
+            deleted += await self._unlink_batch(batch)
+        return deleted
+
+    async def _unlink_batch(self, keys: List[str]) -> int:
+        """删除一批键"""
+        if not self.config.cluster_mode:
+            return await self._client.unlink(*keys)
+
+        # 集群模式: 每个槽位一条UNLINK
+        slots = self._partition_by_slot(keys)
+        return sum(await self._execute_on_slots("UNLINK", list(slots.items())))
+
+    @staticmethod
+    def _partition_by_slot(keys: List[str]) -> Dict[int, List[str]]:
+        """按集群槽位分组键"""
+        slots: Dict[int, List[str]] = {}
+        for key in keys:
+            slots.setdefault(key_slot(key), []).append(key)
+        return slots
+
+    async def _execute_on_slots(
+        self,
+        command: str,
+        commands: List[Tuple[int, List[str]]],
+    ) -> List[Any]:
+        """
+        集群模式: 把(槽位, 参数)列表中的每条命令发往该槽位所在节点
+
+        集群pipeline按目标节点分组, 各节点的命令并发发送, 结果按输入顺序返回。
+        """
+        replica = self.config.read_from_replicas and command in _REPLICA_READ_COMMANDS
+        nodes = self._client.nodes_manager
+        pipe = self._client.pipeline()
+        for slot, args in commands:
+            pipe.execute_command(
+                command, *args, target_nodes=[nodes.get_node_from_slot(slot, replica)]
+            )
+        return await pipe.execute()
+
     async def hget(self, name: str, key: str) -> Optional[Any]:
         """从哈希表获取值"""
         if not self._connected or not self._client:
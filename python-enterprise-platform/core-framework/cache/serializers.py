@@ -0,0 +1,269 @@
+"""
+缓存值序列化
+支持: json, pickle, orjson, msgpack, 可选lz4/zstd压缩
+
+编码格式: 1字节头 + 负载。头字节 = (压缩算法ID << 3) | 序列化格式ID,
+取值均小于0x20, 不会与JSON文本或pickle(0x80)的首字节冲突,
+因此同一个库中混存的新旧格式数据都能正确解码。
+出于安全考虑, 只有配置为pickle的编解码器才会反序列化pickle数据。
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+import json
+import pickle
+
+
+class Serializer(ABC):
+    """序列化器基类"""
+
+    name: str = ""
+    format_id: int = 0
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """序列化"""
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """反序列化"""
+        pass
+
+
+class JsonSerializer(Serializer):
+    """标准库json"""
+
+    name = "json"
+    format_id = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleSerializer(Serializer):
+    """pickle (仅用于可信数据)"""
+
+    name = "pickle"
+    format_id = 2
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson - 原生支持datetime/UUID/dataclass"""
+
+    name = "orjson"
+    format_id = 3
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """msgpack - 紧凑的二进制格式"""
+
+    name = "msgpack"
+    format_id = 4
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+class Compressor(ABC):
+    """压缩器基类"""
+
+    name: str = ""
+    compression_id: int = 0
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """压缩"""
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """解压"""
+        pass
+
+
+class Lz4Compressor(Compressor):
+    """lz4 - 压缩/解压速度优先"""
+
+    name = "lz4"
+    compression_id = 1
+
+    def __init__(self):
+        import lz4.frame
+
+        self._lz4 = lz4.frame
+
+    def compress(self, data: bytes) -> bytes:
+        return self._lz4.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._lz4.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    """zstd - 压缩率优先"""
+
+    name = "zstd"
+    compression_id = 2
+
+    def __init__(self, level: int = 3):
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+_SERIALIZERS: Dict[str, type] = {}
+_COMPRESSORS: Dict[str, type] = {}
+
+
+def register_serializer(serializer_class: type) -> None:
+    """注册序列化器"""
+    if not 0 < serializer_class.format_id < 8:
+        raise ValueError("format_id must be between 1 and 7")
+    _SERIALIZERS[serializer_class.name] = serializer_class
+
+
+def register_compressor(compressor_class: type) -> None:
+    """注册压缩器"""
+    if not 0 < compressor_class.compression_id < 4:
+        raise ValueError("compression_id must be between 1 and 3")
+    _COMPRESSORS[compressor_class.name] = compressor_class
+
+
+for _serializer in (JsonSerializer, PickleSerializer, OrjsonSerializer, MsgpackSerializer):
+    register_serializer(_serializer)
+
+for _compressor in (Lz4Compressor, ZstdCompressor):
+    register_compressor(_compressor)
+
+
+class PayloadCodec:
+    """
+    带格式头的编解码器
+
+    写入使用指定的序列化器, 负载超过compress_threshold字节时压缩;
+    读取时根据头字节选择序列化器和解压算法, 无头数据按旧格式(json/pickle)解析。
+    """
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: Optional[str] = None,
+        compress_threshold: int = 1024,
+    ):
+        if serializer not in _SERIALIZERS:
+            raise ValueError(f"Unsupported serializer: {serializer}")
+        if compression is not None and compression not in _COMPRESSORS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self._serializer: Serializer = _SERIALIZERS[serializer]()
+        self._compressor: Optional[Compressor] = (
+            _COMPRESSORS[compression]() if compression else None
+        )
+        self._compress_threshold = compress_threshold
+
+        # 按ID缓存解码用的实例, 按需创建
+        self._decoders: Dict[int, Serializer] = {self._serializer.format_id: self._serializer}
+        self._decompressors: Dict[int, Compressor] = {}
+        if self._compressor:
+            self._decompressors[self._compressor.compression_id] = self._compressor
+
+    def encode(self, value: Any) -> bytes:
+        """编码: 头字节 + (可能压缩的)负载"""
+        payload = self._serializer.dumps(value)
+        compression_id = 0
+        if self._compressor and len(payload) >= self._compress_threshold:
+            payload = self._compressor.compress(payload)
+            compression_id = self._compressor.compression_id
+
+        header = (compression_id << 3) | self._serializer.format_id
+        return bytes((header,)) + payload
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """解码, 兼容无格式头的旧数据"""
+        if isinstance(data, str):
+            data = data.encode()
+
+        header = data[0]
+        if header >= 0x20:
+            return self._decode_legacy(data)
+
+        format_id = header & 0x07
+        compression_id = header >> 3
+        payload = data[1:]
+
+        if compression_id:
+            payload = self._get_decompressor(compression_id).decompress(payload)
+        return self._get_decoder(format_id).loads(payload)
+
+    def _get_decoder(self, format_id: int) -> Serializer:
+        """按格式ID获取序列化器"""
+        decoder = self._decoders.get(format_id)
+        if decoder is None:
+            if format_id == PickleSerializer.format_id:
+                raise ValueError("Refusing to unpickle data with a non-pickle serializer")
+            for serializer_class in _SERIALIZERS.values():
+                if serializer_class.format_id == format_id:
+                    decoder = serializer_class()
+                    break
+            else:
+                raise ValueError(f"Unknown serializer format id: {format_id}")
+            self._decoders[format_id] = decoder
+        return decoder
+
+    def _get_decompressor(self, compression_id: int) -> Compressor:
+        """按压缩ID获取压缩器"""
+        decompressor = self._decompressors.get(compression_id)
+        if decompressor is None:
+            for compressor_class in _COMPRESSORS.values():
+                if compressor_class.compression_id == compression_id:
+                    decompressor = compressor_class()
+                    break
+            else:
+                raise ValueError(f"Unknown compression id: {compression_id}")
+            self._decompressors[compression_id] = decompressor
+        return decompressor
+
+    def _decode_legacy(self, data: bytes) -> Any:
+        """旧格式: pickle或json文本"""
+        if data[:1] == b"\x80" and isinstance(self._serializer, PickleSerializer):
+            return pickle.loads(data)
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return data.decode(errors="replace")
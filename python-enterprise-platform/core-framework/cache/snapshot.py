@@ -0,0 +1,107 @@
+"""
+内存缓存快照 - 紧凑二进制格式的落盘与恢复
+
+文件格式(小端):
+    头部: 魔数 b"MCSNAP" + 版本(u16) + 条目数(u64) + 写入时间(f64)
+    分块: 条目数(u32) + 负载长度(u32) + 负载
+    负载: PayloadCodec编码的 [键列表, 过期时间列表, 值列表]
+
+按块编码让反序列化在C实现中批量完成, 避免逐条目的Python开销。
+过期时间保存为绝对时间戳(None表示永不过期), 恢复时剩余TTL自然保留, 已过期条目直接跳过。
+读取时通过mmap映射文件, 逐块解析, 不需要把整个文件读入内存。
+"""
+
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+import mmap
+import os
+import struct
+import time
+
+from .serializers import PayloadCodec
+
+SNAPSHOT_MAGIC = b"MCSNAP"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<6sHQd")
+_CHUNK = struct.Struct("<II")
+
+# (键, 值, 过期时间)
+SnapshotEntry = Tuple[str, Any, Optional[float]]
+
+
+def _encode_chunk(entries: Sequence[SnapshotEntry], codec: PayloadCodec) -> Tuple[int, bytes]:
+    """编码一个分块, 返回(条目数, 负载); 含无法序列化的值时逐个剔除后重试"""
+    try:
+        return len(entries), codec.encode(
+            [[e[0] for e in entries], [e[2] for e in entries], [e[1] for e in entries]]
+        )
+    except Exception:
+        pass
+
+    encodable = []
+    for entry in entries:
+        try:
+            codec.encode(entry[1])
+        except Exception:
+            continue
+        encodable.append(entry)
+    return len(encodable), codec.encode(
+        [[e[0] for e in encodable], [e[2] for e in encodable], [e[1] for e in encodable]]
+    )
+
+
+def write_snapshot(
+    path: str,
+    entries: Sequence[SnapshotEntry],
+    codec: PayloadCodec,
+    chunk_size: int = 10000,
+) -> int:
+    """
+    写入快照, 返回写入的条目数
+
+    先写临时文件再原子替换, 写入中途崩溃不会破坏旧快照。
+    无法序列化的值会被跳过。
+    """
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, time.time()))
+        for start in range(0, len(entries), chunk_size):
+            chunk_count, payload = _encode_chunk(entries[start:start + chunk_size], codec)
+            f.write(_CHUNK.pack(chunk_count, len(payload)))
+            f.write(payload)
+            count += chunk_count
+
+        # 条目数最后回填
+        f.seek(0)
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, count, time.time()))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_snapshot(path: str, codec: PayloadCodec) -> Iterator[List[SnapshotEntry]]:
+    """按块读取快照中未过期的条目, 文件不存在时不返回任何条目"""
+    if not os.path.exists(path) or os.path.getsize(path) < _HEADER.size:
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, _, _ = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot file: {path}")
+
+        now = time.time()
+        offset = _HEADER.size
+        while offset + _CHUNK.size <= len(mm):
+            _, length = _CHUNK.unpack_from(mm, offset)
+            offset += _CHUNK.size
+            keys, expire_ats, values = codec.decode(mm[offset:offset + length])
+            offset += length
+
+            yield [
+                (key, value, expire_at)
+                for key, expire_at, value in zip(keys, expire_ats, values)
+                if expire_at is None or expire_at > now
+            ]
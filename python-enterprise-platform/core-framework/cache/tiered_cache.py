@@ -0,0 +1,332 @@
+"""
+两级缓存实现 - 进程内MemoryCache(L1) + 远程缓存(L2)
+通过Redis Pub/Sub向所有工作进程广播失效消息
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional, List, Union
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import time
+import uuid
+
+from .base import CacheBase, CacheConfig, CacheType, _LOADED_MARKER
+from .memory_cache import MemoryCache
+
+
+class TieredCache(CacheBase):
+    """
+    两级近端缓存
+
+    读: 先查L1, 未命中再查L2并回填L1(L1的TTL不超过l1_ttl, 也不超过该键在L2中的剩余时间)。
+    写/删: 先写L2, 再更新本地L1, 并发布失效消息让其它进程丢弃L1中的旧值。
+    L2为RedisCache且非集群模式时启用Pub/Sub失效; 否则L1数据的陈旧时间由l1_ttl限定。
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        l2: CacheBase,
+        l1: Optional[MemoryCache] = None,
+        l1_max_size: int = 1000,
+        l1_ttl: int = 60,
+        invalidation_channel: str = "cache:invalidate",
+    ):
+        super().__init__(config)
+        self._l2 = l2
+        self._l1 = l1 or MemoryCache(
+            CacheConfig(type=CacheType.MEMORY, default_ttl=l1_ttl),
+            max_size=l1_max_size,
+        )
+        self._l1_ttl = l1_ttl
+        self._channel = invalidation_channel
+        self._instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """连接L1、L2并订阅失效频道"""
+        if self._connected:
+            return
+
+        await self._l1.connect()
+        await self._l2.connect()
+
+        if self._supports_pubsub():
+            self._pubsub = self._l2.client.pubsub()
+            await self._pubsub.subscribe(self._channel)
+            self._listener_task = asyncio.create_task(self._listen())
+
+        self._connected = True
+
+    async def disconnect(self) -> None:
+        """取消订阅并断开L1、L2"""
+        if not self._connected:
+            return
+
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+        if self._pubsub:
+            await self._pubsub.unsubscribe(self._channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+        await self._l1.disconnect()
+        await self._l2.disconnect()
+        self._connected = False
+
+    def _supports_pubsub(self) -> bool:
+        """L2是否支持Pub/Sub失效广播"""
+        from .redis_cache import RedisCache
+
+        return isinstance(self._l2, RedisCache) and not self._l2.config.cluster_mode
+
+    def _l1_expire_time(self, ttl: Optional[int]) -> int:
+        """L1的过期时间不超过l1_ttl"""
+        expire_time = ttl if ttl is not None else self._l2.config.default_ttl
+        if not expire_time:
+            return self._l1_ttl
+        return min(expire_time, self._l1_ttl)
+
+    async def _backfill(self, found: Dict[str, Any]) -> None:
+        """
+        把L2读到的值回填L1, 过期时间不超过l1_ttl和该键在L2中的剩余时间
+
+        get_or_load写入的条目直接取逻辑过期时间, 其余键一次批量查询L2的剩余时间。
+        """
+        now = time.time()
+        remaining: Dict[str, float] = {}
+        unknown = []
+        for key, value in found.items():
+            expire_at = value.get("expire_at") if isinstance(value, dict) and value.get(_LOADED_MARKER) else None
+            if expire_at is None:
+                unknown.append(key)
+            else:
+                remaining[key] = expire_at - now
+
+        if unknown:
+            for key, seconds in (await self._l2.ttl_many(unknown)).items():
+                # -1: L2中永不过期; -2: 读取后已过期或被删除
+                remaining[key] = self._l1_ttl if seconds == -1 else seconds
+
+        ttls = {key: min(self._l1_ttl, seconds) for key, seconds in remaining.items() if seconds > 0}
+        if ttls:
+            await self._l1.set_many({key: found[key] for key in ttls}, ttl=ttls)
+
+    @asynccontextmanager
+    async def _load_guard(self, key: str, timeout: float) -> AsyncIterator[bool]:
+        """沿用L2的加载互斥(如Redis分布式锁)"""
+        async with self._l2._load_guard(key, timeout) as acquired:
+            yield acquired
+
+    async def _load_in_progress(self, key: str) -> bool:
+        """沿用L2的加载锁状态"""
+        return await self._l2._load_in_progress(key)
+
+    async def _publish_invalidation(self, keys: Optional[List[str]] = None) -> None:
+        """发布失效消息, keys为None表示清空"""
+        if not self._pubsub:
+            return
+
+        payload = json.dumps({"origin": self._instance_id, "keys": keys})
+        await self._l2.client.publish(self._channel, payload)
+
+    async def _listen(self) -> None:
+        """处理其它进程发来的失效消息"""
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if not message:
+                    continue
+
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                payload = json.loads(data)
+
+                # 本进程的写操作已在本地生效
+                if payload.get("origin") == self._instance_id:
+                    continue
+
+                keys = payload.get("keys")
+                if keys is None:
+                    await self._l1.flush()
+                else:
+                    for key in keys:
+                        await self._l1.delete(key)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error handling cache invalidation: {e}")
+                await asyncio.sleep(1)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """获取缓存值"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        value = await self._l1.get(key)
+        if value is not None:
+            return value
+
+        value = await self._l2.get(key)
+        if value is not None:
+            await self._backfill({key: value})
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """设置缓存值"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.set(key, value, ttl)
+        await self._l1.set(key, value, ttl=self._l1_expire_time(ttl))
+        await self._publish_invalidation([key])
+        return result
+
+    async def delete(self, key: str) -> bool:
+        """删除缓存"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.delete(key)
+        await self._l1.delete(key)
+        await self._publish_invalidation([key])
+        return result
+
+    async def exists(self, key: str) -> bool:
+        """检查键是否存在"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        if await self._l1.exists(key):
+            return True
+        return await self._l2.exists(key)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """设置过期时间"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.expire(key, ttl)
+        await self._l1.expire(key, self._l1_expire_time(ttl))
+        await self._publish_invalidation([key])
+        return result
+
+    async def ttl(self, key: str) -> int:
+        """获取键的剩余生存时间(以L2为准)"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        return await self._l2.ttl(key)
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        """获取匹配的键列表(以L2为准)"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        return await self._l2.keys(pattern)
+
+    async def flush(self) -> bool:
+        """清空所有缓存"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.flush()
+        await self._l1.flush()
+        await self._publish_invalidation(None)
+        return result
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量获取缓存值, L1未命中的键一次性从L2获取并回填"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l1.get_many(keys)
+        missing = [key for key in keys if key not in result]
+        if missing:
+            loaded = await self._l2.get_many(missing)
+            if loaded:
+                await self._backfill(loaded)
+                result.update(loaded)
+        return result
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Union[int, Dict[str, int], None] = None,
+    ) -> bool:
+        """批量设置缓存值"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.set_many(mapping, ttl)
+        l1_ttls = {
+            key: self._l1_expire_time(ttl.get(key) if isinstance(ttl, dict) else ttl)
+            for key in mapping
+        }
+        await self._l1.set_many(mapping, ttl=l1_ttls)
+        await self._publish_invalidation(list(mapping))
+        return result
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.delete_many(keys)
+        await self._l1.delete_many(keys)
+        await self._publish_invalidation(list(keys))
+        return result
+
+    async def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """批量检查键是否存在"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l1.exists_many(keys)
+        missing = [key for key, found in result.items() if not found]
+        if missing:
+            result.update(await self._l2.exists_many(missing))
+        return result
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """递增"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.incr(key, amount)
+        if amount:
+            # 增量为0(如初始化标签版本)时值不变, 无需失效
+            await self._l1.delete(key)
+            await self._publish_invalidation([key])
+        return result
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        """递减"""
+        if not self._connected:
+            raise RuntimeError("Cache not connected")
+
+        result = await self._l2.decr(key, amount)
+        await self._l1.delete(key)
+        await self._publish_invalidation([key])
+        return result
+
+    @property
+    def l1(self) -> MemoryCache:
+        """本地缓存层"""
+        return self._l1
+
+    @property
+    def l2(self) -> CacheBase:
+        """远程缓存层"""
+        return self._l2
@@ -51,6 +51,12 @@ class DatabaseSettings(BaseSettings):
     postgres_user: str = Field(default="postgres", description="PostgreSQL用户")
     postgres_password: str = Field(default="postgres", description="PostgreSQL密码")
     postgres_db: str = Field(default="enterprise_db", description="PostgreSQL数据库")
+    postgres_replicas: List[str] = Field(default=[], description="PostgreSQL只读副本(host:port)")
+
+    # 读写分离配置
+    replica_strategy: str = Field(default="round_robin", description="副本选择策略(round_robin/least_latency)")
+    replica_max_lag: float = Field(default=5.0, description="允许读取的最大复制延迟(秒), 0表示不检查")
+    replica_check_interval: int = Field(default=10, description="副本健康检查间隔(秒)")
 
     # MySQL配置
     mysql_host: str = Field(default="localhost", description="MySQL主机")
@@ -72,9 +78,20 @@ class DatabaseSettings(BaseSettings):
     pool_timeout: int = Field(default=30, description="连接池超时")
     pool_recycle: int = Field(default=3600, description="连接池回收时间")
 
+    # 语句缓存配置
+    statement_cache_size: int = Field(default=500, description="SQL语句/编译缓存条目数")
+    prepared_statement_cache_size: int = Field(default=500, description="asyncpg预编译语句缓存条目数")
+
     # SQLAlchemy配置
     echo_sql: bool = Field(default=False, description="是否打印SQL")
 
+    # 查询指标配置
+    instrument_queries: bool = Field(default=True, description="是否记录SQL查询指标")
+    slow_query_threshold: float = Field(default=0.5, description="慢查询日志阈值(秒), 0表示关闭")
+
+    # 索引配置
+    auto_create_indexes: bool = Field(default=False, description="启动时创建缺失的索引(默认只校验, 索引由init-db创建)")
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -115,10 +132,24 @@ class RedisSettings(BaseSettings):
     redis_max_connections: int = Field(default=50, description="最大连接数")
     redis_socket_timeout: int = Field(default=5, description="Socket超时")
     redis_socket_connect_timeout: int = Field(default=5, description="连接超时")
+    redis_pool_timeout: float = Field(default=5.0, description="连接池耗尽时等待连接的超时(秒)")
+    redis_health_check_interval: int = Field(default=30, description="连接健康检查间隔(秒)")
+    redis_load_timeout: float = Field(default=5.0, description="缓存加载锁有效期及等待加载结果的最长时间(秒)")
 
     # Redis集群配置
     redis_cluster: bool = Field(default=False, description="是否使用集群")
     redis_cluster_nodes: List[str] = Field(default=[], description="集群节点")
+    redis_read_from_replicas: bool = Field(default=False, description="集群模式下读操作分摊到副本")
+
+    # 缓存值编码
+    redis_serializer: str = Field(default="orjson", description="序列化格式(json/orjson/msgpack/pickle)")
+    redis_compression: Optional[str] = Field(default=None, description="压缩算法(lz4/zstd)")
+    redis_compress_threshold: int = Field(default=1024, description="超过该字节数才压缩")
+
+    # 进程内近端缓存(L1)配置
+    redis_near_cache: bool = Field(default=True, description="是否启用进程内近端缓存")
+    redis_near_cache_size: int = Field(default=1000, description="近端缓存最大条目数")
+    redis_near_cache_ttl: int = Field(default=30, description="近端缓存过期时间(秒)")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,18 @@
+"""
+共享连接管理
+支持: 命名Redis连接池(阻塞获取、健康检查、Prometheus指标)
+"""
+
+from .redis_pool import (
+    RedisPoolConfig,
+    RedisPoolRegistry,
+    InstrumentedConnectionPool,
+    get_redis_pool_registry,
+)
+
+__all__ = [
+    "RedisPoolConfig",
+    "RedisPoolRegistry",
+    "InstrumentedConnectionPool",
+    "get_redis_pool_registry",
+]
@@ -0,0 +1,249 @@
+"""
+共享Redis连接池注册表
+缓存与消息队列按名称复用同一个连接池, 提供阻塞获取、周期健康检查和Prometheus指标
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+import asyncio
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError
+
+
+@dataclass
+class RedisPoolConfig:
+    """Redis连接池配置"""
+    host: str = "localhost"
+    port: int = 6379
+    password: Optional[str] = None
+    db: int = 0
+    decode_responses: bool = False
+
+    # 连接数上限, 达到上限后获取连接最多等待pool_timeout秒
+    max_connections: int = 50
+    pool_timeout: float = 5.0
+
+    socket_timeout: float = 5
+    socket_connect_timeout: float = 5
+
+    # 空闲超过该秒数的连接在使用前先PING; 注册表也按该间隔后台检查, 0表示关闭
+    health_check_interval: int = 30
+
+    # 透传给连接池的其它参数(如ssl、connection_class)
+    connection_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def default_name(self) -> str:
+        """默认池名: 同一实例、同一库、同一解码方式的使用方共享连接池"""
+        suffix = "" if self.decode_responses else "/raw"
+        return f"{self.host}:{self.port}/{self.db}{suffix}"
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """记录等待时间和超时次数的阻塞连接池"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.wait_timeouts = 0
+
+    async def get_connection(self, *args, **kwargs):
+        """获取连接, 连接耗尽时阻塞等待, 超时抛出ConnectionError"""
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            self.wait_timeouts += 1
+            raise
+        finally:
+            self.wait_count += 1
+            self.wait_seconds += time.perf_counter() - start
+
+    @property
+    def in_use(self) -> int:
+        """使用中的连接数"""
+        return len(self._in_use_connections)
+
+    @property
+    def idle(self) -> int:
+        """空闲连接数"""
+        return len(self._available_connections)
+
+
+class _PoolEntry:
+    """注册表中的连接池及其引用计数和健康状态"""
+
+    def __init__(self, config: RedisPoolConfig, pool: InstrumentedConnectionPool):
+        self.config = config
+        self.pool = pool
+        self.refs = 0
+        self.healthy = True
+        self.check_latency = 0.0
+        self.check_failures = 0
+        self.health_task: Optional[asyncio.Task] = None
+
+
+class RedisPoolRegistry:
+    """
+    命名Redis连接池注册表
+
+    acquire按名称返回连接池, 首次获取时创建(以首个使用方的配置为准), 之后引用计数加一;
+    release在引用归零时停止健康检查并关闭连接池。同时作为Prometheus Collector导出连接池指标。
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(
+        self,
+        config: RedisPoolConfig,
+        name: Optional[str] = None,
+    ) -> InstrumentedConnectionPool:
+        """获取(必要时创建)命名连接池"""
+        name = name or config.default_name
+        async with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = _PoolEntry(config, self._create_pool(config))
+                if config.health_check_interval > 0:
+                    entry.health_task = asyncio.create_task(self._health_loop(name, entry))
+                self._entries[name] = entry
+            elif (entry.config.host, entry.config.port, entry.config.db) != (
+                config.host, config.port, config.db
+            ):
+                raise ValueError(f"Redis pool {name!r} already points to another server")
+
+            entry.refs += 1
+            return entry.pool
+
+    async def release(self, name: str) -> None:
+        """释放对连接池的引用, 最后一个使用方释放时关闭连接池"""
+        async with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+
+            del self._entries[name]
+            if entry.health_task:
+                entry.health_task.cancel()
+                try:
+                    await entry.health_task
+                except asyncio.CancelledError:
+                    pass
+            await entry.pool.disconnect()
+
+    @staticmethod
+    def _create_pool(config: RedisPoolConfig) -> InstrumentedConnectionPool:
+        """创建阻塞连接池"""
+        return InstrumentedConnectionPool(
+            host=config.host,
+            port=config.port,
+            password=config.password,
+            db=config.db,
+            decode_responses=config.decode_responses,
+            max_connections=config.max_connections,
+            timeout=config.pool_timeout,
+            socket_timeout=config.socket_timeout,
+            socket_connect_timeout=config.socket_connect_timeout,
+            health_check_interval=config.health_check_interval,
+            **config.connection_kwargs,
+        )
+
+    async def _health_loop(self, name: str, entry: _PoolEntry) -> None:
+        """周期性PING, 记录连接池健康状态和延迟"""
+        client = Redis(connection_pool=entry.pool)
+        while True:
+            await asyncio.sleep(entry.config.health_check_interval)
+            start = time.perf_counter()
+            try:
+                await client.ping()
+                entry.healthy = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                entry.healthy = False
+                entry.check_failures += 1
+                print(f"Redis pool {name} health check failed: {e}")
+            entry.check_latency = time.perf_counter() - start
+
+    def stats(self, name: str) -> Dict[str, float]:
+        """获取连接池统计信息"""
+        entry = self._entries[name]
+        pool = entry.pool
+        return {
+            "in_use": pool.in_use,
+            "idle": pool.idle,
+            "max_connections": pool.max_connections,
+            "wait_count": pool.wait_count,
+            "wait_seconds": pool.wait_seconds,
+            "wait_timeouts": pool.wait_timeouts,
+            "healthy": entry.healthy,
+            "health_check_latency": entry.check_latency,
+            "health_check_failures": entry.check_failures,
+            "refs": entry.refs,
+        }
+
+    def collect(self) -> Iterator[Metric]:
+        """生成Prometheus指标族(Collector接口)"""
+        connections = GaugeMetricFamily(
+            "redis_pool_connections", "Redis pool connections", labels=["pool", "state"]
+        )
+        max_connections = GaugeMetricFamily(
+            "redis_pool_max_connections", "Redis pool connection limit", labels=["pool"]
+        )
+        waits = CounterMetricFamily(
+            "redis_pool_waits", "Connection checkouts from the Redis pool", labels=["pool"]
+        )
+        wait_seconds = CounterMetricFamily(
+            "redis_pool_wait_seconds", "Time spent waiting for a Redis connection", labels=["pool"]
+        )
+        timeouts = CounterMetricFamily(
+            "redis_pool_wait_timeouts", "Checkouts that timed out on an exhausted pool", labels=["pool"]
+        )
+        healthy = GaugeMetricFamily(
+            "redis_pool_healthy", "Result of the last Redis pool health check", labels=["pool"]
+        )
+        latency = GaugeMetricFamily(
+            "redis_pool_health_check_latency_seconds", "Latency of the last health check PING", labels=["pool"]
+        )
+
+        for name in list(self._entries):
+            stats = self.stats(name)
+            connections.add_metric([name, "in_use"], stats["in_use"])
+            connections.add_metric([name, "idle"], stats["idle"])
+            max_connections.add_metric([name], stats["max_connections"])
+            waits.add_metric([name], stats["wait_count"])
+            wait_seconds.add_metric([name], stats["wait_seconds"])
+            timeouts.add_metric([name], stats["wait_timeouts"])
+            healthy.add_metric([name], 1 if stats["healthy"] else 0)
+            latency.add_metric([name], stats["health_check_latency"])
+
+        yield from (connections, max_connections, waits, wait_seconds, timeouts, healthy, latency)
+
+    def render(self) -> bytes:
+        """导出为Prometheus文本格式"""
+        registry = CollectorRegistry()
+        registry.register(self)
+        return generate_latest(registry)
+
+
+_default_registry: Optional[RedisPoolRegistry] = None
+
+
+def get_redis_pool_registry() -> RedisPoolRegistry:
+    """获取注册到默认Prometheus注册表的全局连接池注册表"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = RedisPoolRegistry()
+        REGISTRY.register(_default_registry)
+    return _default_registry
@@ -3,13 +3,28 @@
 支持: PostgreSQL, MySQL, MongoDB, SQLite
 """
 
-from .base import DatabaseBase, DatabaseConfig
-from .sql_database import SQLDatabase
-from .mongodb_database import MongoDBDatabase
+from .base import DatabaseBase, DatabaseConfig, DatabaseType
+from .sql_database import SQLDatabase, SQLSession
+from .mongodb_database import MongoDBDatabase, MongoBatchWriter
+from .metrics import QueryMetrics, QueryTracker, get_query_metrics, normalize_statement
+from .pagination import encode_cursor, decode_cursor
+from .indexes import IndexRegistry, IndexReport, IndexSpec
 
 __all__ = [
     "DatabaseBase",
     "DatabaseConfig",
+    "DatabaseType",
     "SQLDatabase",
+    "SQLSession",
     "MongoDBDatabase",
+    "MongoBatchWriter",
+    "QueryMetrics",
+    "QueryTracker",
+    "get_query_metrics",
+    "normalize_statement",
+    "encode_cursor",
+    "decode_cursor",
+    "IndexRegistry",
+    "IndexReport",
+    "IndexSpec",
 ]
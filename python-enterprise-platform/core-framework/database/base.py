@@ -3,7 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, Dict, List, Optional, Type
 from enum import Enum
 
@@ -31,6 +31,25 @@ class DatabaseConfig:
     pool_recycle: int = 3600
     echo: bool = False
 
+    # SQL字符串到TextClause的LRU缓存条目数, 0表示关闭
+    statement_cache_size: int = 500
+    # asyncpg预编译语句缓存条目数(仅PostgreSQL), 命中时服务端跳过解析与规划
+    prepared_statement_cache_size: int = 500
+
+    # 查询指标(按语句的延迟直方图、慢查询日志、N+1检测)
+    instrument_queries: bool = True
+    # 慢查询阈值(秒), 超过时记录日志, 0表示不记录
+    slow_query_threshold: float = 0.5
+
+    # 只读副本: [{"host": ..., "port": ...}], 未指定的字段(账号、库名、连接池参数)与主库相同
+    replicas: Optional[List[dict]] = None
+    # 副本选择策略: round_robin(轮询) / least_latency(最低延迟)
+    replica_strategy: str = "round_robin"
+    # 复制延迟超过该秒数的副本暂不参与读, 0表示不检查复制延迟
+    replica_max_lag: float = 5.0
+    # 副本健康与复制延迟的检查间隔(秒), 0表示关闭
+    replica_check_interval: int = 10
+
     # MongoDB特定配置
     replica_set: Optional[str] = None
     auth_source: str = "admin"
@@ -41,6 +60,18 @@ class DatabaseConfig:
     def __post_init__(self) -> None:
         if self.options is None:
             self.options = {}
+        if self.replicas is None:
+            self.replicas = []
+
+    def for_replica(self, replica: dict) -> "DatabaseConfig":
+        """生成副本的连接配置"""
+        return replace(
+            self,
+            host=replica.get("host", self.host),
+            port=replica.get("port", self.port),
+            database=replica.get("database", self.database),
+            replicas=[],
+        )
 
     def get_connection_string(self) -> str:
         """获取数据库连接字符串"""
@@ -0,0 +1,236 @@
+"""
+声明式索引注册表
+在代码中声明表/集合需要的索引, 启动时校验并创建缺失的索引, 报告失效、未声明和未使用的索引,
+避免表结构变更后索引悄悄缺失导致查询性能退化。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from .base import DatabaseType
+from .sql_database import SQLDatabase
+from .mongodb_database import MongoDBDatabase
+
+# 索引键: 列名/字段名(升序) 或 (名称, 1升序/-1降序)
+IndexKey = Union[str, Tuple[str, int]]
+
+
+@dataclass
+class IndexSpec:
+    """索引定义"""
+    table: str
+    keys: Tuple[Tuple[str, int], ...]
+    name: str
+    unique: bool = False
+    # 部分索引条件(SQL, MySQL不支持)
+    where: Optional[str] = None
+    # MongoDB createIndexes的额外选项(如partialFilterExpression、expireAfterSeconds)
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        """报告中的索引标识: 表名.索引名"""
+        return f"{self.table}.{self.name}"
+
+    def create_statement(self, db_type: DatabaseType, concurrently: bool = False) -> str:
+        """生成CREATE INDEX语句, concurrently仅对PostgreSQL生效"""
+        columns = ", ".join(f"{column} DESC" if direction < 0 else column for column, direction in self.keys)
+        parts = ["CREATE UNIQUE INDEX" if self.unique else "CREATE INDEX"]
+        if concurrently and db_type == DatabaseType.POSTGRESQL:
+            parts.append("CONCURRENTLY")
+        if db_type != DatabaseType.MYSQL:
+            parts.append("IF NOT EXISTS")
+        parts.append(f"{self.name} ON {self.table} ({columns})")
+        if self.where and db_type != DatabaseType.MYSQL:
+            parts.append(f"WHERE {self.where}")
+        return " ".join(parts)
+
+
+@dataclass
+class IndexReport:
+    """索引校验结果, 各项为"表名.索引名\""""
+    # 已存在且有效
+    present: List[str] = field(default_factory=list)
+    # 已声明但不存在
+    missing: List[str] = field(default_factory=list)
+    # 本次创建(或重建)的
+    created: List[str] = field(default_factory=list)
+    # 存在但无效(PostgreSQL并发建索引失败残留)
+    invalid: List[str] = field(default_factory=list)
+    # 库中存在但未声明的普通索引
+    unregistered: List[str] = field(default_factory=list)
+    # 扫描次数为0的普通索引(仅PostgreSQL和MongoDB有统计, 统计自重置/重启以来)
+    unused: List[str] = field(default_factory=list)
+    # 创建失败的索引及错误
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """声明的索引是否全部存在且有效"""
+        return not (self.missing or self.invalid or self.errors)
+
+
+def _model_key(expression: Any) -> Tuple[str, int]:
+    """SQLAlchemy索引表达式转为(列名, 方向)"""
+    if isinstance(expression, UnaryExpression) and expression.modifier in (operators.desc_op, operators.asc_op):
+        return expression.element.name, -1 if expression.modifier is operators.desc_op else 1
+    name = getattr(expression, "name", None)
+    if not isinstance(name, str):
+        raise ValueError(f"Unsupported index expression: {expression}")
+    return name, 1
+
+
+class IndexRegistry:
+    """
+    索引注册表
+
+    SQL表通过add_model读取模型上声明的Index, MongoDB集合或没有模型的表通过add声明。
+    ensure在启动时调用: 校验索引, 创建缺失的索引(PostgreSQL使用CREATE INDEX CONCURRENTLY, 不阻塞写入),
+    重建失效的索引, 返回IndexReport。
+
+    示例:
+        indexes = IndexRegistry()
+        indexes.add_model(User)
+        indexes.add("events", [("user_id", 1), ("created_at", -1)])
+        report = await indexes.ensure(db)
+    """
+
+    def __init__(self):
+        self._specs: Dict[Tuple[str, str], IndexSpec] = {}
+
+    def add(
+        self,
+        table: str,
+        keys: Sequence[IndexKey],
+        name: Optional[str] = None,
+        unique: bool = False,
+        where: Optional[str] = None,
+        **options: Any,
+    ) -> IndexSpec:
+        """声明索引, 未指定名称时为idx_<表名>_<列名...>"""
+        normalized = tuple((key, 1) if isinstance(key, str) else (key[0], int(key[1])) for key in keys)
+        if not normalized:
+            raise ValueError("Index requires at least one key")
+
+        spec = IndexSpec(
+            table=table,
+            keys=normalized,
+            name=name or f"idx_{table}_{'_'.join(column for column, _ in normalized)}",
+            unique=unique,
+            where=where,
+            options=options,
+        )
+        existing = self._specs.get((table, spec.name))
+        if existing is not None and existing != spec:
+            raise ValueError(f"Index {spec.label} already registered with a different definition")
+        self._specs[(table, spec.name)] = spec
+        return spec
+
+    def add_model(self, model: Any) -> List[IndexSpec]:
+        """声明模型表上的全部Index(包括mapped_column(index=True)生成的)"""
+        table = model.__table__
+        specs = []
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            where = index.dialect_kwargs.get("postgresql_where") or index.dialect_kwargs.get("sqlite_where")
+            if where is not None and not isinstance(where, str):
+                where = str(where.compile(compile_kwargs={"literal_binds": True}))
+            specs.append(self.add(
+                table.name,
+                [_model_key(expression) for expression in index.expressions],
+                name=index.name,
+                unique=bool(index.unique),
+                where=where,
+            ))
+        return specs
+
+    @property
+    def specs(self) -> List[IndexSpec]:
+        """全部声明的索引"""
+        return list(self._specs.values())
+
+    @property
+    def tables(self) -> Set[str]:
+        """声明了索引的表/集合"""
+        return {table for table, _ in self._specs}
+
+    async def _existing(self, db: Union[SQLDatabase, MongoDBDatabase]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """已声明表/集合上现有的索引"""
+        if isinstance(db, MongoDBDatabase):
+            rows = [row for table in sorted(self.tables) for row in await db.list_indexes(table)]
+        else:
+            tables = self.tables
+            rows = [row for row in await db.list_indexes() if row["table"] in tables]
+        return {(row["table"], row["name"]): row for row in rows}
+
+    async def verify(self, db: Union[SQLDatabase, MongoDBDatabase]) -> IndexReport:
+        """对比声明与库中实际的索引"""
+        existing = await self._existing(db)
+        report = IndexReport()
+
+        for key, spec in self._specs.items():
+            info = existing.get(key)
+            if info is None:
+                report.missing.append(spec.label)
+            elif not info["valid"]:
+                report.invalid.append(spec.label)
+            else:
+                report.present.append(spec.label)
+
+        for key, info in sorted(existing.items()):
+            # 主键和唯一约束的索引承担约束, 不算未声明或未使用
+            if info["primary"] or info["unique"]:
+                continue
+            label = f"{info['table']}.{info['name']}"
+            if key not in self._specs:
+                report.unregistered.append(label)
+            if info["valid"] and info["scans"] == 0:
+                report.unused.append(label)
+        return report
+
+    async def ensure(
+        self,
+        db: Union[SQLDatabase, MongoDBDatabase],
+        create: bool = True,
+        concurrently: bool = True,
+    ) -> IndexReport:
+        """
+        校验并创建缺失的索引、重建失效的索引
+
+        create为False时只校验。单个索引创建失败记入report.errors, 不影响其它索引。
+        """
+        report = await self.verify(db)
+        if not create:
+            return report
+
+        specs = {spec.label: spec for spec in self._specs.values()}
+        for label in report.invalid + report.missing:
+            spec = specs[label]
+            try:
+                if isinstance(db, MongoDBDatabase):
+                    await db.create_index(spec.table, list(spec.keys), name=spec.name, unique=spec.unique, **spec.options)
+                else:
+                    await self._create_sql(db, spec, rebuild=label in report.invalid, concurrently=concurrently)
+            except Exception as e:
+                report.errors[label] = str(e)
+                continue
+            report.created.append(label)
+
+        report.missing = [label for label in report.missing if label not in report.created]
+        report.invalid = [label for label in report.invalid if label not in report.created]
+        report.unused = [label for label in report.unused if label not in report.created]
+        return report
+
+    async def _create_sql(self, db: SQLDatabase, spec: IndexSpec, rebuild: bool, concurrently: bool) -> None:
+        """创建SQL索引; PostgreSQL并发创建需在事务之外执行"""
+        online = concurrently and db.config.type == DatabaseType.POSTGRESQL
+        if rebuild:
+            await db.execute_autocommit(f"DROP INDEX {'CONCURRENTLY ' if online else ''}IF EXISTS {spec.name}")
+
+        statement = spec.create_statement(db.config.type, concurrently)
+        if online:
+            await db.execute_autocommit(statement)
+        else:
+            await db.execute(statement)
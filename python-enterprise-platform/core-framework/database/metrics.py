@@ -0,0 +1,284 @@
+"""
+SQL查询指标 - 按归一化语句统计延迟、慢查询日志、单请求查询数与N+1检测
+基于SQLAlchemy游标事件采集, 以Prometheus文本格式导出
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+import re
+import time
+
+import structlog
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily, Metric
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# 查询延迟直方图分桶(秒)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# 单请求查询数直方图分桶
+REQUEST_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# 字面量: 字符串和不属于占位符($1, :1)或标识符的数字
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$:])\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%s|:\w+)(?:\s*,\s*(?:\?|\$\d+|%s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# 语句标签的最大长度
+MAX_STATEMENT_LENGTH = 300
+
+_START_TIMES_KEY = "query_start_times"
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """归一化SQL: 压缩空白, 字面量替换为?, IN列表合并为(...)"""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return normalized[:MAX_STATEMENT_LENGTH]
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """参数脱敏: 只保留参数名和类型, 批量参数只保留行数"""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} rows>"
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return "<redacted>"
+
+
+class _Histogram:
+    """单个标签组合的直方图, 只在采集时计算累计值"""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class QueryTracker:
+    """单个请求内的查询统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Dict[str, int] = {}
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """执行次数达到阈值的语句"""
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+
+_current_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+
+
+def _histogram_buckets(bounds: Tuple[float, ...], histogram: _Histogram):
+    """把分桶计数转换为累计计数"""
+    cumulative = 0
+    buckets = []
+    for bound, count in zip([repr(bound) for bound in bounds] + ["+Inf"], histogram.counts):
+        cumulative += count
+        buckets.append((bound, cumulative))
+    return buckets
+
+
+class QueryMetrics:
+    """
+    SQL查询指标收集器
+
+    instrument为引擎注册游标事件, 按(数据库, 归一化语句)记录延迟直方图和错误数,
+    超过慢查询阈值的语句通过structlog记录(参数已脱敏)。
+    在track_request上下文中执行的查询计入该请求, 同一语句执行次数达到n_plus_one_threshold时视为疑似N+1。
+    不同语句超过max_statements个后归入"other", 以限制标签基数。
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        max_statements: int = 200,
+        n_plus_one_threshold: int = 5,
+        logger: Any = None,
+    ):
+        self._buckets = tuple(sorted(buckets))
+        self._max_statements = max_statements
+        self._n_plus_one_threshold = n_plus_one_threshold
+        self._logger = logger or structlog.get_logger("database.queries")
+        self._statements: Set[str] = set()
+        self._latency: Dict[Tuple[str, str], _Histogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._slow: Dict[Tuple[str, str], int] = {}
+        self._n_plus_one: Dict[str, int] = {}
+        self._per_request = _Histogram(len(REQUEST_BUCKETS) + 1)
+
+    def instrument(self, engine: AsyncEngine, name: str, slow_query_threshold: float = 0.5) -> None:
+        """
+        为引擎注册查询事件
+
+        - name: 指标中的数据库标签
+        - slow_query_threshold: 慢查询阈值(秒), 0表示不记录慢查询日志
+        """
+        sync_engine = engine.sync_engine
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            seconds = time.perf_counter() - conn.info[_START_TIMES_KEY].pop()
+            self.observe(name, statement, seconds, parameters, slow_query_threshold)
+
+        def handle_error(context):
+            conn = context.connection
+            if conn is None or not conn.info.get(_START_TIMES_KEY):
+                return
+            conn.info[_START_TIMES_KEY].pop()
+            self.record_error(name, context.statement or "")
+
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(sync_engine, "handle_error", handle_error)
+
+    def statement_label(self, statement: str) -> str:
+        """语句的指标标签"""
+        normalized = normalize_statement(statement)
+        if normalized not in self._statements:
+            if len(self._statements) >= self._max_statements:
+                return "other"
+            self._statements.add(normalized)
+        return normalized
+
+    def observe(
+        self,
+        database: str,
+        statement: str,
+        seconds: float,
+        parameters: Any = None,
+        slow_query_threshold: float = 0,
+    ) -> None:
+        """记录一次查询"""
+        label = self.statement_label(statement)
+        series = (database, label)
+        histogram = self._latency.get(series)
+        if histogram is None:
+            histogram = self._latency[series] = _Histogram(len(self._buckets) + 1)
+        histogram.counts[bisect_left(self._buckets, seconds)] += 1
+        histogram.total += seconds
+
+        tracker = _current_tracker.get()
+        if tracker is not None:
+            tracker.count += 1
+            tracker.duration += seconds
+            tracker.statements[label] = tracker.statements.get(label, 0) + 1
+
+        if slow_query_threshold and seconds >= slow_query_threshold:
+            self._slow[series] = self._slow.get(series, 0) + 1
+            self._logger.warning(
+                "Slow query",
+                database=database,
+                statement=normalize_statement(statement),
+                duration_ms=round(seconds * 1000, 2),
+                parameters=redact_parameters(parameters),
+                request=tracker.name if tracker else None,
+            )
+
+    def record_error(self, database: str, statement: str) -> None:
+        """记录一次查询异常"""
+        series = (database, self.statement_label(statement))
+        self._errors[series] = self._errors.get(series, 0) + 1
+
+    @contextmanager
+    def track_request(self, name: str = "request") -> Iterator[QueryTracker]:
+        """
+        统计上下文内的查询(通常为一个请求), 退出时记录查询数并检测N+1
+
+        示例:
+            with get_query_metrics().track_request(f"{request.method} {request.url.path}"):
+                response = await call_next(request)
+        """
+        tracker = QueryTracker(name)
+        token = _current_tracker.set(tracker)
+        try:
+            yield tracker
+        finally:
+            _current_tracker.reset(token)
+            self._finish_request(tracker)
+
+    def _finish_request(self, tracker: QueryTracker) -> None:
+        """记录请求的查询数, 报告疑似N+1的语句"""
+        if not tracker.count:
+            return
+
+        self._per_request.counts[bisect_left(REQUEST_BUCKETS, tracker.count)] += 1
+        self._per_request.total += tracker.count
+
+        for statement, count in tracker.repeated(self._n_plus_one_threshold).items():
+            self._n_plus_one[statement] = self._n_plus_one.get(statement, 0) + 1
+            self._logger.warning(
+                "Possible N+1 query",
+                request=tracker.name,
+                statement=statement,
+                executions=count,
+                request_queries=tracker.count,
+            )
+
+    def collect(self) -> Iterator[Metric]:
+        """生成Prometheus指标族(Collector接口)"""
+        latency = HistogramMetricFamily(
+            "sql_query_duration_seconds", "SQL query latency", labels=["database", "statement"]
+        )
+        for labels, histogram in list(self._latency.items()):
+            latency.add_metric(list(labels), _histogram_buckets(self._buckets, histogram), histogram.total)
+
+        errors = CounterMetricFamily(
+            "sql_query_errors", "SQL query errors", labels=["database", "statement"]
+        )
+        for labels, count in list(self._errors.items()):
+            errors.add_metric(list(labels), count)
+
+        slow = CounterMetricFamily(
+            "sql_slow_queries", "SQL queries above the slow query threshold", labels=["database", "statement"]
+        )
+        for labels, count in list(self._slow.items()):
+            slow.add_metric(list(labels), count)
+
+        per_request = HistogramMetricFamily(
+            "sql_queries_per_request", "SQL queries executed per tracked request"
+        )
+        per_request.add_metric([], _histogram_buckets(REQUEST_BUCKETS, self._per_request), self._per_request.total)
+
+        n_plus_one = CounterMetricFamily(
+            "sql_n_plus_one", "Requests repeating one statement at least the N+1 threshold", labels=["statement"]
+        )
+        for statement, count in list(self._n_plus_one.items()):
+            n_plus_one.add_metric([statement], count)
+
+        yield from (latency, errors, slow, per_request, n_plus_one)
+
+    def render(self) -> bytes:
+        """导出为Prometheus文本格式"""
+        registry = CollectorRegistry()
+        registry.register(self)
+        return generate_latest(registry)
+
+
+_default_metrics: Optional[QueryMetrics] = None
+
+
+def get_query_metrics() -> QueryMetrics:
+    """获取注册到默认Prometheus注册表的全局查询指标"""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = QueryMetrics()
+        REGISTRY.register(_default_metrics)
+    return _default_metrics
@@ -3,12 +3,173 @@ MongoDB数据库实现
 使用Motor异步驱动
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Union
 from contextlib import asynccontextmanager
+from datetime import datetime
+import asyncio
+import time
+import uuid
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from bson import Binary, Decimal128, ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from .base import DatabaseBase, DatabaseConfig
+from .utils import batched
+
+WriteOperation = Union[InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany]
+
+# bulk_write结果中的计数字段
+_BULK_COUNTS = {
+    "inserted": "nInserted",
+    "matched": "nMatched",
+    "modified": "nModified",
+    "deleted": "nRemoved",
+    "upserted": "nUpserted",
+}
+
+
+# 可重试的写错误码(主节点切换、关闭中、网络超时、写冲突等), 其余写错误视为永久失败
+_RETRYABLE_WRITE_CODES = frozenset({6, 7, 89, 91, 112, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436})
+
+# Python类型对应的$type别名, 用于_id区间切分
+_BSON_TYPE_ALIASES = (
+    (bool, "bool"),
+    (ObjectId, "objectId"),
+    (str, "string"),
+    ((int, float, Decimal128), "number"),
+    (datetime, "date"),
+    ((bytes, Binary, uuid.UUID), "binData"),
+)
+
+
+def _bson_type(value: Any) -> Optional[str]:
+    """值的BSON $type别名, 未知类型返回None"""
+    for types, alias in _BSON_TYPE_ALIASES:
+        if isinstance(value, types):
+            return alias
+    return None
+
+
+def _empty_bulk_summary() -> Dict[str, Any]:
+    """空的批量写入汇总"""
+    summary: Dict[str, Any] = {name: 0 for name in _BULK_COUNTS}
+    summary["write_errors"] = []
+    return summary
+
+
+async def _stream_cursor(cursor: Any, batch_size: int, stringify_id: bool) -> AsyncIterator[Dict[str, Any]]:
+    """按批从游标拉取并逐条产出文档, 结束或提前退出时关闭游标"""
+    try:
+        while True:
+            batch = await cursor.to_list(length=batch_size)
+            if not batch:
+                break
+            if stringify_id:
+                for document in batch:
+                    if '_id' in document:
+                        document['_id'] = str(document['_id'])
+                    yield document
+            else:
+                for document in batch:
+                    yield document
+    finally:
+        await cursor.close()
+
+
+def _walk_plan(node: Any, stages: List[str], indexes: List[str], stats: List[Dict[str, Any]]) -> None:
+    """递归收集执行计划中的阶段名、索引名和执行统计"""
+    if isinstance(node, list):
+        for item in node:
+            _walk_plan(item, stages, indexes, stats)
+        return
+    if not isinstance(node, dict):
+        return
+
+    if isinstance(node.get("stage"), str):
+        stages.append(node["stage"])
+    if isinstance(node.get("indexName"), str) and node["indexName"] not in indexes:
+        indexes.append(node["indexName"])
+    if "executionStats" in node and isinstance(node["executionStats"], dict):
+        stats.append(node["executionStats"])
+
+    for key, value in node.items():
+        # 只统计最终选中的计划
+        if key != "rejectedPlans":
+            _walk_plan(value, stages, indexes, stats)
+
+
+def summarize_explain(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    提炼explain输出: 执行阶段、使用的索引、是否全集合扫描(COLLSCAN)及执行统计
+
+    兼容find与aggregate的explain结构(包括$cursor阶段嵌套和SBE执行引擎的queryPlan)。
+    """
+    stages: List[str] = []
+    indexes: List[str] = []
+    stats: List[Dict[str, Any]] = []
+    _walk_plan(plan, stages, indexes, stats)
+
+    summary = {
+        "stages": stages,
+        "indexes": indexes,
+        "collscan": "COLLSCAN" in stages,
+        "raw": plan,
+    }
+    if stats:
+        summary.update(
+            docs_examined=sum(stat.get("totalDocsExamined", 0) for stat in stats),
+            keys_examined=sum(stat.get("totalKeysExamined", 0) for stat in stats),
+            returned=sum(stat.get("nReturned", 0) for stat in stats),
+            execution_ms=max(stat.get("executionTimeMillis", 0) for stat in stats),
+        )
+    return summary
+
+
+def split_id_ranges(
+    sample_ids: List[Any],
+    partitions: int,
+    filter_query: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    按抽样的_id把查询切分为首尾相接的_id区间
+
+    区间为[下界, 上界), 第一个区间无下界、最后一个无上界。
+    MongoDB的$lt/$gte只匹配同一BSON类型的值, 因此另加一个_id为其它类型的兜底区间,
+    合起来恰好覆盖原查询。抽样为空、类型不一或无法识别时不切分。
+    """
+    types = {_bson_type(value) for value in sample_ids}
+    id_type = types.pop() if len(types) == 1 else None
+    ordered = sorted(set(sample_ids)) if id_type else []
+
+    boundaries = []
+    for i in range(1, partitions):
+        if not ordered:
+            break
+        boundary = ordered[len(ordered) * i // partitions]
+        if not boundaries or boundary > boundaries[-1]:
+            boundaries.append(boundary)
+
+    if not boundaries:
+        return [dict(filter_query or {})]
+
+    conditions = []
+    bounds = [None, *boundaries, None]
+    for lower, upper in zip(bounds, bounds[1:]):
+        condition = {}
+        if lower is not None:
+            condition["$gte"] = lower
+        if upper is not None:
+            condition["$lt"] = upper
+        conditions.append(condition)
+    conditions.append({"$not": {"$type": id_type}})
+
+    if not filter_query:
+        return [{"_id": condition} for condition in conditions]
+    return [{"$and": [filter_query, {"_id": condition}]} for condition in conditions]
 
 
 class MongoDBDatabase(DatabaseBase):
@@ -52,7 +213,7 @@ class MongoDBDatabase(DatabaseBase):
 
     async def execute(self, query: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """执行MongoDB命令"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         # MongoDB不使用SQL，这里提供命令执行接口
@@ -65,7 +226,7 @@ class MongoDBDatabase(DatabaseBase):
         projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """查询单条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -86,8 +247,8 @@ class MongoDBDatabase(DatabaseBase):
         limit: int = 0,
         sort: Optional[List[tuple]] = None
     ) -> List[Dict[str, Any]]:
-        """查询多条文档"""
-        if not self._connected or not self._database:
+        """查询多条文档(结果全部载入内存, 大结果集请使用iterate)"""
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -109,22 +270,118 @@ class MongoDBDatabase(DatabaseBase):
 
         return results
 
+    async def iterate(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        sort: Optional[List[tuple]] = None,
+        raw: bool = False,
+        stringify_id: bool = True,
+    ) -> AsyncIterator[Union[Dict[str, Any], RawBSONDocument]]:
+        """
+        流式遍历查询结果
+
+        每次从服务端取batch_size条, 内存占用与结果集大小无关; _id在产出时逐条转换为字符串,
+        stringify_id=False时保持原始类型。raw=True时直接产出RawBSONDocument, 跳过BSON解码,
+        适合原样转发或写入其它集合的管道(字段在访问时才解码, _id不做转换)。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        coll = self._database[collection]
+        if raw:
+            coll = coll.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+
+        cursor = coll.find(filter_query or {}, projection, batch_size=batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        async for document in _stream_cursor(cursor, batch_size, stringify_id and not raw):
+            yield document
+
+    async def aggregate(
+        self,
+        collection: str,
+        pipeline: List[Dict[str, Any]],
+        allow_disk_use: bool = False,
+        hint: Optional[Union[str, List[tuple]]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        执行聚合管道, 流式产出结果
+
+        分组、统计在服务端完成, 结果按batch_size分批拉取。
+        allow_disk_use允许$group/$sort超出内存限制时使用临时文件; hint指定索引(名称或键列表)。
+        结果中的_id通常是分组键, 保持原样。
+
+        示例:
+            async for row in db.aggregate("orders", [
+                {"$match": {"status": "paid"}},
+                {"$group": {"_id": "$user_id", "total": {"$sum": "$amount"}}},
+            ], allow_disk_use=True):
+                ...
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        options: Dict[str, Any] = {"allowDiskUse": allow_disk_use, "batchSize": batch_size}
+        if hint is not None:
+            options["hint"] = hint
+
+        cursor = self._database[collection].aggregate(pipeline, **options)
+        async for document in _stream_cursor(cursor, batch_size, stringify_id=False):
+            yield document
+
+    async def explain(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        pipeline: Optional[List[Dict[str, Any]]] = None,
+        hint: Optional[Union[str, Dict[str, Any]]] = None,
+        verbosity: str = "executionStats",
+    ) -> Dict[str, Any]:
+        """
+        查看查询(filter_query)或聚合(pipeline)的执行计划
+
+        返回summarize_explain的结果: stages、indexes、collscan, 以及(verbosity为
+        executionStats及以上时)docs_examined、keys_examined、returned、execution_ms, 原始输出在raw中。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        if pipeline is not None:
+            command: Dict[str, Any] = {"aggregate": collection, "pipeline": pipeline, "cursor": {}}
+        else:
+            command = {"find": collection, "filter": filter_query or {}}
+        if hint is not None:
+            command["hint"] = hint
+
+        plan = await self._database.command({"explain": command, "verbosity": verbosity})
+        return summarize_explain(plan)
+
     async def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
         """插入单条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
         result = await coll.insert_one(document)
         return str(result.inserted_id)
 
-    async def insert_many(self, collection: str, documents: List[Dict[str, Any]]) -> List[str]:
-        """插入多条文档"""
-        if not self._connected or not self._database:
+    async def insert_many(
+        self,
+        collection: str,
+        documents: List[Dict[str, Any]],
+        ordered: bool = True
+    ) -> List[str]:
+        """插入多条文档(ordered=False时单条失败不会中止其余文档的写入)"""
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
-        result = await coll.insert_many(documents)
+        result = await coll.insert_many(documents, ordered=ordered)
         return [str(id) for id in result.inserted_ids]
 
     async def update_one(
@@ -135,7 +392,7 @@ class MongoDBDatabase(DatabaseBase):
         upsert: bool = False
     ) -> int:
         """更新单条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -150,7 +407,7 @@ class MongoDBDatabase(DatabaseBase):
         upsert: bool = False
     ) -> int:
         """更新多条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -159,7 +416,7 @@ class MongoDBDatabase(DatabaseBase):
 
     async def delete_one(self, collection: str, filter_query: Dict[str, Any]) -> int:
         """删除单条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -168,7 +425,7 @@ class MongoDBDatabase(DatabaseBase):
 
     async def delete_many(self, collection: str, filter_query: Dict[str, Any]) -> int:
         """删除多条文档"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
@@ -177,12 +434,184 @@ class MongoDBDatabase(DatabaseBase):
 
     async def count_documents(self, collection: str, filter_query: Optional[Dict[str, Any]] = None) -> int:
         """统计文档数量"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
 
         coll = self._database[collection]
         return await coll.count_documents(filter_query or {})
 
+    async def create_index(
+        self,
+        collection: str,
+        keys: List[tuple],
+        name: Optional[str] = None,
+        unique: bool = False,
+        **options: Any,
+    ) -> str:
+        """
+        创建索引, 返回索引名
+
+        keys为[(字段, 1/-1)], options透传给createIndexes(如partialFilterExpression、expireAfterSeconds)。
+        MongoDB 4.2+建索引期间不阻塞读写; 同名同定义的索引已存在时直接返回。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        if name:
+            options["name"] = name
+        return await self._database[collection].create_index(keys, unique=unique, **options)
+
+    async def drop_index(self, collection: str, name: str) -> None:
+        """删除索引"""
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        await self._database[collection].drop_index(name)
+
+    async def list_indexes(self, collection: str) -> List[Dict[str, Any]]:
+        """
+        列出集合的索引
+
+        字段与SQLDatabase.list_indexes一致(另有keys), scans为$indexStats统计的访问次数(自mongod启动或索引重建以来),
+        无权限执行$indexStats时为None。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        coll = self._database[collection]
+        information = await coll.index_information()
+
+        scans: Dict[str, int] = {}
+        try:
+            async for stat in coll.aggregate([{"$indexStats": {}}]):
+                scans[stat["name"]] = stat["accesses"]["ops"]
+        except OperationFailure:
+            scans = {}
+
+        return [
+            {
+                "name": name,
+                "table": collection,
+                "keys": [(field, direction) for field, direction in info["key"]],
+                "unique": bool(info.get("unique")) or name == "_id_",
+                "primary": name == "_id_",
+                "valid": True,
+                "scans": scans.get(name),
+                "size": None,
+            }
+            for name, info in information.items()
+        ]
+
+    async def bulk_write(
+        self,
+        collection: str,
+        operations: Iterable[WriteOperation],
+        ordered: bool = False,
+        batch_size: int = 10000,
+    ) -> Dict[str, Any]:
+        """
+        批量执行混合写操作(InsertOne/UpdateOne/UpdateMany/ReplaceOne/DeleteOne/DeleteMany)
+
+        默认无序执行: 服务端不必逐条串行, 单条失败也不影响其余操作。
+        按batch_size分批发送, 返回各类计数及write_errors(index为在operations中的位置)。
+        写错误不会抛出异常, 由调用方检查write_errors; 有序执行时遇到第一个错误即停止。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        coll = self._database[collection]
+        summary = _empty_bulk_summary()
+        offset = 0
+        for batch in batched(operations, batch_size):
+            try:
+                result = await coll.bulk_write(batch, ordered=ordered)
+                details = result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+
+            for name, field in _BULK_COUNTS.items():
+                summary[name] += details.get(field, 0)
+            for error in details.get("writeErrors", []):
+                summary["write_errors"].append({
+                    "index": offset + error["index"],
+                    "code": error.get("code"),
+                    "errmsg": error.get("errmsg"),
+                })
+
+            offset += len(batch)
+            if ordered and details.get("writeErrors"):
+                break
+
+        return summary
+
+    def batch_writer(self, collection: str, **kwargs: Any) -> "MongoBatchWriter":
+        """创建集合的批量写入器, 参数见MongoBatchWriter"""
+        return MongoBatchWriter(self, collection, **kwargs)
+
+    async def parallel_scan(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        partitions: int = 4,
+        batch_size: int = 1000,
+        samples_per_partition: int = 20,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        按_id区间并行扫描集合
+
+        先用$sample抽样_id估算分界点, 把查询切成partitions个_id区间, 每个区间一个游标并发读取。
+        文档按到达顺序产出(不保证顺序), _id保持原始类型, 便于回填时按_id写回。
+        提前退出时应使用contextlib.aclosing及时取消游标。
+        """
+        if not self._connected or self._database is None:
+            raise RuntimeError("Database not connected")
+
+        coll = self._database[collection]
+        filter_query = filter_query or {}
+
+        sample = await coll.aggregate([
+            {"$match": filter_query},
+            {"$sample": {"size": partitions * samples_per_partition}},
+            {"$project": {"_id": 1}},
+        ]).to_list(length=None)
+        range_filters = split_id_ranges([doc["_id"] for doc in sample], partitions, filter_query)
+
+        # 有界队列: 消费跟不上时各游标暂停读取
+        queue: asyncio.Queue = asyncio.Queue(maxsize=len(range_filters) * 2)
+        done = object()
+
+        async def scan(range_filter: Dict[str, Any]) -> None:
+            try:
+                batch = []
+                async for document in coll.find(range_filter, projection, batch_size=batch_size):
+                    batch.append(document)
+                    if len(batch) >= batch_size:
+                        await queue.put(batch)
+                        batch = []
+                if batch:
+                    await queue.put(batch)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
+
+        tasks = [asyncio.create_task(scan(range_filter)) for range_filter in range_filters]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    for document in item:
+                        yield document
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     @asynccontextmanager
     async def transaction(self):
         """MongoDB事务上下文管理器"""
@@ -195,14 +624,14 @@ class MongoDBDatabase(DatabaseBase):
 
     def get_collection(self, name: str) -> AsyncIOMotorCollection:
         """获取集合"""
-        if not self._connected or not self._database:
+        if not self._connected or self._database is None:
             raise RuntimeError("Database not connected")
         return self._database[name]
 
     @property
     def database(self) -> AsyncIOMotorDatabase:
         """获取数据库对象"""
-        if not self._database:
+        if self._database is None:
             raise RuntimeError("Database not connected")
         return self._database
 
@@ -212,3 +641,188 @@ class MongoDBDatabase(DatabaseBase):
         if not self._client:
             raise RuntimeError("Database not connected")
         return self._client
+
+
+class _PendingWrite:
+    """缓冲中的写操作及已发送次数"""
+
+    __slots__ = ("operation", "attempts")
+
+    def __init__(self, operation: WriteOperation, attempts: int = 0):
+        self.operation = operation
+        self.attempts = attempts
+
+
+class MongoBatchWriter:
+    """
+    MongoDB批量写入器
+
+    缓冲写操作, 数量达到max_batch_size或距上次提交超过flush_interval秒时通过bulk_write提交(默认无序)。
+    缓冲满时add会等待本批提交完成, 写入快于数据库处理能力时自然形成背压。
+
+    失败处理:
+    - 可重试的写错误(主节点切换、写冲突等)只把对应的操作放回缓冲, 其它写错误记入stats["write_errors"]
+    - 有序提交在第一个错误处停止, 之后未执行的操作原样放回(不计重试次数)
+    - 整批异常(如网络错误)时无法得知哪些操作已生效, 整批放回; 插入的_id在首次发送时已生成,
+      重发已生效的插入会得到重复键错误而不会重复写入, 非幂等的更新($inc等)则可能重复生效
+    - 每个操作最多重试max_retries次, 之后丢弃并计入stats["failed"]
+
+    累计计数和写错误见stats(最多保留max_errors条错误)。
+
+    示例:
+        async with db.batch_writer("events", max_batch_size=5000) as writer:
+            for event in events:
+                await writer.insert(event)
+    """
+
+    def __init__(
+        self,
+        database: MongoDBDatabase,
+        collection: str,
+        max_batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        ordered: bool = False,
+        max_errors: int = 1000,
+        max_retries: int = 3,
+    ):
+        self._database = database
+        self._collection = collection
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._ordered = ordered
+        self._max_errors = max_errors
+        self._max_retries = max_retries
+        self._buffer: List[_PendingWrite] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+        self.stats = _empty_bulk_summary()
+        self.stats.update(flushes=0, retried=0, failed=0)
+
+    async def start(self) -> None:
+        """启动定时提交"""
+        if self._flush_interval > 0 and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """
+        停止定时提交并提交剩余操作
+
+        重试放回缓冲的操作继续提交(间隔flush_interval), 直到缓冲清空或重试次数用尽;
+        因此丢弃的操作计入stats["failed"]并输出提示, 若最后是整批异常导致丢弃则抛出该异常。
+        """
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        failed_before = self.stats["failed"]
+        error: Optional[Exception] = None
+        while self._buffer:
+            try:
+                await self.flush()
+                error = None
+            except Exception as e:
+                error = e
+            if self._buffer:
+                await asyncio.sleep(self._flush_interval)
+
+        dropped = self.stats["failed"] - failed_before
+        if dropped:
+            print(f"MongoDB batch writer dropped {dropped} operations on close after {self._max_retries} retries")
+            if error is not None:
+                raise error
+
+    async def add(self, operation: WriteOperation) -> None:
+        """加入一个写操作"""
+        self._buffer.append(_PendingWrite(operation))
+        if len(self._buffer) >= self._max_batch_size:
+            await self.flush()
+
+    async def insert(self, document: Dict[str, Any]) -> None:
+        """加入一条插入"""
+        await self.add(InsertOne(document))
+
+    async def flush(self) -> None:
+        """提交缓冲区中的所有操作"""
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            try:
+                result = await self._database.bulk_write(
+                    self._collection,
+                    [pending.operation for pending in batch],
+                    ordered=self._ordered,
+                    batch_size=len(batch),
+                )
+            except Exception as e:
+                self._requeue(batch, [{"index": i, "code": None, "errmsg": str(e)} for i in range(len(batch))])
+                raise
+
+            self.stats["flushes"] += 1
+            for name in _BULK_COUNTS:
+                self.stats[name] += result[name]
+
+            retryable = [error for error in result["write_errors"] if error["code"] in _RETRYABLE_WRITE_CODES]
+            self._record_errors([error for error in result["write_errors"] if error["code"] not in _RETRYABLE_WRITE_CODES])
+            unexecuted = []
+            if self._ordered and result["write_errors"]:
+                unexecuted = batch[result["write_errors"][0]["index"] + 1:]
+            self._requeue(batch, retryable, unexecuted)
+
+    def _requeue(
+        self,
+        batch: List[_PendingWrite],
+        errors: List[Dict[str, Any]],
+        unexecuted: Optional[List[_PendingWrite]] = None,
+    ) -> None:
+        """把失败的操作放回缓冲前部, 超过重试次数的丢弃"""
+        retry: List[_PendingWrite] = []
+        exhausted = []
+        for error in errors:
+            pending = batch[error["index"]]
+            pending.attempts += 1
+            if pending.attempts > self._max_retries:
+                exhausted.append(error)
+            else:
+                retry.append(pending)
+
+        self.stats["retried"] += len(retry)
+        self.stats["failed"] += len(exhausted)
+        self._record_errors(exhausted)
+        self._buffer[:0] = retry + list(unexecuted or [])
+
+    def _record_errors(self, errors: List[Dict[str, Any]]) -> None:
+        """记录写错误, 最多保留max_errors条"""
+        room = self._max_errors - len(self.stats["write_errors"])
+        if room > 0:
+            self.stats["write_errors"].extend(errors[:room])
+
+    async def _flush_loop(self) -> None:
+        """定时提交距上次提交已超过flush_interval的缓冲"""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if time.monotonic() - self._last_flush < self._flush_interval:
+                continue
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"MongoDB batch writer flush failed: {e}")
+
+    @property
+    def pending(self) -> int:
+        """缓冲中待提交的操作数"""
+        return len(self._buffer)
+
+    async def __aenter__(self) -> "MongoBatchWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
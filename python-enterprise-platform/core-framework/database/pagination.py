@@ -0,0 +1,67 @@
+"""
+游标(keyset)分页
+游标为排序键值的不透明编码(JSON + URL安全的base64), 翻页时按排序键比较而不是OFFSET跳过,
+耗时与页码深度无关, 翻页期间插入新数据也不会导致重复或遗漏。
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+import base64
+import binascii
+import json
+
+# datetime值的类型标记
+_DATETIME_TAG = "$dt"
+
+
+def _encode_value(value: Any) -> Any:
+    """编码单个排序键值"""
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """解码单个排序键值"""
+    if isinstance(value, dict) and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    把排序键值编码为游标
+
+    示例:
+        cursor = encode_cursor(last["created_at"], last["id"])
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int, types: Optional[Sequence[type]] = None) -> Tuple[Any, ...]:
+    """
+    解码游标为size个排序键值, 游标无效时抛出ValueError
+
+    types给出时逐个校验键值类型(bool不算int), 格式正确但类型不符的游标同样视为无效,
+    避免把错误类型的值作为查询参数传给数据库。
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid pagination cursor")
+    try:
+        decoded = tuple(_decode_value(value) for value in values)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+    if types is not None and not all(
+        isinstance(value, expected) and not (isinstance(value, bool) and expected is not bool)
+        for value, expected in zip(decoded, types)
+    ):
+        raise ValueError("Invalid pagination cursor")
+    return decoded
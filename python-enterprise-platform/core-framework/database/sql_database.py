@@ -3,8 +3,12 @@ SQL数据库实现 (PostgreSQL, MySQL, SQLite)
 使用SQLAlchemy异步引擎
 """
 
-from typing import Any, Dict, List, Optional
-from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+import asyncio
+import time
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -12,10 +16,14 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy import text, MetaData
+from sqlalchemy import text, MetaData, Row
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.elements import TextClause
 
-from .base import DatabaseBase, DatabaseConfig
+from .base import DatabaseBase, DatabaseConfig, DatabaseType
+from .metrics import QueryMetrics, get_query_metrics
+from .utils import batched
 
 
 class Base(DeclarativeBase):
@@ -23,44 +31,236 @@ class Base(DeclarativeBase):
     metadata = MetaData()
 
 
+# 为True时当前上下文的读操作走主库(读己之写)
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+# 查询副本复制延迟(秒)的语句
+_REPLICA_LAG_QUERIES = {
+    DatabaseType.POSTGRESQL: (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END AS lag"
+    ),
+    DatabaseType.MYSQL: "SHOW REPLICA STATUS",
+    DatabaseType.SQLITE: "SELECT 0 AS lag",
+}
+
+
+# 列出当前库/schema中的索引, 统一为name, table_name, is_unique, is_primary, is_valid, scans, size
+_INDEX_QUERIES = {
+    DatabaseType.POSTGRESQL: (
+        "SELECT i.relname AS name, t.relname AS table_name, ix.indisunique AS is_unique, "
+        "ix.indisprimary AS is_primary, ix.indisvalid AS is_valid, s.idx_scan AS scans, "
+        "pg_relation_size(i.oid) AS size "
+        "FROM pg_index ix "
+        "JOIN pg_class i ON i.oid = ix.indexrelid "
+        "JOIN pg_class t ON t.oid = ix.indrelid "
+        "JOIN pg_namespace n ON n.oid = t.relnamespace "
+        "LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid "
+        "WHERE n.nspname = current_schema()"
+    ),
+    DatabaseType.MYSQL: (
+        "SELECT INDEX_NAME AS name, TABLE_NAME AS table_name, MAX(NON_UNIQUE = 0) AS is_unique, "
+        "MAX(INDEX_NAME = 'PRIMARY') AS is_primary, 1 AS is_valid, NULL AS scans, NULL AS size "
+        "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+        "GROUP BY INDEX_NAME, TABLE_NAME"
+    ),
+    # sql为空的是主键/唯一约束自动创建的索引
+    DatabaseType.SQLITE: (
+        "SELECT name, tbl_name AS table_name, "
+        "CASE WHEN sql IS NULL OR sql LIKE 'CREATE UNIQUE%' THEN 1 ELSE 0 END AS is_unique, "
+        "0 AS is_primary, 1 AS is_valid, NULL AS scans, NULL AS size "
+        "FROM sqlite_master WHERE type = 'index'"
+    ),
+}
+
+
+def _parse_replica_lag(row: Optional[Dict[str, Any]]) -> float:
+    """从检查结果中取复制延迟, 复制未运行时视为无穷大"""
+    if row is None:
+        return float("inf")
+    for column in ("lag", "Seconds_Behind_Source", "Seconds_Behind_Master"):
+        if column in row:
+            return float("inf") if row[column] is None else float(row[column])
+    return float("inf")
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """是否为连接层故障(而不是SQL本身的错误)"""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+class SQLSession:
+    """
+    事务会话 / 工作单元
+
+    代理AsyncSession, execute额外接受SQL字符串(经语句缓存转换为TextClause)。
+    提供与SQLDatabase一致的fetch_one/fetch_all/execute_many, 可以直接替代SQLDatabase
+    传给数据访问函数, 所有查询复用同一个连接和事务。
+    """
+
+    def __init__(self, session: AsyncSession, compile_text: Callable[[str], TextClause]):
+        self._session = session
+        self._compile_text = compile_text
+
+    async def execute(self, statement: Union[str, Any], params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """执行语句"""
+        if isinstance(statement, str):
+            statement = self._compile_text(statement)
+        return await self._session.execute(statement, params or {}, **kwargs)
+
+    async def fetch_one(self, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """查询单条记录"""
+        result = await self.execute(query, params)
+        row = result.fetchone()
+        if row:
+            return dict(row._mapping)
+        return None
+
+    async def fetch_all(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """查询多条记录"""
+        result = await self.execute(query, params)
+        return [dict(row._mapping) for row in result.fetchall()]
+
+    async def execute_many(self, query: str, rows: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """批量执行同一语句, 返回处理的行数(在当前事务中, 不单独提交)"""
+        statement = self._compile_text(query)
+        total = 0
+        for batch in batched(rows, batch_size):
+            await self._session.execute(statement, batch)
+            total += len(batch)
+        return total
+
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """工作单元始终在主库上, 与SQLDatabase.use_primary保持接口一致"""
+        yield
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class _Replica:
+    """只读副本的引擎及其健康状态"""
+
+    def __init__(self, name: str, engine: AsyncEngine, session_factory: async_sessionmaker):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.healthy = True
+        self.lag = 0.0
+        self.latency = 0.0
+        self.failures = 0
+        self.reads = 0
+
+
 class SQLDatabase(DatabaseBase):
-    """SQL数据库实现"""
+    """
+    SQL数据库实现
 
-    def __init__(self, config: DatabaseConfig):
+    SQL字符串转换成的TextClause按字符串缓存(LRU, 容量为statement_cache_size),
+    同一语句复用同一对象, SQLAlchemy编译缓存也能直接命中;
+    PostgreSQL下启用asyncpg预编译语句缓存, 热点查询在服务端跳过解析与规划。
+
+    配置了只读副本时, fetch_one/fetch_all/stream按replica_strategy路由到副本,
+    写操作和事务始终走主库。后台周期检查副本的可用性、延迟和复制延迟,
+    不可用或复制延迟超过replica_max_lag的副本暂不参与读, 全部不可用时回退到主库;
+    读副本遇到连接故障时标记该副本不可用并改读主库。
+    写后需要立即读到最新数据时, 在use_primary()上下文中读取。
+
+    instrument_queries开启时, 主库和副本引擎的查询都记录到QueryMetrics, name为指标中的数据库标签。
+    """
+
+    def __init__(
+        self,
+        config: DatabaseConfig,
+        name: str = "default",
+        metrics: Optional[QueryMetrics] = None,
+    ):
         super().__init__(config)
+        self._name = name
+        self._metrics = metrics
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._replicas: List[_Replica] = []
+        self._replica_cursor = 0
+        self._replica_task: Optional[asyncio.Task] = None
+        if config.statement_cache_size > 0:
+            self._text = lru_cache(maxsize=config.statement_cache_size)(text)
+        else:
+            self._text = text
 
     async def connect(self) -> None:
         """连接数据库"""
         if self._connected:
             return
 
-        connection_string = self.config.get_connection_string()
-
-        self._engine = create_async_engine(
-            connection_string,
-            pool_size=self.config.pool_size,
-            max_overflow=self.config.max_overflow,
-            pool_timeout=self.config.pool_timeout,
-            pool_recycle=self.config.pool_recycle,
-            echo=self.config.echo,
-            **self.config.options,
-        )
-
+        self._engine = self._create_engine(self.config)
         self._session_factory = async_sessionmaker(
             self._engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
 
+        for replica in self.config.replicas:
+            replica_config = self.config.for_replica(replica)
+            engine = self._create_engine(replica_config)
+            self._replicas.append(_Replica(
+                f"{replica_config.host}:{replica_config.port}/{replica_config.database}",
+                engine,
+                async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            ))
+        if self.config.instrument_queries:
+            self._metrics = self._metrics or get_query_metrics()
+            self._metrics.instrument(self._engine, self._name, self.config.slow_query_threshold)
+            for replica in self._replicas:
+                self._metrics.instrument(
+                    replica.engine, f"{self._name}@{replica.name}", self.config.slow_query_threshold
+                )
+
+        if self._replicas and self.config.replica_check_interval > 0:
+            self._replica_task = asyncio.create_task(self._replica_check_loop())
+
         self._connected = True
 
+    def _create_engine(self, config: DatabaseConfig) -> AsyncEngine:
+        """按配置创建异步引擎"""
+        options = dict(config.options)
+        if config.type == DatabaseType.POSTGRESQL:
+            connect_args = dict(options.pop("connect_args", {}))
+            connect_args.setdefault(
+                "prepared_statement_cache_size", config.prepared_statement_cache_size
+            )
+            options["connect_args"] = connect_args
+
+        return create_async_engine(
+            config.get_connection_string(),
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            pool_timeout=config.pool_timeout,
+            pool_recycle=config.pool_recycle,
+            echo=config.echo,
+            **options,
+        )
+
     async def disconnect(self) -> None:
         """断开数据库连接"""
         if not self._connected:
             return
 
+        if self._replica_task:
+            self._replica_task.cancel()
+            try:
+                await self._replica_task
+            except asyncio.CancelledError:
+                pass
+            self._replica_task = None
+
+        for replica in self._replicas:
+            await replica.engine.dispose()
+        self._replicas = []
+
         if self._engine:
             await self._engine.dispose()
             self._engine = None
@@ -74,7 +274,7 @@ class SQLDatabase(DatabaseBase):
             raise RuntimeError("Database not connected")
 
         async with self.get_session() as session:
-            result = await session.execute(text(query), params or {})
+            result = await session.execute(self._text(query), params or {})
             await session.commit()
             return result
 
@@ -83,23 +283,266 @@ class SQLDatabase(DatabaseBase):
         if not self._connected:
             raise RuntimeError("Database not connected")
 
-        async with self.get_session() as session:
-            result = await session.execute(text(query), params or {})
+        async def run(session: AsyncSession) -> Optional[Dict[str, Any]]:
+            result = await session.execute(self._text(query), params or {})
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
             return None
 
+        return await self._read(run)
+
     async def fetch_all(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """查询多条记录"""
         if not self._connected:
             raise RuntimeError("Database not connected")
 
-        async with self.get_session() as session:
-            result = await session.execute(text(query), params or {})
+        async def run(session: AsyncSession) -> List[Dict[str, Any]]:
+            result = await session.execute(self._text(query), params or {})
             rows = result.fetchall()
             return [dict(row._mapping) for row in rows]
 
+        return await self._read(run)
+
+    async def stream(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000,
+        as_tuples: bool = False,
+    ) -> AsyncIterator[Union[Dict[str, Any], Row]]:
+        """
+        流式查询, 逐行返回结果
+
+        使用服务端游标(stream_results)每次从数据库取chunk_size行, 内存占用与结果集大小无关。
+        as_tuples为True时直接返回Row(类元组, 支持按下标和属性访问), 省去逐行构造字典。
+        游标在迭代期间占用一个连接, 提前退出时应使用contextlib.aclosing及时释放。
+
+        示例:
+            async for row in db.stream("SELECT id, email FROM users", chunk_size=5000):
+                ...
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        replica = self._select_replica()
+        factory = replica.session_factory if replica else self._session_factory
+        async with self._open_session(factory) as session:
+            result = await session.stream(self._text(query), params or {})
+            try:
+                async for partition in result.partitions(chunk_size):
+                    if as_tuples:
+                        for row in partition:
+                            yield row
+                    else:
+                        for row in partition:
+                            yield dict(row._mapping)
+            finally:
+                await result.close()
+
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """
+        在该上下文内读操作走主库(读己之写)
+
+        示例:
+            await db.execute("UPDATE users SET ... WHERE id = :id", params)
+            with db.use_primary():
+                user = await db.fetch_one("SELECT * FROM users WHERE id = :id", params)
+        """
+        token = _use_primary.set(True)
+        try:
+            yield
+        finally:
+            _use_primary.reset(token)
+
+    def _select_replica(self) -> Optional[_Replica]:
+        """选择本次读使用的副本, 返回None表示读主库"""
+        if not self._replicas or _use_primary.get():
+            return None
+
+        max_lag = self.config.replica_max_lag
+        candidates = [
+            replica for replica in self._replicas
+            if replica.healthy and (max_lag <= 0 or replica.lag <= max_lag)
+        ]
+        if not candidates:
+            return None
+
+        if self.config.replica_strategy == "least_latency":
+            replica = min(candidates, key=lambda r: r.latency)
+        else:
+            self._replica_cursor = (self._replica_cursor + 1) % len(candidates)
+            replica = candidates[self._replica_cursor]
+        replica.reads += 1
+        return replica
+
+    async def _read(self, run: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """在副本(或主库)上执行只读操作, 副本连接故障时改读主库"""
+        replica = self._select_replica()
+        if replica is not None:
+            try:
+                async with self._open_session(replica.session_factory) as session:
+                    return await run(session)
+            except Exception as e:
+                if not _is_connection_error(e):
+                    raise
+                replica.healthy = False
+                replica.failures += 1
+                print(f"Database replica {replica.name} failed, falling back to primary: {e}")
+
+        async with self.get_session() as session:
+            return await run(session)
+
+    async def _replica_check_loop(self) -> None:
+        """周期检查所有副本"""
+        while True:
+            await asyncio.gather(*(self._check_replica(replica) for replica in self._replicas))
+            await asyncio.sleep(self.config.replica_check_interval)
+
+    async def _check_replica(self, replica: _Replica) -> None:
+        """检查副本可用性, 更新延迟(指数滑动平均)和复制延迟"""
+        start = time.perf_counter()
+        try:
+            async with replica.engine.connect() as conn:
+                result = await conn.execute(self._text(_REPLICA_LAG_QUERIES[self.config.type]))
+                row = result.mappings().first()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if replica.healthy:
+                print(f"Database replica {replica.name} health check failed: {e}")
+            replica.healthy = False
+            replica.failures += 1
+            return
+
+        latency = time.perf_counter() - start
+        replica.latency = latency if replica.latency == 0 else 0.8 * replica.latency + 0.2 * latency
+        replica.lag = _parse_replica_lag(dict(row) if row is not None else None)
+        replica.healthy = True
+
+    def replica_stats(self) -> List[Dict[str, Any]]:
+        """获取各副本的状态"""
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag": replica.lag,
+                "latency": replica.latency,
+                "failures": replica.failures,
+                "reads": replica.reads,
+            }
+            for replica in self._replicas
+        ]
+
+    async def execute_many(
+        self,
+        query: str,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        批量执行同一语句(驱动层executemany), 返回处理的行数
+
+        每批在一个事务中执行并提交, 某一批失败时只回滚该批, 之前的批次已提交。
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        statement = self._text(query)
+        total = 0
+        for batch in batched(rows, batch_size):
+            async with self.get_session() as session:
+                async with session.begin():
+                    await session.execute(statement, batch)
+            total += len(batch)
+        return total
+
+    async def copy_records(
+        self,
+        table: str,
+        records: Iterable[Sequence[Any]],
+        columns: Sequence[str],
+        batch_size: int = 10000,
+        schema: Optional[str] = None,
+    ) -> int:
+        """
+        批量导入记录, 返回导入的行数
+
+        PostgreSQL使用asyncpg的COPY协议(copy_records_to_table), 每批一个事务;
+        其它数据库退化为按列生成的INSERT + execute_many。
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        if self.config.type != DatabaseType.POSTGRESQL:
+            target = f"{schema}.{table}" if schema else table
+            query = (
+                f"INSERT INTO {target} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(f':{column}' for column in columns)})"
+            )
+            return await self.execute_many(
+                query,
+                (dict(zip(columns, record)) for record in records),
+                batch_size=batch_size,
+            )
+
+        total = 0
+        async with self._engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver_connection = raw.driver_connection
+            for batch in batched(records, batch_size):
+                async with driver_connection.transaction():
+                    await driver_connection.copy_records_to_table(
+                        table,
+                        records=batch,
+                        columns=list(columns),
+                        schema_name=schema,
+                    )
+                total += len(batch)
+        return total
+
+    async def execute_autocommit(self, query: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """
+        在事务之外执行语句(AUTOCOMMIT)
+
+        用于不能在事务块中运行的语句, 如PostgreSQL的CREATE INDEX CONCURRENTLY、VACUUM。
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        async with self._engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(self._text(query), params or {})
+
+    async def list_indexes(self, table: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        列出主库中的索引
+
+        返回name、table、unique、primary、valid(PostgreSQL并发建索引失败会留下无效索引)、
+        scans(自统计重置以来的索引扫描次数, 仅PostgreSQL, 其它为None)和size(字节, 仅PostgreSQL)。
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        async with self.get_session() as session:
+            result = await session.execute(self._text(_INDEX_QUERIES[self.config.type]))
+            rows = result.mappings().all()
+
+        return [
+            {
+                "name": row["name"],
+                "table": row["table_name"],
+                "unique": bool(row["is_unique"]),
+                "primary": bool(row["is_primary"]),
+                "valid": bool(row["is_valid"]),
+                "scans": row["scans"],
+                "size": row["size"],
+            }
+            for row in rows
+            if table is None or row["table_name"] == table
+        ]
+
     @asynccontextmanager
     async def transaction(self):
         """事务上下文管理器"""
@@ -108,7 +551,28 @@ class SQLDatabase(DatabaseBase):
 
         async with self.get_session() as session:
             async with session.begin():
-                yield session
+                yield SQLSession(session, self._text)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[SQLSession]:
+        """
+        工作单元: 上下文内的所有查询复用主库上的同一个会话、连接和事务
+
+        正常退出时提交, 异常时回滚。连接在第一次查询时才从连接池取出。
+        中途可以await uow.commit()提前提交(如提交后再失效缓存), 提交后连接归还连接池,
+        之后的语句重新取连接并自动开启新事务, 退出时一并提交。
+
+        示例:
+            async with db.unit_of_work() as uow:
+                user = await uow.fetch_one("SELECT id FROM users WHERE id = :id", {"id": 1})
+                await uow.execute("UPDATE users SET ... WHERE id = :id", {"id": 1})
+        """
+        if not self._connected:
+            raise RuntimeError("Database not connected")
+
+        async with self.get_session() as session:
+            yield SQLSession(session, self._text)
+            await session.commit()
 
     @asynccontextmanager
     async def get_session(self) -> AsyncSession:
@@ -116,7 +580,13 @@ class SQLDatabase(DatabaseBase):
         if not self._session_factory:
             raise RuntimeError("Database not connected")
 
-        async with self._session_factory() as session:
+        async with self._open_session(self._session_factory) as session:
+            yield session
+
+    @asynccontextmanager
+    async def _open_session(self, factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncSession]:
+        """从指定会话工厂打开会话, 异常时回滚"""
+        async with factory() as session:
             try:
                 yield session
             except Exception:
@@ -0,0 +1,16 @@
+"""
+数据库模块共用的工具函数
+"""
+
+from itertools import islice
+from typing import Any, Iterable, List
+
+
+def batched(items: Iterable[Any], batch_size: int) -> Iterable[List[Any]]:
+    """按批切分可迭代对象"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -87,6 +87,11 @@ class MessageQueueConfig:
 
     # Redis特定配置
     db: int = 0
+    # 共享连接池名称, 默认按地址/库命名, 与同一Redis上的缓存复用连接
+    pool_name: Optional[str] = None
+    max_connections: int = 50
+    pool_timeout: float = 5.0
+    health_check_interval: int = 30
 
 
 MessageHandler = Callable[[Message], Awaitable[None]]
@@ -2,13 +2,15 @@
 RabbitMQ消息队列实现
 """
 
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
+from itertools import islice
 import asyncio
 import uuid
 
 import aio_pika
 from aio_pika import Connection, Channel, Queue, Exchange, Message as AioPikaMessage
 from aio_pika.abc import AbstractIncomingMessage
+from aiormq.abc import DeliveredMessage
 
 from .base import MessageQueueBase, MessageQueueConfig, Message, MessageHandler
 
@@ -21,6 +23,8 @@ class RabbitMQQueue(MessageQueueBase):
         self._connection: Optional[Connection] = None
         self._channel: Optional[Channel] = None
         self._consumers = {}
+        # 交换机对象缓存, 避免每次发布都向broker查询(get_exchange为一次被动声明往返)
+        self._exchanges: Dict[str, Exchange] = {}
 
     async def connect(self) -> None:
         """连接RabbitMQ"""
@@ -38,6 +42,7 @@ class RabbitMQQueue(MessageQueueBase):
             timeout=self.config.connection_timeout,
         )
 
+        # 通道默认开启发布确认: broker确认(ack)后发布才算完成
         self._channel = await self._connection.channel()
         await self._channel.set_qos(prefetch_count=10)
 
@@ -52,6 +57,7 @@ class RabbitMQQueue(MessageQueueBase):
         for consumer_tag in list(self._consumers.keys()):
             await self._cancel_consumer(consumer_tag)
 
+        self._exchanges.clear()
         if self._channel:
             await self._channel.close()
             self._channel = None
@@ -73,12 +79,85 @@ class RabbitMQQueue(MessageQueueBase):
         if not self._connected or not self._channel:
             raise RuntimeError("Not connected to RabbitMQ")
 
-        # 设置消息ID
+        if exchange:
+            # 发布到交换机
+            exch = await self._get_exchange(exchange)
+            await exch.publish(
+                self._to_amqp(message),
+                routing_key=routing_key or queue_name
+            )
+        else:
+            # 直接发布到队列
+            await self._channel.default_exchange.publish(
+                self._to_amqp(message),
+                routing_key=queue_name
+            )
+
+    async def publish_batch(
+        self,
+        queue_name: str,
+        messages: Iterable[Message],
+        exchange: Optional[str] = None,
+        routing_key: Optional[str] = None,
+        max_in_flight: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        批量发布消息, 返回{"published": 已确认数, "failed": [{"index", "message_id", "error"}]}
+
+        publish逐条等待broker确认, 每条消息一个往返; 这里每次连续发出最多max_in_flight条,
+        再一起等待这批确认, 吞吐不再受往返延迟限制。
+        被broker拒绝(nack, aio_pika抛出DeliveryError)或无法路由(mandatory发布被退回, 返回Basic.Return消息)的消息
+        记入failed(index为在messages中的下标), 由调用方决定是否重发。
+        """
+        if not self._connected or not self._channel:
+            raise RuntimeError("Not connected to RabbitMQ")
+
+        if exchange:
+            target = await self._get_exchange(exchange)
+            key = routing_key or queue_name
+        else:
+            target = self._channel.default_exchange
+            key = queue_name
+
+        summary: Dict[str, Any] = {"published": 0, "failed": []}
+        iterator = iter(messages)
+        offset = 0
+        while True:
+            batch = list(islice(iterator, max_in_flight))
+            if not batch:
+                break
+
+            results = await asyncio.gather(
+                *(target.publish(self._to_amqp(message), routing_key=key) for message in batch),
+                return_exceptions=True,
+            )
+            for index, (message, result) in enumerate(zip(batch, results), offset):
+                if isinstance(result, BaseException):
+                    error = str(result) or type(result).__name__
+                elif isinstance(result, DeliveredMessage):
+                    error = f"Message returned by broker: {result.delivery.reply_text}"
+                else:
+                    summary["published"] += 1
+                    continue
+                summary["failed"].append({"index": index, "message_id": message.message_id, "error": error})
+            offset += len(batch)
+
+        return summary
+
+    async def _get_exchange(self, exchange_name: str) -> Exchange:
+        """获取交换机(带缓存)"""
+        exch = self._exchanges.get(exchange_name)
+        if exch is None:
+            exch = await self._channel.get_exchange(exchange_name)
+            self._exchanges[exchange_name] = exch
+        return exch
+
+    def _to_amqp(self, message: Message) -> AioPikaMessage:
+        """转换为RabbitMQ消息, 未设置消息ID时生成"""
         if not message.message_id:
             message.message_id = str(uuid.uuid4())
 
-        # 创建RabbitMQ消息
-        rabbitmq_message = AioPikaMessage(
+        return AioPikaMessage(
             body=message.serialize(),
             content_type=message.content_type,
             message_id=message.message_id,
@@ -88,20 +167,6 @@ class RabbitMQQueue(MessageQueueBase):
             timestamp=message.timestamp,
         )
 
-        if exchange:
-            # 发布到交换机
-            exch = await self._channel.get_exchange(exchange)
-            await exch.publish(
-                rabbitmq_message,
-                routing_key=routing_key or queue_name
-            )
-        else:
-            # 直接发布到队列
-            await self._channel.default_exchange.publish(
-                rabbitmq_message,
-                routing_key=queue_name
-            )
-
     async def consume(
         self,
         queue_name: str,
@@ -191,12 +256,14 @@ class RabbitMQQueue(MessageQueueBase):
         if not self._connected or not self._channel:
             raise RuntimeError("Not connected to RabbitMQ")
 
-        return await self._channel.declare_exchange(
+        exch = await self._channel.declare_exchange(
             exchange_name,
             type=exchange_type,
             durable=durable,
             auto_delete=auto_delete
         )
+        self._exchanges[exchange_name] = exch
+        return exch
 
     async def bind_queue(
         self,
@@ -209,7 +276,7 @@ class RabbitMQQueue(MessageQueueBase):
             raise RuntimeError("Not connected to RabbitMQ")
 
         queue = await self._channel.get_queue(queue_name)
-        exchange = await self._channel.get_exchange(exchange_name)
+        exchange = await self._get_exchange(exchange_name)
         await queue.bind(exchange, routing_key=routing_key)
 
     async def _cancel_consumer(self, consumer_tag: str) -> None:
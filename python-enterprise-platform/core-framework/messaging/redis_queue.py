@@ -9,6 +9,8 @@ import json
 
 from redis.asyncio import Redis, ConnectionPool
 
+from connections.redis_pool import RedisPoolConfig, get_redis_pool_registry
+
 from .base import MessageQueueBase, MessageQueueConfig, Message, MessageHandler
 
 
@@ -19,6 +21,7 @@ class RedisQueue(MessageQueueBase):
         super().__init__(config)
         self._client: Optional[Redis] = None
         self._pool: Optional[ConnectionPool] = None
+        self._pool_name: Optional[str] = None
         self._consumers = {}
         self._consumer_tasks = {}
         self.use_streams = use_streams  # 使用Redis Streams还是List
@@ -28,13 +31,19 @@ class RedisQueue(MessageQueueBase):
         if self._connected:
             return
 
-        self._pool = ConnectionPool(
+        # 从注册表获取共享连接池; 阻塞消费(BLPOP/XREAD)在等待期间会占用一个连接
+        pool_config = RedisPoolConfig(
             host=self.config.host,
             port=self.config.port,
             password=self.config.password,
             db=self.config.db,
             decode_responses=False,
+            max_connections=self.config.max_connections,
+            pool_timeout=self.config.pool_timeout,
+            health_check_interval=self.config.health_check_interval,
         )
+        self._pool_name = self.config.pool_name or pool_config.default_name
+        self._pool = await get_redis_pool_registry().acquire(pool_config, self._pool_name)
 
         self._client = Redis(connection_pool=self._pool)
         await self._client.ping()
@@ -61,7 +70,7 @@ class RedisQueue(MessageQueueBase):
             self._client = None
 
         if self._pool:
-            await self._pool.disconnect()
+            await get_redis_pool_registry().release(self._pool_name)
             self._pool = None
 
         self._connected = False
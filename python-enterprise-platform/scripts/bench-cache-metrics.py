@@ -0,0 +1,70 @@
+"""
+缓存指标开销基准测试
+对比裸MemoryCache与InstrumentedCache包装后的 get/set 吞吐量
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+from cache.metrics import CacheMetrics, InstrumentedCache
+
+
+async def measure(cache, keys: int, ops: int) -> tuple:
+    """返回 (set ops/s, get ops/s)"""
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.set(f"user:{i % keys}", i)
+    set_rate = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.get(f"user:{i % (keys * 2)}")
+    get_rate = ops / (time.perf_counter() - start)
+    return set_rate, get_rate
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="缓存指标开销基准测试")
+    parser.add_argument("--keys", type=int, default=10_000, help="键数量")
+    parser.add_argument("--ops", type=int, default=200_000, help="每项测量的操作次数")
+    parser.add_argument("--rounds", type=int, default=3, help="重复次数(取最好成绩)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  缓存指标开销基准测试")
+    print("=" * 60)
+
+    config = CacheConfig(type=CacheType.MEMORY, default_ttl=3600)
+    results = {}
+    for label in ("plain", "instrumented"):
+        cache = MemoryCache(config, max_size=args.keys * 2)
+        if label == "instrumented":
+            cache = InstrumentedCache(cache, name="bench", metrics=CacheMetrics())
+        await cache.connect()
+
+        best = (0.0, 0.0)
+        for _ in range(args.rounds):
+            set_rate, get_rate = await measure(cache, args.keys, args.ops)
+            best = (max(best[0], set_rate), max(best[1], get_rate))
+        results[label] = best
+        print(f"{label:>12} | set {best[0]:>12,.0f} ops/s | get {best[1]:>12,.0f} ops/s")
+        await cache.disconnect()
+
+    plain, instrumented = results["plain"], results["instrumented"]
+    for name, index in (("set", 0), ("get", 1)):
+        overhead_us = (1 / instrumented[index] - 1 / plain[index]) * 1e6
+        print(f"{name} 每次操作额外开销: {overhead_us:.2f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
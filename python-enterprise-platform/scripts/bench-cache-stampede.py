@@ -0,0 +1,86 @@
+"""
+缓存击穿负载测试
+热点键过期时大量并发请求, 统计每次过期触发的数据库查询次数
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+
+
+class FakeDatabase:
+    """模拟数据库: 每次查询耗时固定并计数"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+
+    async def load_user(self) -> dict:
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return {"id": 1, "username": "hot-user"}
+
+
+async def naive_request(cache: MemoryCache, db: FakeDatabase, ttl: int) -> dict:
+    """原有模式: 先查缓存, 未命中查库再写缓存"""
+    value = await cache.get("user:1")
+    if value is None:
+        value = await db.load_user()
+        await cache.set("user:1", value, ttl=ttl)
+    return value
+
+
+async def protected_request(cache: MemoryCache, db: FakeDatabase, ttl: int) -> dict:
+    """get_or_load: 单飞合并 + XFetch提前刷新 + stale-while-revalidate"""
+    return await cache.get_or_load("user:1", db.load_user, ttl=ttl, stale_ttl=ttl)
+
+
+async def run(mode: str, args) -> None:
+    """运行若干个过期周期, 每个周期持续发起并发请求"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    cache = MemoryCache(config, sweep_interval=0.1)
+    await cache.connect()
+    db = FakeDatabase(args.db_latency)
+    handler = naive_request if mode == "naive" else protected_request
+
+    deadline = time.monotonic() + args.ttl * args.cycles
+    while time.monotonic() < deadline:
+        await asyncio.gather(*(handler(cache, db, args.ttl) for _ in range(args.concurrency)))
+        await asyncio.sleep(args.interval)
+
+    print(
+        f"{mode:<11} | queries {db.queries:>6} | "
+        f"per expiry {db.queries / args.cycles:>8.1f}"
+    )
+    await cache.disconnect()
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="缓存击穿负载测试")
+    parser.add_argument("--concurrency", type=int, default=500, help="每批并发请求数")
+    parser.add_argument("--interval", type=float, default=0.01, help="批次间隔(秒)")
+    parser.add_argument("--ttl", type=int, default=1)
+    parser.add_argument("--cycles", type=int, default=5, help="过期周期数")
+    parser.add_argument("--db-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  缓存击穿负载测试")
+    print("=" * 60)
+
+    for mode in ("naive", "get_or_load"):
+        await run(mode, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+分页基准测试
+在users表上对比LIMIT/OFFSET与游标(keyset)分页在不同深度的单页耗时
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from database import SQLDatabase, DatabaseConfig, DatabaseType, encode_cursor, decode_cursor
+
+OFFSET_QUERY = "SELECT * FROM users ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :skip"
+KEYSET_QUERY = (
+    "SELECT * FROM users WHERE (created_at, id) < (:created_at, :id) "
+    "ORDER BY created_at DESC, id DESC LIMIT :limit"
+)
+
+
+async def populate(db: SQLDatabase, rows: int) -> None:
+    """创建users表和分页索引并写入数据, 每10行共用一个created_at"""
+    await db.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(50) NOT NULL,
+            email VARCHAR(100) NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    start = datetime(2024, 1, 1)
+    await db.copy_records(
+        "users",
+        (
+            (f"user{i}", f"user{i}@example.com", (start + timedelta(seconds=i // 10)).isoformat(" "))
+            for i in range(rows)
+        ),
+        columns=["username", "email", "created_at"],
+        batch_size=50_000,
+    )
+    await db.execute("CREATE INDEX idx_users_created_at_id ON users(created_at DESC, id DESC)")
+
+
+async def timed(db: SQLDatabase, query: str, params: dict, repeat: int) -> float:
+    """多次执行取中位数耗时(毫秒)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await db.fetch_all(query, params)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="分页基准测试")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="表中行数")
+    parser.add_argument("--limit", type=int, default=100, help="每页行数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个深度的重复次数")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  分页基准测试 (LIMIT/OFFSET vs 游标)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = DatabaseConfig(
+            type=DatabaseType.SQLITE,
+            database=os.path.join(tmp_dir, "bench.db"),
+            instrument_queries=False,
+        )
+        db = SQLDatabase(config)
+        await db.connect()
+
+        start = time.perf_counter()
+        await populate(db, args.rows)
+        print(f"写入 {args.rows:,} 行并建索引: {time.perf_counter() - start:.1f}s")
+        print()
+        print(f"{'跳过行数':>10} | {'OFFSET':>10} | {'游标':>10}")
+
+        for skip in (0, 1_000, 10_000, 100_000, args.rows // 2, args.rows - args.limit):
+            if skip >= args.rows:
+                continue
+            offset_ms = await timed(db, OFFSET_QUERY, {"limit": args.limit, "skip": skip}, args.repeat)
+
+            # 游标取自上一页最后一行, 与客户端逐页翻到该深度时拿到的游标相同
+            if skip:
+                last = await db.fetch_one(
+                    "SELECT created_at, id FROM users ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET :skip",
+                    {"skip": skip - 1},
+                )
+                created_at, last_id = decode_cursor(encode_cursor(last["created_at"], last["id"]), 2)
+                keyset_ms = await timed(
+                    db, KEYSET_QUERY, {"limit": args.limit, "created_at": created_at, "id": last_id}, args.repeat
+                )
+            else:
+                keyset_ms = await timed(
+                    db, "SELECT * FROM users ORDER BY created_at DESC, id DESC LIMIT :limit",
+                    {"limit": args.limit}, args.repeat,
+                )
+            print(f"{skip:>10,} | {offset_ms:>8.2f}ms | {keyset_ms:>8.2f}ms")
+
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
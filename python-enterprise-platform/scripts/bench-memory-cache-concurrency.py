@@ -0,0 +1,69 @@
+"""
+MemoryCache 并发基准测试
+大量协程并发执行 get/set, 比较不同分段数下的吞吐量
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+
+
+async def worker(cache: MemoryCache, key_space: int, ops: int, write_ratio: float) -> None:
+    """单个协程: 按读写比例执行操作"""
+    rnd = random.Random()
+    for _ in range(ops):
+        key = f"key:{rnd.randrange(key_space)}"
+        if rnd.random() < write_ratio:
+            await cache.set(key, key)
+        else:
+            await cache.get(key)
+        # 模拟请求处理中的其它await点
+        if rnd.random() < 0.1:
+            await asyncio.sleep(0)
+
+
+async def bench_shards(shards: int, tasks: int, ops: int, key_space: int, write_ratio: float) -> None:
+    """测量指定分段数下的吞吐量"""
+    config = CacheConfig(type=CacheType.MEMORY, memory_shards=shards)
+    cache = MemoryCache(config, max_size=key_space)
+    await cache.connect()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(cache, key_space, ops, write_ratio) for _ in range(tasks)))
+    elapsed = time.perf_counter() - start
+
+    total = tasks * ops
+    print(f"shards={shards:>3} | tasks={tasks:>5} | {total / elapsed:>12,.0f} ops/s")
+    await cache.disconnect()
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MemoryCache 并发吞吐量基准测试")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--tasks", type=int, default=2000, help="并发协程数")
+    parser.add_argument("--ops", type=int, default=200, help="每个协程的操作次数")
+    parser.add_argument("--key-space", type=int, default=100_000)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  MemoryCache 并发基准测试")
+    print("=" * 60)
+
+    for shards in args.shards:
+        await bench_shards(shards, args.tasks, args.ops, args.key_space, args.write_ratio)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
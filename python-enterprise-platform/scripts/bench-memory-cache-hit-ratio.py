@@ -0,0 +1,103 @@
+"""
+MemoryCache 命中率基准测试
+回放访问轨迹, 比较LRU与W-TinyLFU的命中率
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+
+
+def zipf_with_scans(
+    length: int,
+    universe: int,
+    skew: float,
+    scan_every: int,
+    scan_length: int,
+    seed: int = 42,
+) -> List[str]:
+    """生成Zipf分布的热点访问, 并周期性插入一次性扫描"""
+    rnd = random.Random(seed)
+    weights = [1.0 / (rank ** skew) for rank in range(1, universe + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    total = cumulative[-1]
+
+    trace: List[str] = []
+    scan_id = 0
+    while len(trace) < length:
+        if scan_every and len(trace) % scan_every == 0 and trace:
+            trace.extend(f"scan:{scan_id}:{i}" for i in range(scan_length))
+            scan_id += 1
+        rank = bisect.bisect_left(cumulative, rnd.random() * total)
+        trace.append(f"item:{rank}")
+    return trace[:length]
+
+
+def load_trace(path: str) -> List[str]:
+    """从文件加载轨迹(每行一个键)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def replay(trace: List[str], policy: str, capacity: int) -> dict:
+    """按cache-aside方式回放轨迹: 未命中则写入"""
+    config = CacheConfig(type=CacheType.MEMORY, default_ttl=0)
+    cache = MemoryCache(config, max_size=capacity, policy=policy, sweep_interval=0)
+    await cache.connect()
+
+    for key in trace:
+        if await cache.get(key) is None:
+            await cache.set(key, 1)
+
+    stats = cache.stats()
+    await cache.disconnect()
+    return stats
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MemoryCache 命中率基准测试")
+    parser.add_argument("--trace", help="轨迹文件路径(每行一个键), 不指定则生成合成轨迹")
+    parser.add_argument("--length", type=int, default=500_000)
+    parser.add_argument("--universe", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=0.9)
+    parser.add_argument("--scan-every", type=int, default=20_000)
+    parser.add_argument("--scan-length", type=int, default=5_000)
+    parser.add_argument("--capacities", type=int, nargs="+", default=[1_000, 5_000])
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = zipf_with_scans(
+            args.length, args.universe, args.skew, args.scan_every, args.scan_length
+        )
+
+    print("=" * 60)
+    print("  MemoryCache 命中率基准测试")
+    print("=" * 60)
+    print(f"轨迹长度: {len(trace):,}")
+
+    for capacity in args.capacities:
+        for policy in ("lru", "tinylfu"):
+            stats = await replay(trace, policy, capacity)
+            print(
+                f"capacity={capacity:>7,} | {policy:<8} | hit ratio {stats['hit_ratio']:.2%}"
+                f" | evictions {stats['evictions']:>9,}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
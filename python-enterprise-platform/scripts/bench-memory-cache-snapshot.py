@@ -0,0 +1,75 @@
+"""
+MemoryCache 快照基准测试
+测量写入快照和启动时从快照恢复的耗时
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MemoryCache 快照基准测试")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="缓存条目数")
+    parser.add_argument("--serializer", default="pickle", help="快照序列化格式")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  MemoryCache 快照基准测试")
+    print("=" * 60)
+
+    config = CacheConfig(type=CacheType.MEMORY, default_ttl=3600)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cache.snapshot")
+
+        cache = MemoryCache(
+            config,
+            max_size=args.entries,
+            snapshot_path=path,
+            snapshot_serializer=args.serializer,
+        )
+        await cache.connect()
+        await cache.set_many({
+            f"user:{i}": {"id": i, "username": f"user{i}", "is_active": True}
+            for i in range(args.entries)
+        })
+
+        start = time.perf_counter()
+        written = await cache.snapshot()
+        snapshot_elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"快照: {written:,} 条, {size_mb:.1f} MB, 耗时 {snapshot_elapsed:.2f}s")
+
+        # 只测量恢复, 避免disconnect时再次写快照
+        cache._snapshot_path = None
+        await cache.disconnect()
+
+        restored = MemoryCache(
+            config,
+            max_size=args.entries,
+            snapshot_path=path,
+            snapshot_serializer=args.serializer,
+        )
+        start = time.perf_counter()
+        await restored.connect()
+        restore_elapsed = time.perf_counter() - start
+        print(
+            f"恢复: {restored.size():,} 条, 耗时 {restore_elapsed:.2f}s"
+            f" ({restored.size() / restore_elapsed:,.0f} 条/s)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+MemoryCache 性能基准测试
+测量不同键数量下 get/set 的吞吐量, 并与改造前的过期处理(每次读取全量扫描)对比
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.base import CacheConfig, CacheType
+from cache.memory_cache import MemoryCache
+
+
+class FullScanMemoryCache(MemoryCache):
+    """
+    改造前的过期处理(对照组)
+
+    get/exists先遍历全部键回收过期项再查找目标键, 与引入过期索引堆之前的实现一致,
+    读取开销随键数量线性增长。
+    """
+
+    async def _evict_expired_full_scan(self) -> None:
+        """清除过期项(全量扫描)"""
+        current_time = time.time()
+        for segment in self._segments:
+            async with segment.lock:
+                expired_keys = [
+                    key for key, item in segment.cache.items()
+                    if item.expire_at and current_time > item.expire_at
+                ]
+                for key in expired_keys:
+                    segment.discard(key)
+
+    async def get(self, key: str):
+        await self._evict_expired_full_scan()
+        return await super().get(key)
+
+    async def exists(self, key: str) -> bool:
+        await self._evict_expired_full_scan()
+        return await super().exists(key)
+
+
+async def bench_size(cache_class: type, label: str, size: int, ops: int) -> None:
+    """在预填充size个键的缓存上测量吞吐量"""
+    config = CacheConfig(type=CacheType.MEMORY, default_ttl=3600)
+    cache = cache_class(config, max_size=size + ops)
+    await cache.connect()
+
+    for i in range(size):
+        await cache.set(f"key:{i}", i)
+
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.set(f"new:{i}", i)
+    set_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.get(f"key:{i % size}")
+    get_elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<8} | {size:>10,} keys | set {ops / set_elapsed:>12,.0f} ops/s"
+        f" | get {ops / get_elapsed:>12,.0f} ops/s"
+    )
+    await cache.disconnect()
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MemoryCache 吞吐量基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=10_000, help="每项测量的操作次数")
+    parser.add_argument(
+        "--baseline-ops", type=int, default=50,
+        help="对照组每项测量的操作次数(全量扫描在百万键时每秒只有个位数次读取)",
+    )
+    parser.add_argument(
+        "--impl", choices=["both", "current", "baseline"], default="both",
+        help="测量当前实现、改造前的全量扫描实现或两者",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  MemoryCache 基准测试")
+    print("=" * 60)
+
+    for size in args.sizes:
+        if args.impl in ("both", "baseline"):
+            await bench_size(FullScanMemoryCache, "before", size, args.baseline_ops)
+        if args.impl in ("both", "current"):
+            await bench_size(MemoryCache, "after", size, args.ops)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+RabbitMQ批量发布基准测试
+用本地broker替身(在往返延迟后返回发布确认)对比逐条publish与publish_batch的吞吐
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from pamqp.commands import Basic
+
+from messaging import RabbitMQQueue, MessageQueueConfig, Message
+from messaging.base import QueueType
+
+
+class StandInExchange:
+    """交换机替身: 每条消息的确认在一个往返延迟后到达, 多条在途时并行等待"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.published = 0
+
+    async def publish(self, message, routing_key: str):
+        loop = asyncio.get_running_loop()
+        confirm = loop.create_future()
+        self.published += 1
+        loop.call_later(self.rtt, confirm.set_result, Basic.Ack(delivery_tag=self.published))
+        return await confirm
+
+
+class StandInChannel:
+    """通道替身: get_exchange为一次往返"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.default_exchange = StandInExchange(rtt)
+        self.exchange_lookups = 0
+
+    async def get_exchange(self, name: str) -> StandInExchange:
+        self.exchange_lookups += 1
+        await asyncio.sleep(self.rtt)
+        return self.default_exchange
+
+
+def make_messages(count: int):
+    """构造事件消息"""
+    return [Message(body={"event": "user.created", "user_id": i}) for i in range(count)]
+
+
+async def measure(label: str, count: int, publish) -> None:
+    """执行一轮发布并输出吞吐"""
+    start = time.perf_counter()
+    await publish()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} | {count:>7,} 条 | {elapsed:>7.2f}s | {count / elapsed:>10,.0f} msgs/s")
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="RabbitMQ批量发布基准测试")
+    parser.add_argument("--messages", type=int, default=5_000, help="每轮发布的消息数")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="broker替身的确认往返延迟(毫秒)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  RabbitMQ批量发布基准测试 (broker替身)")
+    print("=" * 60)
+
+    channel = StandInChannel(args.rtt_ms / 1000)
+    queue = RabbitMQQueue(MessageQueueConfig(type=QueueType.RABBITMQ))
+    queue._channel = channel
+    queue._connected = True
+
+    async def publish_each(cache_exchange: bool):
+        for message in make_messages(args.messages):
+            if not cache_exchange:
+                queue._exchanges.clear()
+            await queue.publish("events", message, exchange="events")
+
+    async def publish_batch(max_in_flight: int):
+        summary = await queue.publish_batch(
+            "events", make_messages(args.messages), exchange="events", max_in_flight=max_in_flight
+        )
+        assert summary["published"] == args.messages and not summary["failed"]
+
+    await measure("publish (每次查询交换机)", args.messages, lambda: publish_each(False))
+    await measure("publish (交换机缓存)", args.messages, lambda: publish_each(True))
+    for max_in_flight in (100, 1000):
+        await measure(f"publish_batch(max_in_flight={max_in_flight})", args.messages, lambda: publish_batch(max_in_flight))
+
+    print()
+    print(f"交换机查询次数: {channel.exchange_lookups:,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
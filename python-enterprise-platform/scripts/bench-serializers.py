@@ -0,0 +1,100 @@
+"""
+缓存序列化基准测试
+对典型的UserResponse负载比较各编解码器的编码/解码耗时与字节数
+"""
+
+import argparse
+import json
+import logging  # 先加载标准库logging, 避免被core-framework/logging遮蔽
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from cache.serializers import PayloadCodec
+
+
+def make_user(user_id: int) -> dict:
+    """构造与UserResponse.model_dump(mode="json")一致的负载"""
+    return {
+        "username": f"user_{user_id:06d}",
+        "email": f"user_{user_id:06d}@example.com",
+        "full_name": f"Test User {user_id}",
+        "id": user_id,
+        "is_active": True,
+        "is_superuser": False,
+        "roles": ["user", "editor"],
+        "created_at": datetime(2024, 1, 1, 12, 0, user_id % 60).isoformat(),
+    }
+
+
+def bench(name: str, encode, decode, payload, iterations: int) -> None:
+    """测量单个编解码器"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encoded = encode(payload)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(encoded)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    print(f"{name:<22} | encode {encode_us:>8.2f} us | decode {decode_us:>8.2f} us | {len(encoded):>7,} bytes")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="缓存序列化基准测试")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    payloads = {
+        "single user": make_user(1),
+        "100 users": [make_user(i) for i in range(100)],
+    }
+
+    codecs = [
+        ("orjson", None),
+        ("msgpack", None),
+        ("json", None),
+        ("pickle", None),
+        ("orjson", "lz4"),
+        ("orjson", "zstd"),
+        ("msgpack", "lz4"),
+        ("msgpack", "zstd"),
+    ]
+
+    print("=" * 80)
+    print("  缓存序列化基准测试")
+    print("=" * 80)
+
+    for label, payload in payloads.items():
+        iterations = args.iterations if label == "single user" else args.iterations // 20
+        print(f"\n[{label}]")
+
+        # 原有方式: 服务层json.dumps后RedisCache再json.dumps一次
+        bench(
+            "json (double-encoded)",
+            lambda v: json.dumps(json.dumps(v)),
+            lambda s: json.loads(json.loads(s)),
+            payload,
+            iterations,
+        )
+
+        for serializer, compression in codecs:
+            try:
+                codec = PayloadCodec(serializer, compression, compress_threshold=256)
+            except ImportError as e:
+                print(f"{serializer}+{compression}: 跳过 ({e})")
+                continue
+            name = serializer if not compression else f"{serializer}+{compression}"
+            bench(name, codec.encode, codec.decode, payload, iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SQL批量写入基准测试
+对比逐行execute、execute_many与copy_records的写入速度(行/秒)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from database import SQLDatabase, DatabaseConfig, DatabaseType
+
+INSERT_USER = "INSERT INTO users (username, email, hashed_password) VALUES (:username, :email, :hashed_password)"
+COLUMNS = ["username", "email", "hashed_password"]
+
+
+def make_rows(prefix: str, count: int):
+    """生成用户行"""
+    return [
+        {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "hashed_password": "x" * 60}
+        for i in range(count)
+    ]
+
+
+async def create_table(db: SQLDatabase) -> None:
+    """创建users表"""
+    await db.execute("DROP TABLE IF EXISTS users")
+    await db.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            hashed_password VARCHAR(255) NOT NULL
+        )
+    """)
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SQL批量写入基准测试")
+    parser.add_argument("--rows", type=int, default=100_000, help="批量写入的行数")
+    parser.add_argument("--single-rows", type=int, default=2_000, help="逐行写入的行数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批行数")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  SQL批量写入基准测试")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = DatabaseConfig(type=DatabaseType.SQLITE, database=os.path.join(tmp_dir, "bench.db"))
+        db = SQLDatabase(config)
+        await db.connect()
+
+        await create_table(db)
+        rows = make_rows("single", args.single_rows)
+        start = time.perf_counter()
+        for row in rows:
+            await db.execute(INSERT_USER, row)
+        elapsed = time.perf_counter() - start
+        print(f"{'逐行execute':>16} | {len(rows):>8,} 行 | {len(rows) / elapsed:>10,.0f} 行/s")
+
+        await create_table(db)
+        rows = make_rows("many", args.rows)
+        start = time.perf_counter()
+        await db.execute_many(INSERT_USER, rows, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{'execute_many':>16} | {len(rows):>8,} 行 | {len(rows) / elapsed:>10,.0f} 行/s")
+
+        await create_table(db)
+        records = [tuple(row[column] for column in COLUMNS) for row in make_rows("copy", args.rows)]
+        start = time.perf_counter()
+        await db.copy_records("users", records, columns=COLUMNS, batch_size=args.batch_size * 10)
+        elapsed = time.perf_counter() - start
+        print(f"{'copy_records':>16} | {len(records):>8,} 行 | {len(records) / elapsed:>10,.0f} 行/s")
+
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
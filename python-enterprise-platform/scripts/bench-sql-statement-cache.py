@@ -0,0 +1,106 @@
+"""
+SQL语句缓存基准测试
+在SQLite上模拟用户服务的查询, 对比关闭/开启语句缓存时的单次查询延迟
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from database import SQLDatabase, DatabaseConfig, DatabaseType
+
+QUERIES = {
+    "get_user": ("SELECT * FROM users WHERE id = :id", lambda i: {"id": i % 1000 + 1}),
+    "list_users": (
+        "SELECT * FROM users ORDER BY created_at DESC LIMIT :limit OFFSET :skip",
+        lambda i: {"limit": 20, "skip": i % 50 * 20},
+    ),
+}
+
+
+async def setup(db: SQLDatabase, users: int) -> None:
+    """创建并填充users表"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            email TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    async with db.transaction() as session:
+        for i in range(users):
+            await session.execute(
+                "INSERT INTO users (username, email) VALUES (:username, :email)",
+                {"username": f"user{i}", "email": f"user{i}@example.com"},
+            )
+
+
+async def bench(path: str, cache_size: int, ops: int) -> dict:
+    """返回各查询的平均延迟(微秒)"""
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=path,
+        statement_cache_size=cache_size,
+    )
+    db = SQLDatabase(config)
+    await db.connect()
+
+    results = {}
+    for name, (query, params) in QUERIES.items():
+        # 预热连接池
+        for i in range(100):
+            await db.fetch_all(query, params(i))
+
+        start = time.perf_counter()
+        for i in range(ops):
+            await db.fetch_all(query, params(i))
+        results[name] = (time.perf_counter() - start) / ops * 1e6
+
+    await db.disconnect()
+    return results
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SQL语句缓存基准测试")
+    parser.add_argument("--users", type=int, default=1000, help="用户数")
+    parser.add_argument("--ops", type=int, default=5000, help="每个查询的执行次数")
+    parser.add_argument("--rounds", type=int, default=3, help="重复轮数")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  SQL语句缓存基准测试 (SQLite)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.db")
+        db = SQLDatabase(DatabaseConfig(type=DatabaseType.SQLITE, database=path))
+        await db.connect()
+        await setup(db, args.users)
+        await db.disconnect()
+
+        # 交替运行多轮, 取各自最好成绩以降低噪声
+        before, after = {}, {}
+        for _ in range(args.rounds):
+            for results, cache_size in ((before, 0), (after, 500)):
+                for name, latency in (await bench(path, cache_size, args.ops)).items():
+                    results[name] = min(results.get(name, latency), latency)
+
+    for name in QUERIES:
+        print(
+            f"{name:>12} | 无缓存 {before[name]:>8.1f} µs | 有缓存 {after[name]:>8.1f} µs"
+            f" | {before[name] / after[name]:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
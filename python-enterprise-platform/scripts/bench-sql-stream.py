@@ -0,0 +1,82 @@
+"""
+SQL流式查询基准测试
+对比fetch_all与stream(字典行/元组行)遍历整表的耗时和峰值内存
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "core-framework"))
+
+from database import SQLDatabase, DatabaseConfig, DatabaseType
+
+QUERY = "SELECT id, username, email, hashed_password FROM users"
+
+
+async def measure(label: str, scan) -> None:
+    """执行一次遍历并输出耗时与峰值内存"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = await scan()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>18} | {count:>9,} 行 | {elapsed:>7.2f}s | 峰值 {peak / 1024 / 1024:>8.1f} MB")
+
+
+async def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SQL流式查询基准测试")
+    parser.add_argument("--rows", type=int, default=200_000, help="表中行数")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="流式查询每次拉取的行数")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  SQL流式查询基准测试")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = DatabaseConfig(type=DatabaseType.SQLITE, database=os.path.join(tmp_dir, "bench.db"))
+        db = SQLDatabase(config)
+        await db.connect()
+
+        await db.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username VARCHAR(50) NOT NULL,
+                email VARCHAR(100) NOT NULL,
+                hashed_password VARCHAR(255) NOT NULL
+            )
+        """)
+        await db.copy_records(
+            "users",
+            ((f"user{i}", f"user{i}@example.com", "x" * 60) for i in range(args.rows)),
+            columns=["username", "email", "hashed_password"],
+        )
+
+        async def scan_fetch_all():
+            return len(await db.fetch_all(QUERY))
+
+        async def scan_stream(as_tuples: bool):
+            count = 0
+            async for _ in db.stream(QUERY, chunk_size=args.chunk_size, as_tuples=as_tuples):
+                count += 1
+            return count
+
+        await measure("fetch_all", scan_fetch_all)
+        await measure("stream(dict)", lambda: scan_stream(False))
+        await measure("stream(tuple)", lambda: scan_stream(True))
+
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
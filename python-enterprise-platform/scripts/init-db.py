@@ -14,6 +14,7 @@ sys.path.insert(0, str(project_root / "services" / "user-service"))
 
 from database import SQLDatabase, DatabaseConfig, DatabaseType
 from config.settings import get_settings
+from app.models.indexes import index_registry
 
 
 async def create_user_table(db: SQLDatabase):
@@ -35,14 +36,12 @@ async def create_user_table(db: SQLDatabase):
         )
     """)
 
-    # 创建索引
-    await db.execute("""
-        CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)
-    """)
-
-    await db.execute("""
-        CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)
-    """)
+    # 创建索引(声明在用户模型上)
+    report = await index_registry.ensure(db)
+    for label in report.created:
+        print(f"   创建索引 {label}")
+    for label, error in report.errors.items():
+        print(f"⚠️  索引 {label} 创建失败: {error}")
 
     print("✅ 用户表创建完成")
 
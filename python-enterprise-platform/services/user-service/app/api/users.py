@@ -4,26 +4,148 @@
 
 import sys
 from pathlib import Path
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from contextlib import nullcontext
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Response, status, Depends
 import json
+import math
 
 # 添加核心框架到路径
 core_path = Path(__file__).parent.parent.parent.parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
 from auth.password import hash_password
+from cache.decorators import cached, invalidate_tags
+from database.pagination import encode_cursor, decode_cursor
 from logging.logger import get_logger
+from config.settings import get_settings
 
 from ..schemas.user import UserCreate, UserUpdate, UserResponse
-from ..dependencies import get_database, get_cache
+from ..dependencies import get_database, get_cache, get_unit_of_work
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+def _to_response(row) -> UserResponse:
+    """数据库行转换为响应模型"""
+    return UserResponse(
+        id=row["id"],
+        username=row["username"],
+        email=row["email"],
+        full_name=row["full_name"],
+        is_active=row["is_active"],
+        is_superuser=row["is_superuser"],
+        roles=json.loads(row["roles"]) if row["roles"] else [],
+        created_at=row["created_at"],
+    )
+
+
+# 用户列表游标的排序键类型: (created_at, id)
+_CURSOR_TYPES = (datetime, int)
+
+# 写后标记前缀: 标记存在期间该范围的缓存加载读主库(读己之写), 其余时候读副本
+WRITTEN_PREFIX = "written:"
+
+
+def _written_window() -> int:
+    """
+    写后读主库的时长(秒)
+
+    复制延迟超过replica_max_lag的副本不参与读, 但延迟每replica_check_interval秒才检查一次,
+    窗口取两者之和; 未配置副本时为0(读本来就走主库)。
+    """
+    settings = get_settings().database
+    if not settings.postgres_replicas:
+        return 0
+    return math.ceil(settings.replica_max_lag + settings.replica_check_interval)
+
+
+async def _recently_written(cache, scope: str) -> bool:
+    """该范围是否在写后窗口内"""
+    return _written_window() > 0 and await cache.exists(f"{WRITTEN_PREFIX}{scope}")
+
+
+@cached(
+    key="user:{user_id}",
+    ttl=300,
+    negative_ttl=30,
+    tags=["user:{user_id}"],
+    cache=get_cache,
+    stale_ttl=30,
+)
+async def fetch_user(db, cache, user_id: int) -> Optional[dict]:
+    """按ID读取用户, 不存在的ID也会短暂缓存, 避免探测请求反复查库"""
+    # 写后窗口内读主库, 否则失效后立即从副本加载可能把复制延迟内的旧数据写进缓存
+    with db.use_primary() if await _recently_written(cache, f"user:{user_id}") else nullcontext():
+        user_dict = await db.fetch_one("SELECT * FROM users WHERE id = :id", {"id": user_id})
+    if not user_dict:
+        return None
+
+    logger.info("User data retrieved from database", user_id=user_id)
+    return _to_response(user_dict).model_dump(mode="json")
+
+
+@cached(key="users:list:{skip}:{limit}", ttl=60, tags=["users"], cache=get_cache)
+async def fetch_users(db, cache, skip: int, limit: int) -> List[dict]:
+    """按偏移分页读取用户列表(兼容旧客户端)"""
+    query = "SELECT * FROM users ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :skip"
+    with db.use_primary() if await _recently_written(cache, "users") else nullcontext():
+        rows = await db.fetch_all(query, {"limit": limit, "skip": skip})
+    return [_to_response(user).model_dump(mode="json") for user in rows]
+
+
+@cached(key="users:page:{cursor}:{limit}", ttl=60, tags=["users"], cache=get_cache)
+async def fetch_users_page(db, cache, cursor: Optional[str], limit: int) -> dict:
+    """
+    按游标(keyset)分页读取用户列表
+
+    游标编码上一页最后一条的(created_at, id), 借助idx_users_created_at_id直接定位,
+    翻页耗时与页码深度无关。多取一条用于判断是否还有下一页。
+    """
+    params = {"limit": limit + 1}
+    where = ""
+    if cursor:
+        params["created_at"], params["id"] = decode_cursor(cursor, 2, types=_CURSOR_TYPES)
+        where = "WHERE (created_at, id) < (:created_at, :id)"
+
+    query = f"SELECT * FROM users {where} ORDER BY created_at DESC, id DESC LIMIT :limit"
+    with db.use_primary() if await _recently_written(cache, "users") else nullcontext():
+        rows = await db.fetch_all(query, params)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        created_at = rows[-1]["created_at"]
+        if isinstance(created_at, str):
+            # SQLite驱动把TIMESTAMP列返回为字符串, 游标中统一保存datetime
+            created_at = datetime.fromisoformat(created_at)
+        next_cursor = encode_cursor(created_at, rows[-1]["id"])
+
+    users = [_to_response(user).model_dump(mode="json") for user in rows]
+    return {"items": users, "next_cursor": next_cursor}
+
+
+async def invalidate_user(cache, user_id: int) -> None:
+    """用户数据变更后失效相关缓存, 并在写后窗口内让相关加载读主库"""
+    window = _written_window()
+    if window:
+        # 先写标记再失效, 失效后的首次加载一定能看到标记
+        await cache.set_many(
+            {f"{WRITTEN_PREFIX}user:{user_id}": 1, f"{WRITTEN_PREFIX}users": 1},
+            ttl=window,
+        )
+    await cache.delete(f"user:{user_id}")
+    await invalidate_tags(cache, f"user:{user_id}", "users")
+
+
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(user: UserCreate, db = Depends(get_database)):
+async def create_user(
+    user: UserCreate,
+    db = Depends(get_unit_of_work),
+    cache = Depends(get_cache)
+):
     """
     创建新用户
 
@@ -75,98 +197,83 @@ async def create_user(user: UserCreate, db = Depends(get_database)):
         "roles": json.dumps(user.roles),
     })
 
+    # 先提交再失效缓存, 避免并发读在提交前把旧数据重新写回缓存
+    await db.commit()
+
+    # 清除该ID可能存在的负缓存以及列表缓存
+    await invalidate_user(cache, result["id"])
+
     logger.info("User created successfully", user_id=result["id"], username=user.username)
 
-    return UserResponse(
-        id=result["id"],
-        username=result["username"],
-        email=result["email"],
-        full_name=result["full_name"],
-        is_active=result["is_active"],
-        is_superuser=result["is_superuser"],
-        roles=json.loads(result["roles"]) if result["roles"] else [],
-        created_at=result["created_at"],
-    )
+    return _to_response(result)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db = Depends(get_database), cache = Depends(get_cache)):
+async def get_user(
+    user_id: int,
+    db = Depends(get_database),
+    cache = Depends(get_cache)
+):
     """
     获取用户信息
 
     - **user_id**: 用户ID
     """
-    # 尝试从缓存获取
-    cache_key = f"user:{user_id}"
-    cached_data = await cache.get(cache_key)
+    cached_data = await fetch_user(db, cache, user_id)
 
-    if cached_data:
-        logger.info("User data retrieved from cache", user_id=user_id)
-        return UserResponse(**json.loads(cached_data))
-
-    # 从数据库查询
-    query = "SELECT * FROM users WHERE id = :id"
-    user_dict = await db.fetch_one(query, {"id": user_id})
-
-    if not user_dict:
+    if not cached_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在"
         )
 
-    user_response = UserResponse(
-        id=user_dict["id"],
-        username=user_dict["username"],
-        email=user_dict["email"],
-        full_name=user_dict["full_name"],
-        is_active=user_dict["is_active"],
-        is_superuser=user_dict["is_superuser"],
-        roles=json.loads(user_dict["roles"]) if user_dict["roles"] else [],
-        created_at=user_dict["created_at"],
-    )
-
-    # 缓存用户数据
-    await cache.set(cache_key, json.dumps(user_response.model_dump(), default=str), ttl=300)
+    # 兼容升级前以JSON字符串写入的缓存
+    if isinstance(cached_data, str):
+        cached_data = json.loads(cached_data)
 
-    logger.info("User data retrieved from database", user_id=user_id)
-    return user_response
+    return UserResponse(**cached_data)
 
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db = Depends(get_database)
+    cursor: Optional[str] = None,
+    db = Depends(get_database),
+    cache = Depends(get_cache)
 ):
     """
     获取用户列表
 
-    - **skip**: 跳过记录数
+    - **cursor**: 翻页游标, 取自上一页响应头X-Next-Cursor; 没有下一页时不返回该响应头
+    - **skip**: 跳过记录数(兼容旧的偏移分页, 深分页较慢; 提供cursor时忽略)
     - **limit**: 返回记录数限制
     """
-    query = "SELECT * FROM users ORDER BY created_at DESC LIMIT :limit OFFSET :skip"
-    users = await db.fetch_all(query, {"limit": limit, "skip": skip})
-
-    return [
-        UserResponse(
-            id=user["id"],
-            username=user["username"],
-            email=user["email"],
-            full_name=user["full_name"],
-            is_active=user["is_active"],
-            is_superuser=user["is_superuser"],
-            roles=json.loads(user["roles"]) if user["roles"] else [],
-            created_at=user["created_at"],
-        )
-        for user in users
-    ]
+    if cursor is None and skip > 0:
+        users = await fetch_users(db, cache, skip, limit)
+        return [UserResponse(**user) for user in users]
+
+    if cursor is not None:
+        try:
+            decode_cursor(cursor, 2, types=_CURSOR_TYPES)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="无效的分页游标"
+            )
+
+    page = await fetch_users_page(db, cache, cursor, limit)
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return [UserResponse(**user) for user in page["items"]]
 
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db = Depends(get_database),
+    db = Depends(get_unit_of_work),
     cache = Depends(get_cache)
 ):
     """
@@ -211,29 +318,20 @@ async def update_user(
 
     update_data["id"] = user_id
     result = await db.fetch_one(query, update_data)
+    await db.commit()
 
     # 清除缓存
-    cache_key = f"user:{user_id}"
-    await cache.delete(cache_key)
+    await invalidate_user(cache, user_id)
 
     logger.info("User updated successfully", user_id=user_id)
 
-    return UserResponse(
-        id=result["id"],
-        username=result["username"],
-        email=result["email"],
-        full_name=result["full_name"],
-        is_active=result["is_active"],
-        is_superuser=result["is_superuser"],
-        roles=json.loads(result["roles"]) if result["roles"] else [],
-        created_at=result["created_at"],
-    )
+    return _to_response(result)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
-    db = Depends(get_database),
+    db = Depends(get_unit_of_work),
     cache = Depends(get_cache)
 ):
     """
@@ -251,9 +349,9 @@ async def delete_user(
 
     # 删除用户
     await db.execute("DELETE FROM users WHERE id = :id", {"id": user_id})
+    await db.commit()
 
     # 清除缓存
-    cache_key = f"user:{user_id}"
-    await cache.delete(cache_key)
+    await invalidate_user(cache, user_id)
 
     logger.info("User deleted successfully", user_id=user_id)
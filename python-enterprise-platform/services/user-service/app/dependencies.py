@@ -4,6 +4,7 @@
 """
 
 from functools import lru_cache
+from typing import AsyncIterator
 import sys
 from pathlib import Path
 
@@ -11,8 +12,8 @@ from pathlib import Path
 core_path = Path(__file__).parent.parent.parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
-from database import SQLDatabase, DatabaseConfig, DatabaseType
-from cache import RedisCache, CacheConfig, CacheType
+from database import SQLDatabase, SQLSession, DatabaseConfig, DatabaseType
+from cache import CacheBase, RedisCache, TieredCache, InstrumentedCache, CacheConfig, CacheType
 from config.settings import get_settings
 
 _database = None
@@ -21,7 +22,7 @@ _cache = None
 
 @lru_cache()
 def get_database() -> SQLDatabase:
-    """获取数据库实例"""
+    """获取数据库实例(配置了只读副本时读操作分摊到副本)"""
     global _database
     if _database is None:
         settings = get_settings()
@@ -37,14 +38,31 @@ def get_database() -> SQLDatabase:
             pool_timeout=settings.database.pool_timeout,
             pool_recycle=settings.database.pool_recycle,
             echo=settings.database.echo_sql,
+            statement_cache_size=settings.database.statement_cache_size,
+            prepared_statement_cache_size=settings.database.prepared_statement_cache_size,
+            replicas=[
+                {"host": host, "port": int(port)}
+                for host, port in (node.rsplit(":", 1) for node in settings.database.postgres_replicas)
+            ],
+            replica_strategy=settings.database.replica_strategy,
+            replica_max_lag=settings.database.replica_max_lag,
+            replica_check_interval=settings.database.replica_check_interval,
+            instrument_queries=settings.database.instrument_queries,
+            slow_query_threshold=settings.database.slow_query_threshold,
         )
-        _database = SQLDatabase(config)
+        _database = SQLDatabase(config, name="user-service")
     return _database
 
 
+async def get_unit_of_work() -> AsyncIterator[SQLSession]:
+    """请求级工作单元: 同一请求内的查询复用一个连接和事务, 请求正常结束时提交"""
+    async with get_database().unit_of_work() as uow:
+        yield uow
+
+
 @lru_cache()
-def get_cache() -> RedisCache:
-    """获取缓存实例"""
+def get_cache() -> CacheBase:
+    """获取缓存实例(启用近端缓存时为 L1内存 + L2 Redis 的两级缓存, 外层记录Prometheus指标)"""
     global _cache
     if _cache is None:
         settings = get_settings()
@@ -57,6 +75,29 @@ def get_cache() -> RedisCache:
             max_connections=settings.redis.redis_max_connections,
             socket_timeout=settings.redis.redis_socket_timeout,
             socket_connect_timeout=settings.redis.redis_socket_connect_timeout,
+            pool_timeout=settings.redis.redis_pool_timeout,
+            health_check_interval=settings.redis.redis_health_check_interval,
+            load_timeout=settings.redis.redis_load_timeout,
+            cluster_mode=settings.redis.redis_cluster,
+            cluster_nodes=[
+                {"host": host, "port": int(port)}
+                for host, port in (node.rsplit(":", 1) for node in settings.redis.redis_cluster_nodes)
+            ],
+            read_from_replicas=settings.redis.redis_read_from_replicas,
+        )
+        _cache = RedisCache(
+            config,
+            serializer=settings.redis.redis_serializer,
+            compression=settings.redis.redis_compression,
+            compress_threshold=settings.redis.redis_compress_threshold,
+            distributed_lock=True,
         )
-        _cache = RedisCache(config)
+        if settings.redis.redis_near_cache:
+            _cache = TieredCache(
+                config,
+                l2=_cache,
+                l1_max_size=settings.redis.redis_near_cache_size,
+                l1_ttl=settings.redis.redis_near_cache_ttl,
+            )
+        _cache = InstrumentedCache(_cache, name="user-service")
     return _cache
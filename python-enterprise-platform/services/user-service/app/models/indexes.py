@@ -0,0 +1,11 @@
+"""
+用户服务的索引声明
+服务启动和数据库初始化时据此校验、创建索引
+"""
+
+from database import IndexRegistry
+
+from .user import User
+
+index_registry = IndexRegistry()
+index_registry.add_model(User)
@@ -11,7 +11,7 @@ from typing import Optional
 core_path = Path(__file__).parent.parent.parent.parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
-from sqlalchemy import String, DateTime, Boolean, Text
+from sqlalchemy import String, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from database.sql_database import Base
 
@@ -22,8 +22,8 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    username: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
-    email: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -39,3 +39,9 @@ class User(Base):
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, username={self.username}, email={self.email})>"
+
+
+# 索引(由init-db通过IndexRegistry创建, 服务启动时校验)
+# username/email的唯一约束已自带索引, 无需另建
+# 用户列表游标分页(ORDER BY created_at DESC, id DESC)
+Index("idx_users_created_at_id", User.created_at.desc(), User.id.desc())
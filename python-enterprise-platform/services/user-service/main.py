@@ -10,17 +10,20 @@ from pathlib import Path
 core_path = Path(__file__).parent.parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from config.settings import get_settings
 from logging.logger import get_logger, configure_logging
 from exceptions import register_exception_handlers
 from auth.jwt_handler import initialize_jwt_handler
+from database import get_query_metrics
 
 from app.api import router as api_router
 from app.dependencies import get_database, get_cache
+from app.models.indexes import index_registry
 
 # 初始化日志
 logger = get_logger(__name__)
@@ -46,6 +49,20 @@ async def lifespan(app: FastAPI):
     await db.connect()
     logger.info("Database connected")
 
+    # 校验索引; 索引由init-db创建, 多个worker同时启动时不重复建索引
+    report = await index_registry.ensure(db, create=settings.database.auto_create_indexes)
+    if report.created:
+        logger.info("Indexes created", indexes=report.created)
+    if not report.ok:
+        logger.warning(
+            "Indexes missing or invalid",
+            missing=report.missing,
+            invalid=report.invalid,
+            errors=report.errors,
+        )
+    if report.unregistered or report.unused:
+        logger.info("Index review", unregistered=report.unregistered, unused=report.unused)
+
     # 初始化缓存连接
     cache = get_cache()
     await cache.connect()
@@ -92,6 +109,14 @@ app.add_middleware(
 # 注册异常处理器
 register_exception_handlers(app)
 
+
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    """统计每个请求的SQL查询数, 检测N+1查询"""
+    with get_query_metrics().track_request(f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
 # 注册路由
 app.include_router(api_router, prefix=settings.app.api_prefix)
 
@@ -106,6 +131,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus指标接口"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/")
 async def root():
     """根路径"""
@@ -4,14 +4,21 @@
 
 import pytest
 import asyncio
+import gc
 import sys
+import time
 from pathlib import Path
 
 # 添加核心框架到路径
 core_path = Path(__file__).parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
-from cache import MemoryCache, CacheConfig, CacheType
+from cache import MemoryCache, RedisCache, TieredCache, InstrumentedCache, CacheMetrics, CacheConfig, CacheType
+from cache import hash_tag, key_slot
+from cache.serializers import PayloadCodec
+from cache.decorators import cached, invalidate_tags
+from redis.asyncio.cluster import ClusterNode, RedisCluster
+from redis.cluster import PRIMARY, REDIS_CLUSTER_HASH_SLOTS, REPLICA
 
 
 @pytest.mark.asyncio
@@ -89,3 +96,596 @@ async def test_memory_cache_operations():
     assert len(keys) == 0
 
     await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_background_sweep():
+    """测试后台清理任务回收过期项"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    cache = MemoryCache(config, sweep_interval=0.05)
+
+    await cache.connect()
+
+    for i in range(100):
+        await cache.set(f"short:{i}", i, ttl=1)
+    await cache.set("long", "value", ttl=60)
+    # 覆盖写入后旧的过期条目应失效
+    await cache.set("short:0", "renewed", ttl=60)
+    assert cache.size() == 101
+
+    # 不做任何读操作, 由后台任务回收
+    await asyncio.sleep(1.2)
+    assert cache.size() == 2
+    assert await cache.get("short:0") == "renewed"
+    assert await cache.get("long") == "value"
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_sharded():
+    """测试分段模式下的并发读写"""
+    config = CacheConfig(type=CacheType.MEMORY, memory_shards=8)
+    cache = MemoryCache(config, max_size=800)
+
+    await cache.connect()
+    assert cache.shard_count == 8
+
+    await asyncio.gather(*(cache.set(f"user:{i}", i) for i in range(200)))
+    values = await asyncio.gather(*(cache.get(f"user:{i}") for i in range(200)))
+    assert values == list(range(200))
+
+    keys = await cache.keys("user:*")
+    assert len(keys) == 200
+
+    await cache.flush()
+    assert cache.size() == 0
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_max_bytes():
+    """测试字节预算与统计信息"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    cache = MemoryCache(config, max_bytes=64 * 1024)
+
+    await cache.connect()
+
+    for i in range(20):
+        await cache.set(f"blob:{i}", "x" * 10_000)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 64 * 1024
+    assert stats["evictions"] > 0
+    assert cache.size() < 20
+
+    assert await cache.get("blob:19") is not None
+    assert await cache.get("blob:0") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+    await cache.disconnect()
+
+    # 预算小于单个条目: 新计数器写入后立即被淘汰, incr/decr仍返回结果
+    tiny = MemoryCache(config, max_bytes=10)
+    await tiny.connect()
+    assert await tiny.incr("k0") == 1
+    assert await tiny.decr("k1", 2) == -2
+    await tiny.disconnect()
+
+    # 已过期但未清理的计数器和键: incr从0开始, exists_many与exists一致
+    await cache.connect()
+    await cache.set("counter", 5, ttl=1)
+    await cache.set("other", "v", ttl=1)
+    await asyncio.sleep(1.1)
+    assert await cache.exists_many(["other"]) == {"other": False}
+    assert await cache.incr("counter") == 1
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_tinylfu_scan_resistance():
+    """测试TinyLFU在一次性扫描下保留热点数据"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    cache = MemoryCache(config, max_size=200, policy="tinylfu")
+
+    await cache.connect()
+
+    hot_keys = [f"hot:{i}" for i in range(100)]
+    for _ in range(5):
+        for key in hot_keys:
+            if await cache.get(key) is None:
+                await cache.set(key, key)
+
+    # 一次性扫描
+    for i in range(2000):
+        await cache.get(f"scan:{i}")
+        await cache.set(f"scan:{i}", i)
+
+    retained = [key for key in hot_keys if await cache.get(key) is not None]
+    assert len(retained) >= 90
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_read_through():
+    """测试两级缓存的回填与失效"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    l2 = MemoryCache(config)
+    cache = TieredCache(config, l2=l2, l1_ttl=60)
+
+    await cache.connect()
+
+    await l2.set("user:1", {"name": "alice"})
+    assert await cache.get("user:1") == {"name": "alice"}
+    assert await cache.l1.get("user:1") == {"name": "alice"}
+
+    await cache.delete("user:1")
+    assert await cache.l1.get("user:1") is None
+    assert await l2.get("user:1") is None
+
+    # 回填L1的过期时间不超过L2中的剩余时间, get_or_load条目取逻辑过期时间
+    await l2.set("short", "v", ttl=3)
+    await l2.set("loaded", {"__loaded__": True, "value": "v", "expire_at": time.time() + 3}, ttl=60)
+    assert await cache.get("short") == "v"
+    assert set(await cache.get_many(["loaded"])) == {"loaded"}
+    assert 0 < await cache.l1.ttl("short") <= 3
+    assert 0 < await cache.l1.ttl("loaded") <= 3
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_pubsub_invalidation():
+    """测试通过Pub/Sub在多个进程间失效L1"""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def make_worker() -> TieredCache:
+        config = CacheConfig(type=CacheType.REDIS)
+        l2 = RedisCache(config)
+        # 以fakeredis替代真实连接
+        l2.connect = lambda: _attach_fake_client(l2, fakeredis, server)
+        return TieredCache(config, l2=l2)
+
+    worker_a, worker_b = make_worker(), make_worker()
+    await worker_a.connect()
+    await worker_b.connect()
+
+    await worker_a.set("user:1", "v1")
+    assert await worker_b.get("user:1") == "v1"
+
+    await worker_a.set("user:1", "v2")
+    await asyncio.sleep(0.2)
+    assert await worker_b.l1.get("user:1") is None
+    assert await worker_b.get("user:1") == "v2"
+
+    # expire同样广播失效, 其它进程按L2的新剩余时间重新回填
+    await worker_a.expire("user:1", 5)
+    await asyncio.sleep(0.2)
+    assert await worker_b.l1.get("user:1") is None
+    assert await worker_b.get("user:1") == "v2"
+    assert 0 < await worker_b.l1.ttl("user:1") <= 5
+
+    await worker_a.delete("user:1")
+    await asyncio.sleep(0.2)
+    assert await worker_b.get("user:1") is None
+
+    await worker_a.disconnect()
+    await worker_b.disconnect()
+
+
+async def _attach_fake_client(cache, fakeredis, server) -> None:
+    """为RedisCache挂载fakeredis客户端"""
+    cache._client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    cache._connected = True
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_bulk_operations():
+    """测试批量操作"""
+    config = CacheConfig(type=CacheType.MEMORY, memory_shards=4)
+    cache = MemoryCache(config)
+
+    await cache.connect()
+
+    await cache.set_many(
+        {f"user:{i}": i for i in range(10)},
+        ttl={"user:0": 1},
+    )
+    assert await cache.get_many(["user:1", "user:2", "missing"]) == {"user:1": 1, "user:2": 2}
+    assert await cache.ttl("user:0") <= 1
+    assert await cache.ttl("user:5") > 1
+
+    exists = await cache.exists_many(["user:3", "missing"])
+    assert exists == {"user:3": True, "missing": False}
+
+    assert await cache.delete_many(["user:1", "user:2", "missing"]) == 2
+    assert await cache.get_many(["user:1", "user:2"]) == {}
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_single_flight():
+    """测试并发未命中只调用一次loader, 过期后返回旧值并后台刷新"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    cache = MemoryCache(config)
+
+    await cache.connect()
+
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return f"value-{calls}"
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("hot", loader, ttl=1, stale_ttl=5) for _ in range(50))
+    )
+    assert results == ["value-1"] * 50
+    assert calls == 1
+
+    # 逻辑过期后仍在stale窗口内: 立即返回旧值, 后台只刷新一次
+    await asyncio.sleep(1.1)
+    results = await asyncio.gather(
+        *(cache.get_or_load("hot", loader, ttl=1, stale_ttl=5) for _ in range(50))
+    )
+    assert results == ["value-1"] * 50
+    await asyncio.sleep(0.2)
+    assert calls == 2
+    assert await cache.get_or_load("hot", loader, ttl=1, stale_ttl=5) == "value-2"
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_lock_holder_never_writes():
+    """测试持锁方不写入新值时(崩溃或loader返回None), 等待方在load_timeout内或锁释放后自行加载"""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(CacheConfig(type=CacheType.REDIS, load_timeout=0.5), distributed_lock=True)
+    await _attach_fake_client(cache, fakeredis, fakeredis.FakeServer())
+
+    async def loader():
+        return "loaded"
+
+    # 持锁进程崩溃: 锁在load_timeout后过期
+    await cache.client.set("lock:user:1", "crashed", px=int(cache.config.load_timeout * 1000))
+    start = asyncio.get_running_loop().time()
+    assert await cache.get_or_load("user:1", loader, ttl=300) == "loaded"
+    assert asyncio.get_running_loop().time() - start < 1.0
+
+    # 持锁方的loader返回None并释放了锁: 不必等到超时
+    await cache.client.set("lock:user:2", "holder", px=60_000)
+    asyncio.get_running_loop().call_later(0.1, asyncio.ensure_future, cache.client.delete("lock:user:2"))
+    start = asyncio.get_running_loop().time()
+    assert await cache.get_or_load("user:2", loader, ttl=300) == "loaded"
+    assert asyncio.get_running_loop().time() - start < 0.4
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_miss_not_joined_to_stale_refresh():
+    """测试其它进程持锁时: 旧值触发的后台刷新放弃加载, 随后的前台未命中不会合并到该刷新而得到None"""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(CacheConfig(type=CacheType.REDIS, load_timeout=1.0), distributed_lock=True)
+    await _attach_fake_client(cache, fakeredis, fakeredis.FakeServer())
+
+    async def loader():
+        return "fresh"
+
+    # 第一次读到逻辑过期的旧值(触发后台刷新), 第二次读时条目已被淘汰
+    reads = [{"__loaded__": True, "value": "stale", "expire_at": time.time() - 1, "delta": 0.0}, None]
+    original_get = cache.get
+
+    async def get(key):
+        return reads.pop(0) if reads else await original_get(key)
+
+    cache.get = get
+    await cache.client.set("lock:user:1", "other-process", px=60_000)
+    asyncio.get_running_loop().call_later(0.2, asyncio.ensure_future, cache.client.delete("lock:user:1"))
+
+    assert await cache.get_or_load("user:1", loader, ttl=300, stale_ttl=30) == "stale"
+    assert await cache.get_or_load("user:1", loader, ttl=300, stale_ttl=30) == "fresh"
+
+    await cache.disconnect()
+
+
+def test_payload_codec_mixed_formats():
+    """测试带格式头的编解码及新旧格式混合解码"""
+    value = {"id": 1, "username": "alice", "roles": ["user"], "bio": "x" * 2000}
+
+    orjson_codec = PayloadCodec("orjson")
+    msgpack_codec = PayloadCodec("msgpack", compression="zstd", compress_threshold=512)
+    json_codec = PayloadCodec("json")
+
+    for codec in (orjson_codec, msgpack_codec, json_codec):
+        encoded = codec.encode(value)
+        assert encoded[0] < 0x20
+        # 任意编解码器都能解码其它格式写入的数据
+        assert orjson_codec.decode(encoded) == value
+        assert msgpack_codec.decode(encoded) == value
+
+    compressed = msgpack_codec.encode(value)
+    assert len(compressed) < len(json_codec.encode(value))
+
+    # 无格式头的旧JSON数据
+    assert orjson_codec.decode('{"id": 1}') == {"id": 1}
+
+    # 非pickle编解码器拒绝反序列化pickle数据
+    with pytest.raises(ValueError):
+        orjson_codec.decode(PayloadCodec("pickle").encode(value))
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_scan_and_delete_pattern():
+    """测试SCAN遍历与按模式批量删除"""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisCache(CacheConfig(type=CacheType.REDIS))
+    await _attach_fake_client(cache, fakeredis, fakeredis.FakeServer())
+
+    await cache.set_many({f"session:{i}": i for i in range(250)})
+    await cache.set_many({f"user:{i}": i for i in range(10)})
+
+    keys = [key async for key in cache.scan_iter("session:*", count=50)]
+    assert len(keys) == 250
+    assert len(await cache.keys("user:*")) == 10
+
+    assert await cache.delete_pattern("session:*", batch_size=100) == 250
+    assert await cache.keys("session:*") == []
+    assert len(await cache.keys()) == 10
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_instrumented_cache_metrics():
+    """测试缓存指标: 命中/未命中、错误、淘汰与延迟直方图"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    metrics = CacheMetrics()
+    cache = InstrumentedCache(MemoryCache(config, max_size=2), name="test", metrics=metrics)
+    await cache.connect()
+
+    await cache.set("user:1", "a")
+    assert await cache.get("user:1") == "a"
+    assert await cache.get("user:2") is None
+    await cache.get_many(["user:1", "order:1"])
+
+    await cache.set("user:2", "b")
+    await cache.set("user:3", "c")
+
+    with pytest.raises(ValueError):
+        await cache.incr("user:2")
+
+    text = metrics.render().decode()
+    assert 'cache_hits_total{cache="test",prefix="user"} 2.0' in text
+    assert 'cache_misses_total{cache="test",prefix="user"} 1.0' in text
+    assert 'cache_misses_total{cache="test",prefix="order"} 1.0' in text
+    assert 'cache_errors_total{cache="test",operation="incr"} 1.0' in text
+    assert 'cache_evictions_total{cache="test"} 1.0' in text
+    assert 'cache_operation_duration_seconds_count{cache="test",operation="set",prefix="user"} 3.0' in text
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_negative_and_tags():
+    """测试缓存装饰器: 负缓存与按标签失效"""
+    cache = MemoryCache(CacheConfig(type=CacheType.MEMORY))
+    await cache.connect()
+    users = {1: {"id": 1, "name": "alice"}}
+    calls = []
+
+    @cached(key="user:{user_id}", ttl=60, negative_ttl=60, tags=["user:{user_id}"], cache=cache)
+    async def fetch_user(user_id: int):
+        calls.append(user_id)
+        return users.get(user_id)
+
+    assert await fetch_user(1) == {"id": 1, "name": "alice"}
+    assert await fetch_user(1) == {"id": 1, "name": "alice"}
+    assert calls == [1]
+
+    # 不存在的ID只查询一次
+    assert await fetch_user(404) is None
+    assert await fetch_user(user_id=404) is None
+    assert calls == [1, 404]
+
+    users[1] = {"id": 1, "name": "bob"}
+    await invalidate_tags(cache, "user:1")
+    assert await fetch_user(1) == {"id": 1, "name": "bob"}
+    assert calls == [1, 404, 1]
+
+    await cache.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_tiered_l1_hit():
+    """测试缓存装饰器在两级缓存上: 标签版本键写入初始版本后, L1命中时不访问L2"""
+    config = CacheConfig(type=CacheType.MEMORY)
+    l2 = MemoryCache(config)
+    cache = TieredCache(config, l2=l2, l1_ttl=60)
+    await cache.connect()
+
+    l2_calls = []
+    for name in ("get", "get_many", "set", "set_many", "exists", "ttl_many", "incr"):
+        method = getattr(l2, name)
+
+        async def counted(*args, _name=name, _method=method, **kwargs):
+            l2_calls.append(_name)
+            return await _method(*args, **kwargs)
+
+        setattr(l2, name, counted)
+
+    users = {1: {"id": 1, "name": "alice"}}
+
+    @cached(key="user:{user_id}", ttl=60, tags=["user:{user_id}", "users"], cache=cache)
+    async def fetch_user(user_id: int):
+        return users.get(user_id)
+
+    assert await fetch_user(1) == {"id": 1, "name": "alice"}
+    assert await l2.get("tag:users") == 0
+    # 首次读取把刚写入的版本键回填L1
+    await fetch_user(1)
+
+    l2_calls.clear()
+    for _ in range(100):
+        assert await fetch_user(1) == {"id": 1, "name": "alice"}
+    assert l2_calls == []
+
+    users[1] = {"id": 1, "name": "bob"}
+    await invalidate_tags(cache, "user:1")
+    assert await fetch_user(1) == {"id": 1, "name": "bob"}
+
+    await cache.disconnect()
+
+
+class _FakeClusterNode(ClusterNode):
+    """
+    redis-py集群节点, 命令交给fakeredis执行
+
+    同一分片的主节点和副本共享同一个FakeServer; 记录每条命令发往的节点与键。
+    """
+
+    __slots__ = ("client", "calls")
+
+    # 键参数位置, 未列出的命令除命令名外都是键
+    _KEY_ARGS = {"SET": slice(1, 2), "GET": slice(1, 2)}
+
+    def __init__(self, port, server_type, client, calls):
+        super().__init__("127.0.0.1", port, server_type)
+        self.client = client
+        self.calls = calls
+
+    def _record(self, args):
+        command = args[0]
+        if command != "COMMAND":
+            self.calls.append((self, command, list(args[self._KEY_ARGS.get(command, slice(1, None))])))
+
+    async def execute_command(self, *args, **kwargs):
+        self._record(args)
+        return await self.client.execute_command(*args)
+
+    async def execute_pipeline(self, commands):
+        failed = False
+        for command in commands:
+            self._record(command.args)
+            try:
+                command.result = await self.client.execute_command(*command.args)
+            except Exception as e:
+                command.result = e
+                failed = True
+        return failed
+
+
+async def _fake_cluster(fakeredis, shards: int = 3) -> RedisCluster:
+    """构造已初始化的RedisCluster: 每个分片一主一从, 槽位平均分配"""
+    calls = []
+    nodes = []
+    for i in range(shards):
+        server = fakeredis.FakeServer()
+        nodes.append([
+            _FakeClusterNode(port + i, server_type, fakeredis.FakeAsyncRedis(server=server, decode_responses=True), calls)
+            for port, server_type in ((7000, PRIMARY), (7100, REPLICA))
+        ])
+
+    cluster = RedisCluster(startup_nodes=[nodes[0][0]], decode_responses=True, read_from_replicas=True)
+    manager = cluster.nodes_manager
+    manager.nodes_cache = {node.name: node for shard in nodes for node in shard}
+    manager.slots_cache = {
+        slot: nodes[slot * shards // REDIS_CLUSTER_HASH_SLOTS] for slot in range(REDIS_CLUSTER_HASH_SLOTS)
+    }
+    manager.default_node = nodes[0][0]
+    await cluster.commands_parser.initialize(manager.default_node)
+    cluster._initialize = False
+    cluster.calls = calls
+    return cluster
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_cluster_slot_routing():
+    """测试集群模式: 批量操作按槽位拆分发往所属节点, 哈希标签键合并为一条命令, 读操作分摊到副本"""
+    fakeredis = pytest.importorskip("fakeredis")
+    cluster = await _fake_cluster(fakeredis)
+    cache = RedisCache(CacheConfig(type=CacheType.REDIS, cluster_mode=True, read_from_replicas=True))
+    cache._client = cluster
+    cache._connected = True
+
+    def assert_routed(read_commands=()):
+        # 每条命令的键都属于同一槽位, 且发往该槽位所在分片; 只有读命令可以发往副本
+        for node, command, keys in cluster.calls:
+            slots = {key_slot(key) for key in keys}
+            assert len(slots) == 1, f"CROSSSLOT {command} {keys}"
+            assert node in cluster.nodes_manager.slots_cache[slots.pop()]
+            assert node.server_type == PRIMARY or command in read_commands
+
+    mapping = {f"item:{i}": {"i": i} for i in range(200)}
+    assert await cache.set_many(mapping, ttl=60)
+    assert {node.port for node, _, _ in cluster.calls} == {7000, 7001, 7002}
+    assert_routed()
+
+    cluster.calls.clear()
+    assert await cache.get_many(list(mapping) + ["item:missing"]) == mapping
+    assert {command for _, command, _ in cluster.calls} == {"MGET"}
+    assert any(node.server_type == REPLICA for node, _, _ in cluster.calls)
+    assert_routed(read_commands={"MGET"})
+
+    cluster.calls.clear()
+    exists = await cache.exists_many(["item:1", "item:missing"])
+    assert exists == {"item:1": True, "item:missing": False}
+    assert 55 < (await cache.ttl_many(["item:1"]))["item:1"] <= 60
+    assert_routed(read_commands={"EXISTS", "PTTL"})
+
+    # 哈希标签让相关键落在同一槽位, 只需一条MGET
+    related = [hash_tag("user:1", field) for field in ("profile", "roles", "settings")]
+    assert len({key_slot(key) for key in related}) == 1
+    await cache.set_many({key: key for key in related})
+    cluster.calls.clear()
+    assert await cache.get_many(related) == {key: key for key in related}
+    assert [(command, keys) for _, command, keys in cluster.calls] == [("MGET", related)]
+
+    cluster.calls.clear()
+    assert await cache.delete_many(list(mapping)) == 200
+    assert {command for _, command, _ in cluster.calls} == {"DEL"}
+    assert_routed()
+    assert await cache.get_many(list(mapping)) == {}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_snapshot_restore(tmp_path):
+    """测试内存缓存快照: 断开时落盘, 连接时恢复并保留剩余TTL"""
+    path = str(tmp_path / "cache.snapshot")
+    config = CacheConfig(type=CacheType.MEMORY, default_ttl=0)
+
+    cache = MemoryCache(config, snapshot_path=path)
+    await cache.connect()
+    await cache.set("user:1", {"name": "alice", "roles": ("admin",)})
+    await cache.set("session:1", "token", ttl=60)
+    await cache.set("short", "gone", ttl=1)
+    await cache.disconnect()
+
+    await asyncio.sleep(1.1)
+
+    restored = MemoryCache(config, snapshot_path=path)
+    await restored.connect()
+    assert await restored.get("user:1") == {"name": "alice", "roles": ("admin",)}
+    assert await restored.get("session:1") == "token"
+    assert 55 <= await restored.ttl("session:1") <= 60
+    assert await restored.get("short") is None
+    assert await restored.ttl("user:1") == -1
+    await restored.disconnect()
+
+    # 恢复结束后GC保持调用方原先的状态
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        assert await MemoryCache(config, snapshot_path=path).restore() == 2
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,62 @@
+"""
+共享连接池测试
+"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加核心框架到路径
+core_path = Path(__file__).parent.parent / "core-framework"
+sys.path.insert(0, str(core_path))
+
+from connections import RedisPoolConfig, RedisPoolRegistry
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_registry_shares_and_reports():
+    """测试连接池注册表: 同名共享、阻塞超时与指标导出"""
+    fakeredis = pytest.importorskip("fakeredis")
+    from redis.asyncio import Redis
+    from redis.exceptions import ConnectionError
+
+    registry = RedisPoolRegistry()
+    config = RedisPoolConfig(
+        max_connections=1,
+        pool_timeout=0.1,
+        health_check_interval=0,
+        connection_kwargs={
+            "connection_class": fakeredis.FakeAsyncConnection,
+            "server": fakeredis.FakeServer(),
+        },
+    )
+
+    cache_pool = await registry.acquire(config)
+    queue_pool = await registry.acquire(config)
+    assert cache_pool is queue_pool
+    assert registry.stats(config.default_name)["refs"] == 2
+
+    client = Redis(connection_pool=cache_pool)
+    await client.set("key", "value")
+    assert await client.get("key") == b"value"
+
+    # 连接耗尽: 阻塞等待到超时
+    connection = await cache_pool.get_connection("PING")
+    with pytest.raises(ConnectionError):
+        await client.ping()
+    stats = registry.stats(config.default_name)
+    assert stats["in_use"] == 1
+    assert stats["wait_timeouts"] == 1
+    assert stats["wait_seconds"] >= 0.1
+    await cache_pool.release(connection)
+
+    text = registry.render().decode()
+    assert 'redis_pool_connections{pool="localhost:6379/0/raw",state="idle"} 1.0' in text
+    assert 'redis_pool_wait_timeouts_total{pool="localhost:6379/0/raw"} 1.0' in text
+
+    await registry.release(config.default_name)
+    assert registry.stats(config.default_name)["refs"] == 1
+    await registry.release(config.default_name)
+    with pytest.raises(KeyError):
+        registry.stats(config.default_name)
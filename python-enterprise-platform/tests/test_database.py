@@ -2,6 +2,7 @@
 数据库模块测试
 """
 
+import asyncio
 import pytest
 import sys
 from pathlib import Path
@@ -10,7 +11,7 @@ from pathlib import Path
 core_path = Path(__file__).parent.parent / "core-framework"
 sys.path.insert(0, str(core_path))
 
-from database import SQLDatabase, DatabaseConfig, DatabaseType
+from database import SQLDatabase, MongoDBDatabase, DatabaseConfig, DatabaseType
 
 
 @pytest.mark.asyncio
@@ -98,3 +99,670 @@ async def test_database_transaction():
     # 清理
     await db.execute("DROP TABLE accounts")
     await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert(tmp_path):
+    """测试批量写入: execute_many与copy_records(非PostgreSQL退化为executemany)"""
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "bulk.db")
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+    await db.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            email TEXT NOT NULL
+        )
+    """)
+
+    inserted = await db.execute_many(
+        "INSERT INTO users (username, email) VALUES (:username, :email)",
+        ({"username": f"user{i}", "email": f"user{i}@example.com"} for i in range(250)),
+        batch_size=100,
+    )
+    assert inserted == 250
+
+    copied = await db.copy_records(
+        "users",
+        ((f"copy{i}", f"copy{i}@example.com") for i in range(120)),
+        columns=["username", "email"],
+        batch_size=50,
+    )
+    assert copied == 120
+
+    result = await db.fetch_one("SELECT COUNT(*) AS total FROM users")
+    assert result["total"] == 370
+
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stream(tmp_path):
+    """测试流式查询"""
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "stream.db")
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+    await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    await db.execute_many(
+        "INSERT INTO items (id, name) VALUES (:id, :name)",
+        ({"id": i, "name": f"item{i}"} for i in range(1, 251)),
+    )
+
+    rows = [row async for row in db.stream("SELECT id, name FROM items ORDER BY id", chunk_size=100)]
+    assert len(rows) == 250
+    assert rows[0] == {"id": 1, "name": "item1"}
+
+    total = 0
+    async for item_id, name in db.stream(
+        "SELECT id, name FROM items WHERE id > :min_id", {"min_id": 200}, as_tuples=True
+    ):
+        assert name == f"item{item_id}"
+        total += 1
+    assert total == 50
+
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_replica_routing(tmp_path):
+    """测试读写分离: 副本轮询、use_primary、复制延迟与故障回退"""
+    replica_files = [tmp_path / "replica1.db", tmp_path / "replica2.db"]
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "primary.db"),
+        replicas=[{"database": str(path)} for path in replica_files],
+        replica_check_interval=0,
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+
+    # 每个库写入可区分的数据
+    for name, path in [("primary", tmp_path / "primary.db")] + [(p.stem, p) for p in replica_files]:
+        node = SQLDatabase(DatabaseConfig(type=DatabaseType.SQLITE, database=str(path)))
+        await node.connect()
+        await node.execute("CREATE TABLE node (name TEXT NOT NULL)")
+        await node.execute("INSERT INTO node (name) VALUES (:name)", {"name": name})
+        await node.disconnect()
+
+    async def read_node():
+        row = await db.fetch_one("SELECT name FROM node")
+        return row["name"]
+
+    # 读操作在副本间轮询
+    assert {await read_node() for _ in range(4)} == {"replica1", "replica2"}
+    assert [stats["reads"] for stats in db.replica_stats()] == [2, 2]
+
+    # 读己之写
+    with db.use_primary():
+        assert await read_node() == "primary"
+
+    # 复制延迟超限的副本不参与读
+    db._replicas[0].lag = config.replica_max_lag + 1
+    assert {await read_node() for _ in range(3)} == {"replica2"}
+
+    # 副本均不可用时回退主库
+    db._replicas[1].healthy = False
+    assert await read_node() == "primary"
+
+    # 健康检查恢复副本状态
+    for replica in db._replicas:
+        await db._check_replica(replica)
+    assert all(stats["healthy"] and stats["lag"] == 0 for stats in db.replica_stats())
+
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work(tmp_path):
+    """测试工作单元: 复用同一连接, 正常退出提交, 异常回滚"""
+    from sqlalchemy import event
+
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "uow.db")
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+    await db.execute("CREATE TABLE accounts (id INTEGER PRIMARY KEY, balance INTEGER NOT NULL)")
+
+    checkouts = []
+    event.listen(db.engine.sync_engine, "checkout", lambda *args: checkouts.append(1))
+
+    async with db.unit_of_work() as uow:
+        await uow.execute_many(
+            "INSERT INTO accounts (id, balance) VALUES (:id, :balance)",
+            [{"id": 1, "balance": 100}, {"id": 2, "balance": 50}],
+        )
+        account = await uow.fetch_one("SELECT balance FROM accounts WHERE id = :id", {"id": 1})
+        await uow.execute("UPDATE accounts SET balance = :balance WHERE id = 1", {"balance": account["balance"] - 30})
+        assert len(checkouts) == 1
+
+        # 提前提交后继续写入, 退出时提交
+        await uow.commit()
+        await uow.execute("UPDATE accounts SET balance = balance + 30 WHERE id = 2")
+
+    with pytest.raises(ValueError):
+        async with db.unit_of_work() as uow:
+            await uow.execute("DELETE FROM accounts")
+            raise ValueError("rollback")
+
+    rows = await db.fetch_all("SELECT id, balance FROM accounts ORDER BY id")
+    assert rows == [{"id": 1, "balance": 70}, {"id": 2, "balance": 80}]
+
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_statement_cache(tmp_path):
+    """测试语句缓存: 同一SQL字符串复用同一TextClause, 按statement_cache_size做LRU淘汰, 工作单元共用缓存"""
+    from sqlalchemy import event
+    from sqlalchemy.sql.elements import TextClause
+
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "statements.db"),
+        statement_cache_size=2,
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+    await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+
+    statements = []
+    event.listen(db.engine.sync_engine, "before_execute", lambda conn, clause, *args: statements.append(clause))
+
+    select_one = "SELECT id FROM items WHERE id = :id"
+    select_all = "SELECT id FROM items"
+    await db.fetch_one(select_one, {"id": 1})
+    await db.fetch_one(select_one, {"id": 2})
+    assert isinstance(statements[0], TextClause) and statements[0] is statements[1]
+
+    # SQLSession.execute接受字符串, 与SQLDatabase共用同一缓存
+    async with db.unit_of_work() as uow:
+        await uow.execute("INSERT INTO items (id) VALUES (:id)", {"id": 1})
+        assert await uow.fetch_one(select_one, {"id": 1}) == {"id": 1}
+    assert statements[-1] is statements[0]
+
+    # 容量为2: 加入第三条语句时淘汰最久未使用的一条
+    db._text.cache_clear()
+    one, every = db._text(select_one), db._text(select_all)
+    assert db._text(select_one) is one
+    db._text("SELECT COUNT(*) FROM items")
+    assert db._text.cache_info().currsize == 2
+    assert db._text(select_one) is one
+    assert db._text(select_all) is not every
+
+    await db.disconnect()
+
+    # statement_cache_size=0时不缓存
+    uncached = SQLDatabase(DatabaseConfig(type=DatabaseType.SQLITE, database=config.database, statement_cache_size=0))
+    assert uncached._text(select_one) is not uncached._text(select_one)
+
+
+@pytest.mark.asyncio
+async def test_query_metrics(tmp_path):
+    """测试查询指标: 语句归一化、慢查询日志脱敏、单请求查询数与N+1检测"""
+    from database import QueryMetrics, normalize_statement
+
+    class CaptureLogger:
+        def __init__(self):
+            self.events = []
+
+        def warning(self, event, **kwargs):
+            self.events.append((event, kwargs))
+
+    assert normalize_statement("SELECT * FROM t WHERE a = 'x'  AND b IN (1, 2.5)") == \
+        "SELECT * FROM t WHERE a = ? AND b IN (...)"
+    assert normalize_statement("SELECT * FROM t WHERE id IN ($1, $2, $3)") == \
+        "SELECT * FROM t WHERE id IN (...)"
+
+    logger = CaptureLogger()
+    metrics = QueryMetrics(n_plus_one_threshold=3, logger=logger)
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "metrics.db"),
+        slow_query_threshold=1e-9,
+    )
+
+    db = SQLDatabase(config, name="test", metrics=metrics)
+    await db.connect()
+    await db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT NOT NULL)")
+    await db.execute("INSERT INTO users (id, email) VALUES (:id, :email)", {"id": 1, "email": "a@example.com"})
+
+    # 慢查询日志不包含参数值
+    event, fields = logger.events[-1]
+    assert event == "Slow query"
+    assert fields["parameters"] == ["<int>", "<str>"]
+    assert "a@example.com" not in str(fields)
+
+    logger.events.clear()
+    with metrics.track_request("GET /users") as tracker:
+        await db.fetch_all("SELECT id FROM users")
+        for user_id in range(4):
+            await db.fetch_one("SELECT email FROM users WHERE id = :id", {"id": user_id})
+    assert tracker.count == 5
+
+    n_plus_one = [fields for event, fields in logger.events if event == "Possible N+1 query"]
+    assert len(n_plus_one) == 1
+    assert n_plus_one[0]["executions"] == 4
+    assert n_plus_one[0]["request"] == "GET /users"
+
+    output = metrics.render().decode()
+    assert 'sql_query_duration_seconds_count{database="test",statement="SELECT email FROM users WHERE id = ?"} 4.0' in output
+    assert "sql_queries_per_request_count 1.0" in output
+    assert "sql_n_plus_one_total" in output
+
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination(tmp_path):
+    """测试游标分页: 游标编解码, 用户列表按(created_at, id)翻页不重复不遗漏, 无效游标返回400"""
+    from datetime import datetime
+    from database import encode_cursor, decode_cursor
+
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678901)
+    assert decode_cursor(encode_cursor(created_at, 42), 2) == (created_at, 42)
+    for invalid in ("not-a-cursor!", encode_cursor(1), encode_cursor([1, 2])[:-2]):
+        with pytest.raises(ValueError):
+            decode_cursor(invalid, 2)
+    # 格式正确但类型不符
+    assert decode_cursor(encode_cursor(created_at, 42), 2, types=(datetime, int)) == (created_at, 42)
+    for wrong_types in (encode_cursor(1, "x"), encode_cursor("a", "b"), encode_cursor(created_at, True)):
+        with pytest.raises(ValueError):
+            decode_cursor(wrong_types, 2, types=(datetime, int))
+
+    pytest.importorskip("fastapi")
+    from fastapi import HTTPException, Response
+    from cache import MemoryCache, CacheConfig, CacheType
+
+    # 标准库logging已先加载, 服务代码里的logging.logger需按文件路径注册
+    if "logging.logger" not in sys.modules:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("logging.logger", core_path / "logging" / "logger.py")
+        sys.modules["logging.logger"] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(sys.modules["logging.logger"])
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "user-service"))
+    from app import dependencies
+    from app.api import users
+
+    config = DatabaseConfig(
+        type=DatabaseType.SQLITE,
+        database=str(tmp_path / "pages.db")
+    )
+
+    db = SQLDatabase(config)
+    await db.connect()
+    await db.execute("""
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY, username TEXT, email TEXT, full_name TEXT,
+            is_active BOOLEAN, is_superuser BOOLEAN, roles TEXT, created_at TIMESTAMP NOT NULL
+        )
+    """)
+    await db.execute("CREATE INDEX idx_users_created_at_id ON users(created_at DESC, id DESC)")
+    # 每3条共用一个created_at, 验证id作为次排序键
+    await db.execute_many(
+        "INSERT INTO users (id, username, email, is_active, is_superuser, created_at)"
+        " VALUES (:id, :username, :email, 1, 0, :created_at)",
+        (
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com",
+             "created_at": f"2024-01-01 00:00:{i // 3:02d}"}
+            for i in range(1, 26)
+        ),
+    )
+
+    # 加载函数和路由都通过get_cache取得缓存
+    cache = MemoryCache(CacheConfig(type=CacheType.MEMORY))
+    await cache.connect()
+    dependencies.get_cache.cache_clear()
+    dependencies._cache = cache
+    try:
+        seen = []
+        cursor = None
+        while True:
+            page = await users.fetch_users_page(db, cache, cursor, 4)
+            seen.extend(user["id"] for user in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == list(range(25, 0, -1))
+
+        # 路由通过X-Next-Cursor响应头返回游标, 最后一页不返回
+        response = Response()
+        first = await users.list_users(response, limit=20, db=db, cache=cache)
+        assert [user.id for user in first] == list(range(25, 5, -1))
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = Response()
+        last = await users.list_users(response, limit=20, cursor=cursor, db=db, cache=cache)
+        assert [user.id for user in last] == [5, 4, 3, 2, 1]
+        assert "X-Next-Cursor" not in response.headers
+
+        # 无效游标(包括格式正确但类型不符的)在进入缓存的加载函数之前返回400, 不产生缓存条目
+        pages = set(await cache.keys("users:page:*"))
+        for invalid in ("not-a-cursor!", encode_cursor(1, "x"), encode_cursor("a", "b")):
+            with pytest.raises(HTTPException) as exc_info:
+                await users.list_users(Response(), cursor=invalid, db=db, cache=cache)
+            assert exc_info.value.status_code == 400
+        assert set(await cache.keys("users:page:*")) == pages
+    finally:
+        dependencies._cache = None
+        dependencies.get_cache.cache_clear()
+        await cache.disconnect()
+        await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_index_registry(tmp_path):
+    """测试声明式索引: 从模型读取Index, 校验缺失/未声明的索引并创建"""
+    from sqlalchemy import Index, String
+    from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+    from database import IndexRegistry
+
+    class _Base(DeclarativeBase):
+        pass
+
+    class Account(_Base):
+        __tablename__ = "accounts"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        email: Mapped[str] = mapped_column(String(100), unique=True)
+        created_at: Mapped[str] = mapped_column(String(30))
+
+    Index("idx_accounts_email", Account.email)
+    Index("idx_accounts_created_at_id", Account.created_at.desc(), Account.id.desc())
+
+    registry = IndexRegistry()
+    registry.add_model(Account)
+    assert [(spec.name, spec.keys) for spec in registry.specs] == [
+        ("idx_accounts_created_at_id", (("created_at", -1), ("id", -1))),
+        ("idx_accounts_email", (("email", 1),)),
+    ]
+    spec = registry.add("accounts", ["email"], name="uq_accounts_email_lower", unique=True, where="email IS NOT NULL")
+    assert spec.create_statement(DatabaseType.POSTGRESQL, concurrently=True) == (
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_accounts_email_lower ON accounts (email) "
+        "WHERE email IS NOT NULL"
+    )
+    with pytest.raises(ValueError):
+        registry.add("accounts", ["created_at"], name="idx_accounts_email")
+
+    db = SQLDatabase(DatabaseConfig(type=DatabaseType.SQLITE, database=str(tmp_path / "indexes.db")))
+    await db.connect()
+    await db.execute("CREATE TABLE accounts (id INTEGER PRIMARY KEY, email VARCHAR(100) UNIQUE, created_at VARCHAR(30))")
+    await db.execute("CREATE INDEX idx_accounts_email ON accounts(email)")
+    await db.execute("CREATE INDEX idx_accounts_legacy ON accounts(created_at)")
+
+    report = await registry.verify(db)
+    assert report.present == ["accounts.idx_accounts_email"]
+    assert sorted(report.missing) == ["accounts.idx_accounts_created_at_id", "accounts.uq_accounts_email_lower"]
+    assert report.unregistered == ["accounts.idx_accounts_legacy"] and not report.ok
+
+    report = await registry.ensure(db)
+    assert sorted(report.created) == ["accounts.idx_accounts_created_at_id", "accounts.uq_accounts_email_lower"]
+    assert report.ok
+    columns = await db.fetch_all("PRAGMA index_xinfo(idx_accounts_created_at_id)")
+    assert [(column["name"], column["desc"]) for column in columns if column["key"]] == [("created_at", 1), ("id", 1)]
+    assert (await registry.verify(db)).ok
+
+    await db.disconnect()
+
+
+class _FakeCollection:
+    """内存集合, 只实现bulk_write、$sample抽样和按_id区间的find"""
+
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+        self.batches = []
+
+    async def bulk_write(self, operations, ordered=False):
+        from pymongo.errors import BulkWriteError
+
+        self.batches.append(len(operations))
+        errors = []
+        for i, op in enumerate(operations):
+            if op._doc.get("dup"):
+                errors.append({"index": i, "code": 11000, "errmsg": "duplicate key"})
+            elif op._doc.get("transient", 0) > 0:
+                # 前几次提交返回可重试的写冲突
+                op._doc["transient"] -= 1
+                errors.append({"index": i, "code": 112, "errmsg": "write conflict"})
+        details = {"nInserted": len(operations) - len(errors), "writeErrors": errors}
+        if errors:
+            raise BulkWriteError(details)
+
+        class Result:
+            bulk_api_result = details
+        return Result()
+
+    def aggregate(self, pipeline):
+        size = pipeline[1]["$sample"]["size"]
+
+        class Cursor:
+            async def to_list(inner, length=None):
+                return [{"_id": doc["_id"]} for doc in self.documents[::max(1, len(self.documents) // size)]]
+        return Cursor()
+
+    def find(self, range_filter, projection=None, batch_size=None):
+        from database.mongodb_database import _bson_type
+
+        condition = range_filter.get("_id", {})
+
+        def matches(value):
+            # $lt/$gte只比较同类型的值, 与MongoDB一致
+            if "$not" in condition:
+                return _bson_type(value) != condition["$not"]["$type"]
+            for operator, bound in condition.items():
+                if _bson_type(value) != _bson_type(bound):
+                    return False
+                if operator == "$gte" and value < bound or operator == "$lt" and value >= bound:
+                    return False
+            return True
+
+        documents = [doc for doc in self.documents if matches(doc["_id"])]
+        if self.raw:
+            from bson import encode
+            from bson.raw_bson import RawBSONDocument
+
+            documents = [RawBSONDocument(encode(doc)) for doc in documents]
+        return _FakeCursor([dict(doc) if isinstance(doc, dict) else doc for doc in documents])
+
+    def with_options(self, codec_options=None):
+        raw = _FakeCollection(self.documents)
+        raw.raw = True
+        return raw
+
+    raw = False
+
+
+class _FakeCursor:
+    """内存游标, 支持async for与分批to_list"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.fetches = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        for doc in self.documents:
+            await asyncio.sleep(0)
+            yield doc
+
+    async def to_list(self, length=None):
+        self.fetches += 1
+        batch, self.documents = self.documents[:length], self.documents[length:]
+        return batch
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_mongodb_bulk_operations():
+    """测试MongoDB批量写入(无序、错误下标)、批量写入器与按_id区间并行扫描"""
+    from pymongo import InsertOne
+    from database.mongodb_database import split_id_ranges
+
+    assert split_id_ranges([], 4) == [{}]
+    assert split_id_ranges([1, "a"], 4) == [{}]
+    assert split_id_ranges([30, 10, 20], 2, {"type": "a"}) == [
+        {"$and": [{"type": "a"}, {"_id": {"$lt": 20}}]},
+        {"$and": [{"type": "a"}, {"_id": {"$gte": 20}}]},
+        {"$and": [{"type": "a"}, {"_id": {"$not": {"$type": "number"}}}]},
+    ]
+
+    db = MongoDBDatabase(DatabaseConfig(type=DatabaseType.MONGODB, database="test"))
+    events = _FakeCollection()
+    # 抽样只会抽到整数_id, 字符串_id由兜底区间覆盖
+    scanned = _FakeCollection([{"_id": i} for i in range(1000)] + [{"_id": "legacy-1"}, {"_id": "legacy-2"}])
+    db._database = {"events": events, "scanned": scanned}
+    db._connected = True
+
+    operations = [InsertOne({"n": i, "dup": i in (3, 7)}) for i in range(10)]
+    summary = await db.bulk_write("events", operations, batch_size=4)
+    assert events.batches == [4, 4, 2]
+    assert summary["inserted"] == 8
+    assert [error["index"] for error in summary["write_errors"]] == [3, 7]
+
+    events.batches.clear()
+    async with db.batch_writer("events", max_batch_size=100, flush_interval=0) as writer:
+        for i in range(250):
+            await writer.insert({"n": i})
+        assert writer.pending == 50
+    assert events.batches == [100, 100, 50]
+    assert writer.stats["inserted"] == 250 and writer.stats["flushes"] == 3
+
+    # 可重试的写错误只重发对应操作, 超过重试次数后丢弃; 重复键不重试
+    events.batches.clear()
+    writer = db.batch_writer("events", max_batch_size=10, flush_interval=0, max_retries=2)
+    await writer.add(InsertOne({"n": "retry-once", "transient": 1}))
+    await writer.add(InsertOne({"n": "always", "transient": 99}))
+    await writer.add(InsertOne({"n": "dup", "dup": True}))
+    for _ in range(3):
+        await writer.flush()
+    assert events.batches == [3, 2, 1]
+    assert writer.pending == 0
+    assert writer.stats["inserted"] == 1 and writer.stats["retried"] == 3 and writer.stats["failed"] == 1
+    assert [error["code"] for error in writer.stats["write_errors"]] == [11000, 112]
+
+    # 退出时最后一次提交遇到可重试错误: 继续重试直到成功或重试次数用尽, 不会静默丢弃
+    events.batches.clear()
+    async with db.batch_writer("events", max_batch_size=10, flush_interval=0, max_retries=2) as writer:
+        await writer.insert({"n": "retry-on-close", "transient": 1})
+        await writer.insert({"n": "exhausted-on-close", "transient": 99})
+    assert events.batches == [2, 2, 1]
+    assert writer.pending == 0
+    assert writer.stats["inserted"] == 1 and writer.stats["failed"] == 1
+    assert writer.stats["write_errors"][-1]["code"] == 112
+
+    ids = [document["_id"] async for document in db.parallel_scan("scanned", partitions=4, batch_size=64)]
+    assert sorted(ids, key=str) == sorted([*range(1000), "legacy-1", "legacy-2"], key=str)
+
+
+@pytest.mark.asyncio
+async def test_mongodb_iterate():
+    """测试MongoDB流式遍历: 分批拉取、_id逐条转换与RawBSON直通"""
+    from bson import ObjectId
+    from bson.raw_bson import RawBSONDocument
+
+    object_ids = [ObjectId() for _ in range(25)]
+    db = MongoDBDatabase(DatabaseConfig(type=DatabaseType.MONGODB, database="test"))
+    db._database = {"items": _FakeCollection({"_id": oid, "n": i} for i, oid in enumerate(object_ids))}
+    db._connected = True
+
+    documents = [doc async for doc in db.iterate("items", batch_size=10)]
+    assert [doc["_id"] for doc in documents] == [str(oid) for oid in object_ids]
+
+    documents = [doc async for doc in db.iterate("items", stringify_id=False)]
+    assert documents[0]["_id"] == object_ids[0]
+
+    documents = [doc async for doc in db.iterate("items", raw=True)]
+    assert isinstance(documents[0], RawBSONDocument)
+    assert documents[3]["n"] == 3 and documents[3]["_id"] == object_ids[3]
+
+
+class _FakeAggregateCollection:
+    """记录聚合参数的集合, 按管道中的$match过滤后返回游标"""
+
+    def __init__(self, documents):
+        self.documents = list(documents)
+        self.calls = []
+
+    def aggregate(self, pipeline, **options):
+        self.calls.append(options)
+        match = pipeline[0].get("$match", {}) if pipeline else {}
+        return _FakeCursor([
+            dict(doc) for doc in self.documents
+            if all(doc.get(key) == value for key, value in match.items())
+        ])
+
+
+class _FakeMongoDatabase(dict):
+    """集合字典, 附带记录命令的command"""
+
+    def __init__(self, collections, command_result):
+        super().__init__(collections)
+        self.command_result = command_result
+        self.commands = []
+
+    async def command(self, command):
+        self.commands.append(command)
+        return self.command_result
+
+
+@pytest.mark.asyncio
+async def test_mongodb_aggregate_and_explain():
+    """测试MongoDB聚合流式结果、选项透传与执行计划摘要(索引扫描/全集合扫描)"""
+    from database.mongodb_database import summarize_explain
+
+    find_plan = {
+        "queryPlanner": {
+            "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "status_1"}},
+            "rejectedPlans": [{"stage": "COLLSCAN"}],
+        },
+        "executionStats": {"nReturned": 5, "totalDocsExamined": 5, "totalKeysExamined": 5, "executionTimeMillis": 1},
+    }
+    # 聚合的计划嵌套在$cursor阶段中, SBE引擎下位于queryPlan
+    aggregate_plan = {
+        "stages": [
+            {"$cursor": {
+                "queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}}},
+                "executionStats": {"nReturned": 3, "totalDocsExamined": 100, "totalKeysExamined": 0},
+            }},
+            {"$group": {"_id": "$user_id"}},
+        ],
+    }
+
+    summary = summarize_explain(find_plan)
+    assert summary["stages"] == ["FETCH", "IXSCAN"] and summary["indexes"] == ["status_1"]
+    assert not summary["collscan"] and summary["docs_examined"] == 5
+    summary = summarize_explain(aggregate_plan)
+    assert summary["collscan"] and summary["indexes"] == []
+    assert summary["docs_examined"] == 100 and summary["returned"] == 3
+
+    orders = _FakeAggregateCollection({"_id": i, "status": "paid" if i % 2 else "new"} for i in range(25))
+    db = MongoDBDatabase(DatabaseConfig(type=DatabaseType.MONGODB, database="test"))
+    db._database = _FakeMongoDatabase({"orders": orders}, find_plan)
+    db._connected = True
+
+    rows = [row async for row in db.aggregate(
+        "orders", [{"$match": {"status": "paid"}}], allow_disk_use=True, hint="status_1", batch_size=5
+    )]
+    assert [row["_id"] for row in rows] == list(range(1, 25, 2))
+    assert orders.calls == [{"allowDiskUse": True, "batchSize": 5, "hint": "status_1"}]
+
+    summary = await db.explain("orders", {"status": "paid"}, hint="status_1")
+    assert summary["indexes"] == ["status_1"] and summary["raw"] is find_plan
+    assert db._database.commands == [{
+        "explain": {"find": "orders", "filter": {"status": "paid"}, "hint": "status_1"},
+        "verbosity": "executionStats",
+    }]
@@ -0,0 +1,81 @@
+"""
+消息队列测试
+"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加核心框架到路径
+core_path = Path(__file__).parent.parent / "core-framework"
+sys.path.insert(0, str(core_path))
+
+
+class _FakeExchange:
+    """记录发布的交换机, 与aio_pika一致: nack抛出DeliveryError, 无法路由的消息返回被退回的消息"""
+
+    def __init__(self, nack=(), unroutable=()):
+        self.nack = set(nack)
+        self.unroutable = set(unroutable)
+        self.routing_keys = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(self, message, routing_key):
+        from aio_pika.exceptions import DeliveryError
+        from aiormq.abc import DeliveredMessage
+        from pamqp.commands import Basic
+        from pamqp.header import ContentHeader
+
+        index = len(self.routing_keys)
+        self.routing_keys.append(routing_key)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if index in self.nack:
+            raise DeliveryError(None, Basic.Nack(delivery_tag=index))
+        if index in self.unroutable:
+            returned = Basic.Return(reply_code=312, reply_text="NO_ROUTE", exchange="events", routing_key=routing_key)
+            return DeliveredMessage(delivery=returned, header=ContentHeader(), body=message.body, channel=None)
+        return Basic.Ack(delivery_tag=index)
+
+
+class _FakeChannel:
+    """通道替身, 统计交换机查询次数"""
+
+    def __init__(self, exchange):
+        self.default_exchange = exchange
+        self.exchange = exchange
+        self.exchange_lookups = 0
+
+    async def get_exchange(self, name):
+        self.exchange_lookups += 1
+        return self.exchange
+
+
+@pytest.mark.asyncio
+async def test_rabbitmq_publish_batch():
+    """测试RabbitMQ批量发布: 按窗口并发等待确认、nack和无法路由的下标、交换机缓存"""
+    pytest.importorskip("aio_pika")
+    from messaging import RabbitMQQueue, MessageQueueConfig, Message
+    from messaging.base import QueueType
+
+    exchange = _FakeExchange(nack={3, 7}, unroutable={8})
+    channel = _FakeChannel(exchange)
+    queue = RabbitMQQueue(MessageQueueConfig(type=QueueType.RABBITMQ))
+    queue._channel = channel
+    queue._connected = True
+
+    messages = [Message(body={"n": i}) for i in range(10)]
+    summary = await queue.publish_batch("events", messages, exchange="events", max_in_flight=4)
+    assert summary["published"] == 7
+    assert [failure["index"] for failure in summary["failed"]] == [3, 7, 8]
+    assert summary["failed"][0]["message_id"] == messages[3].message_id
+    assert summary["failed"][2]["error"] == "Message returned by broker: NO_ROUTE"
+    assert exchange.max_in_flight == 4
+
+    await queue.publish("events", Message(body={}), exchange="events", routing_key="user.created")
+    assert exchange.routing_keys[-1] == "user.created"
+    assert channel.exchange_lookups == 1